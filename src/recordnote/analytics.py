@@ -0,0 +1,219 @@
+"""Incremental meeting statistics kept up to date as segments arrive."""
+
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+# Anything that is not a letter or digit (whitespace, punctuation, symbols)
+_NON_CHARACTER = re.compile(r"[\W_]+")
+
+# Sentence-ending punctuation (ASCII "." is left out because of numbers)
+_SENTENCE_END = re.compile(r"[。．！？!?]+")
+
+_SCRIPTS = {
+    "kanji": re.compile(r"[㐀-䶿一-鿿々〆]"),
+    "hiragana": re.compile(r"[ぁ-ゟ]"),
+    "katakana": re.compile(r"[゠-ヿｦ-ﾟ]"),
+}
+
+
+def count_characters(text: str) -> int:
+    """Count the characters of a text, ignoring whitespace and punctuation.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Number of letters and digits (kana and kanji count one each)
+    """
+    return len(_NON_CHARACTER.sub("", text))
+
+
+class MeetingAnalytics:
+    """Running statistics of a meeting, updated in O(1) per segment.
+
+    Segments are expected in start-time order, as transcripts deliver them.
+    Overlapping segments (e.g. from several channels) count their shared
+    time once towards the speech time.
+    """
+
+    def __init__(self, duration: float = 0.0, rate_window: float = 60.0) -> None:
+        """Initialize the statistics.
+
+        Args:
+            duration: Recording duration in seconds, if known; otherwise the
+                end of the last segment is used
+            rate_window: Seconds of recent speech used for the current
+                speaking rate
+        """
+        self.duration = duration
+        self.rate_window = rate_window
+        self.segment_count = 0
+        self.character_count = 0
+        self.sentence_count = 0
+        self.speech_seconds = 0.0
+        self.scripts = {name: 0 for name in _SCRIPTS}
+        self.rate_timeline: List[int] = []
+        self.speakers: Dict[str, Dict[str, float]] = {}
+        self._last_end = 0.0
+        self._speech_until = 0.0
+        self._open_sentence = False
+        self._recent: Deque[Tuple[float, int]] = deque()
+        self._recent_characters = 0
+
+    def add(self, start: float, end: float, text: str, label: str = "") -> None:
+        """Add one segment.
+
+        Args:
+            start: Segment start in seconds
+            end: Segment end in seconds
+            text: Segment text
+            label: Channel/speaker label of the segment, if any
+        """
+        characters = count_characters(text)
+        if not characters:
+            return
+
+        self.segment_count += 1
+        self.character_count += characters
+        for name, pattern in _SCRIPTS.items():
+            self.scripts[name] += len(pattern.findall(text))
+
+        # A sentence is counted at its ending punctuation; text after the last
+        # ending stays open until a later segment (or snapshot) closes it
+        stripped = text.strip()
+        self.sentence_count += len(_SENTENCE_END.findall(stripped))
+        tail = _SENTENCE_END.split(stripped)[-1]
+        self._open_sentence = bool(count_characters(tail))
+
+        self.speech_seconds += max(0.0, end - max(start, self._speech_until))
+        self._speech_until = max(self._speech_until, end)
+        self._last_end = max(self._last_end, end)
+
+        minute = int(start // 60)
+        if len(self.rate_timeline) <= minute:
+            self.rate_timeline.extend([0] * (minute + 1 - len(self.rate_timeline)))
+        self.rate_timeline[minute] += characters
+
+        self._recent.append((end, characters))
+        self._recent_characters += characters
+        while self._recent and self._recent[0][0] < end - self.rate_window:
+            self._recent_characters -= self._recent.popleft()[1]
+
+        if label:
+            speaker = self.speakers.setdefault(
+                label, {"seconds": 0.0, "characters": 0, "segments": 0}
+            )
+            speaker["seconds"] += max(0.0, end - start)
+            speaker["characters"] += characters
+            speaker["segments"] += 1
+
+    def add_segment(self, segment: Mapping[str, Any], label: str = "") -> None:
+        """Add a segment dict as it is decoded.
+
+        Args:
+            segment: Segment with "start", "end" and "text", e.g. from
+                SpeechTranscriber.stream_file()
+            label: Channel/speaker label of the segment, if any
+        """
+        self.add(segment["start"], segment["end"], segment["text"], label)
+
+    def track(
+        self, rows: Iterable[Tuple[float, float, str, str]]
+    ) -> Iterator[Tuple[float, float, str, str]]:
+        """Add (start, end, text, label) rows while passing them through.
+
+        Args:
+            rows: Segment rows, e.g. from MinutesFormatter
+
+        Returns:
+            Iterator over the same rows
+        """
+        for row in rows:
+            self.add(*row)
+            yield row
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current statistics.
+
+        Returns:
+            Dictionary with durations, speech ratio, character and sentence
+            counts, speaking rates (characters per minute) and per-speaker
+            talk time
+        """
+        duration = max(self.duration, self._last_end)
+        speaking_minutes = self.speech_seconds / 60
+        recent_minutes = min(self.rate_window, self._last_end) / 60
+        talk_total = sum(speaker["seconds"] for speaker in self.speakers.values())
+
+        return {
+            "duration": duration,
+            "speech_seconds": self.speech_seconds,
+            "silence_seconds": max(0.0, duration - self.speech_seconds),
+            "speech_ratio": self.speech_seconds / duration if duration else 0.0,
+            "segment_count": self.segment_count,
+            "character_count": self.character_count,
+            "sentence_count": self.sentence_count + int(self._open_sentence),
+            "scripts": dict(self.scripts),
+            "chars_per_minute": (
+                self.character_count / speaking_minutes if speaking_minutes else 0.0
+            ),
+            "recent_chars_per_minute": (
+                self._recent_characters / recent_minutes if recent_minutes else 0.0
+            ),
+            "rate_timeline": list(self.rate_timeline),
+            "speakers": {
+                label: {
+                    **speaker,
+                    "share": speaker["seconds"] / talk_total if talk_total else 0.0,
+                }
+                for label, speaker in self.speakers.items()
+            },
+        }
+
+    def summary_line(self) -> str:
+        """Get a one-line summary for status displays.
+
+        Returns:
+            Character and sentence counts, speech ratio and speaking rate
+        """
+        stats = self.snapshot()
+        return (
+            f"文字数: {stats['character_count']}（{stats['sentence_count']}文）, "
+            f"発話率: {stats['speech_ratio']:.0%}, "
+            f"話速: {stats['chars_per_minute']:.0f}字/分"
+        )
+
+    def format_markdown(self) -> str:
+        """Format the statistics as a Markdown section of the minutes.
+
+        Returns:
+            "会議の統計" section, without a trailing newline
+        """
+        stats = self.snapshot()
+        lines = [
+            "## 会議の統計",
+            "",
+            f"- **録音時間**: {_format_time(stats['duration'])}",
+            f"- **発話時間**: {_format_time(stats['speech_seconds'])}"
+            f"（発話率 {stats['speech_ratio']:.0%}）",
+            f"- **文字数**: {stats['character_count']}（{stats['sentence_count']}文）",
+            f"- **話速**: {stats['chars_per_minute']:.0f}字/分",
+            "- **話速の推移**（1分ごとの文字数）: "
+            + ", ".join(str(count) for count in stats["rate_timeline"]),
+        ]
+
+        if stats["speakers"]:
+            lines += ["", "| 話者 | 発話時間 | 割合 | 文字数 |", "|---|---|---|---|"]
+            lines += [
+                f"| {label} | {_format_time(speaker['seconds'])} | "
+                f"{speaker['share']:.0%} | {speaker['characters']:.0f} |"
+                for label, speaker in stats["speakers"].items()
+            ]
+        return "\n".join(lines)
+
+
+def _format_time(seconds: float) -> str:
+    """Format seconds as MM:SS (minutes may exceed 59)."""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,620 @@
+"""Benchmark helpers for measuring RecordNote performance."""
+
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .diarization import SpeakerDiarizer
+from .formatter import MinutesFormatter
+from .multichannel import MultiChannelTranscriber
+from .preprocess import AudioPreprocessor
+from .recorder import AudioRecorder
+from .refine import DraftRefineTranscriber
+from .sources import AudioSource, SyntheticSource
+from .transcriber import SAMPLE_RATE, SpeechTranscriber
+from .transcript import Transcript, TranscriptBuilder
+
+
+def measure_throughput(
+    transcriber: SpeechTranscriber, audio_files: Sequence[Path]
+) -> Dict[str, Any]:
+    """Measure transcription throughput over a set of audio files.
+
+    Model loading is excluded from the measurement.
+
+    Args:
+        transcriber: Transcriber to benchmark
+        audio_files: Audio files to transcribe
+
+    Returns:
+        Dictionary with audio duration, wall time and throughput figures
+    """
+    transcriber.load_model()
+
+    start = time.perf_counter()
+    results = transcriber.transcribe_files(audio_files)
+    wall_seconds = time.perf_counter() - start
+
+    audio_seconds = sum(result.get("duration", 0.0) for result in results)
+
+    return {
+        "files": len(results),
+        "audio_seconds": audio_seconds,
+        "wall_seconds": wall_seconds,
+        "audio_hours_per_hour": audio_seconds / wall_seconds if wall_seconds else 0.0,
+        "real_time_factor": wall_seconds / audio_seconds if audio_seconds else 0.0,
+    }
+
+
+def compare_batch_sizes(
+    model_size: str, audio_files: Sequence[Path], batch_sizes: Sequence[int]
+) -> Dict[int, Dict[str, Any]]:
+    """Compare sequential and batched transcription throughput.
+
+    Args:
+        model_size: Whisper model size to benchmark
+        audio_files: Audio files to transcribe
+        batch_sizes: Batch sizes to compare (1 is the sequential path)
+
+    Returns:
+        Throughput figures keyed by batch size
+    """
+    report: Dict[int, Dict[str, Any]] = {}
+    for batch_size in batch_sizes:
+        transcriber = SpeechTranscriber(model_size, batch_size=batch_size)
+        report[batch_size] = measure_throughput(transcriber, audio_files)
+    return report
+
+
+def _measure(func: Callable[[], Any]) -> Tuple[Any, float, int]:
+    """Run a function and measure its wall time and allocated memory.
+
+    Args:
+        func: Function to run
+
+    Returns:
+        Tuple of (return value, seconds, bytes still allocated afterwards)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, seconds, allocated
+
+
+def measure_transcript_footprint(segment_count: int) -> Dict[str, Dict[str, Any]]:
+    """Compare list-of-dicts results with columnar transcripts.
+
+    A synthetic transcript of the given size is built in both forms, then
+    formatted into minutes and (for the transcript) saved to disk.
+
+    Args:
+        segment_count: Number of synthetic segments
+
+    Returns:
+        Memory and timing figures keyed by representation
+    """
+    sentence = "本日の議題について説明します。"
+    formatter = MinutesFormatter()
+
+    def build_dicts() -> Dict[str, Any]:
+        segments = []
+        full_text = ""
+        for i in range(segment_count):
+            segments.append({"start": i * 2.0, "end": i * 2.0 + 1.5, "text": sentence})
+            full_text += sentence + " "
+        return {"text": full_text.strip(), "language": "ja", "segments": segments}
+
+    def build_transcript() -> Transcript:
+        builder = TranscriptBuilder(language="ja")
+        for i in range(segment_count):
+            builder.append(i * 2.0, i * 2.0 + 1.5, sentence)
+        return builder.build()
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, build in (("dicts", build_dicts), ("transcript", build_transcript)):
+        result, build_seconds, memory_bytes = _measure(build)
+        start = time.perf_counter()
+        formatter.format_minutes(result)
+        format_seconds = time.perf_counter() - start
+        report[name] = {
+            "memory_bytes": memory_bytes,
+            "build_seconds": build_seconds,
+            "format_seconds": format_seconds,
+        }
+
+        if isinstance(result, Transcript):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = Path(temp_dir) / "transcript.npz"
+                start = time.perf_counter()
+                result.save(path)
+                report[name]["save_seconds"] = time.perf_counter() - start
+                report[name]["file_bytes"] = path.stat().st_size
+                start = time.perf_counter()
+                Transcript.load(path)
+                report[name]["load_seconds"] = time.perf_counter() - start
+
+    return report
+
+
+def load_fixtures(fixture_dir: Path) -> List[Tuple[Path, str]]:
+    """Load audio fixtures paired with reference transcripts.
+
+    Every audio file (wav/flac/mp3) needs a sibling .txt file with the same
+    stem holding the reference text.
+
+    Args:
+        fixture_dir: Directory containing the fixtures
+
+    Returns:
+        List of (audio path, reference text) pairs
+    """
+    fixtures = []
+    for audio_path in sorted(fixture_dir.iterdir()):
+        if audio_path.suffix.lower() not in (".wav", ".flac", ".mp3"):
+            continue
+        reference_path = audio_path.with_suffix(".txt")
+        if reference_path.exists():
+            fixtures.append((audio_path, reference_path.read_text(encoding="utf-8")))
+    return fixtures
+
+
+def _normalize_for_scoring(text: str) -> str:
+    """Remove whitespace and punctuation before comparing texts."""
+    return re.sub(r"[\s、。，．,.!?！？「」]", "", text)
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """Compute the character error rate of a hypothesis.
+
+    Japanese has no word boundaries, so accuracy is measured on characters
+    after removing whitespace and punctuation.
+
+    Args:
+        reference: Reference transcript
+        hypothesis: Recognized text
+
+    Returns:
+        Edit distance divided by the reference length
+    """
+    ref = _normalize_for_scoring(reference)
+    hyp = _normalize_for_scoring(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_char in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_char in enumerate(hyp, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_char != hyp_char),
+                )
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def term_accuracy(reference: str, hypothesis: str, terms: Sequence[str]) -> float:
+    """Compute the share of glossary term occurrences that were recognized.
+
+    Args:
+        reference: Reference transcript
+        hypothesis: Recognized text
+        terms: Glossary terms
+
+    Returns:
+        Recognized occurrences divided by occurrences in the reference (1.0
+        when the reference contains none of the terms)
+    """
+    ref = _normalize_for_scoring(reference)
+    hyp = _normalize_for_scoring(hypothesis)
+    expected = 0
+    found = 0
+    for term in terms:
+        term = _normalize_for_scoring(term)
+        if term:
+            expected += ref.count(term)
+            found += min(ref.count(term), hyp.count(term))
+    return found / expected if expected else 1.0
+
+
+def benchmark_draft_refine(
+    fixtures: Sequence[Tuple[Path, str]],
+    draft_model_size: str = "tiny",
+    refine_model_size: str = "medium",
+) -> Dict[str, Dict[str, Any]]:
+    """Measure latency to first text and final accuracy of two-pass mode.
+
+    Args:
+        fixtures: (audio path, reference text) pairs
+        draft_model_size: Model used for the draft pass
+        refine_model_size: Model used for the refine pass
+
+    Returns:
+        Per-fixture latency and character error rates of draft and final text
+    """
+    transcriber = DraftRefineTranscriber(draft_model_size, refine_model_size)
+    transcriber.load_model()
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for audio_path, reference in fixtures:
+        drafts: List[str] = []
+        transcript = transcriber.transcribe_file(
+            audio_path,
+            on_update=lambda t: drafts.append(t.text) if not drafts else None,
+        )
+        timing = transcript.metadata["refine"]
+        report[audio_path.name] = {
+            "first_text_latency": timing["first_text_latency"],
+            "total_seconds": timing["total_seconds"],
+            "draft_cer": character_error_rate(reference, drafts[0] if drafts else ""),
+            "final_cer": character_error_rate(reference, transcript.text),
+            "changed_segments": timing["changed_segments"],
+        }
+    return report
+
+
+def benchmark_decoding(
+    fixtures: Sequence[Tuple[Path, str]],
+    model_size: str = "base",
+    strategies: Sequence[str] = ("beam", "adaptive"),
+) -> Dict[str, Dict[str, Any]]:
+    """Compare decoding speed and accuracy of decoding strategies.
+
+    Args:
+        fixtures: (audio path, reference text) pairs
+        model_size: Whisper model size to benchmark
+        strategies: Decoding strategies to compare
+
+    Returns:
+        Real-time factor, mean character error rate and re-decode share keyed
+        by strategy
+    """
+    report: Dict[str, Dict[str, Any]] = {}
+    for strategy in strategies:
+        transcriber = SpeechTranscriber(model_size, decoding=strategy)
+        transcriber.load_model()
+
+        wall_seconds = 0.0
+        audio_seconds = 0.0
+        error_rates = []
+        segments = 0
+        redecoded = 0
+        for audio_path, reference in fixtures:
+            start = time.perf_counter()
+            transcript = transcriber.transcribe_file(audio_path)
+            wall_seconds += time.perf_counter() - start
+            audio_seconds += transcript.duration
+            error_rates.append(character_error_rate(reference, transcript.text))
+            segments += transcript.metadata["decoding"]["segments"]
+            redecoded += transcript.metadata["decoding"]["redecoded_segments"]
+
+        report[strategy] = {
+            "wall_seconds": wall_seconds,
+            "real_time_factor": wall_seconds / audio_seconds if audio_seconds else 0.0,
+            "mean_cer": sum(error_rates) / len(error_rates) if error_rates else 0.0,
+            "redecoded_share": redecoded / segments if segments else 0.0,
+        }
+    return report
+
+
+def benchmark_context(
+    fixtures: Sequence[Tuple[Path, str]],
+    glossary: Sequence[str],
+    model_size: str = "base",
+    chunk_seconds: float = 30.0,
+) -> Dict[str, Dict[str, Any]]:
+    """Compare chunked transcription with and without glossary and context.
+
+    Each fixture is split into chunks that are transcribed one after another,
+    as in live mode.
+
+    Args:
+        fixtures: (audio path, reference text) pairs
+        glossary: Glossary terms to prompt with
+        model_size: Whisper model size to benchmark
+        chunk_seconds: Length of each chunk
+
+    Returns:
+        Decode time, mean character error rate, glossary term accuracy and
+        temperature fallbacks keyed by configuration
+    """
+    # (glossary, context tokens) of each configuration
+    configurations: Dict[str, Tuple[Sequence[str], int]] = {
+        "none": ((), 0),
+        "context": ((), 64),
+        "glossary": (glossary, 0),
+        "glossary+context": (glossary, 64),
+    }
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, (terms, context_tokens) in configurations.items():
+        transcriber = SpeechTranscriber(
+            model_size, glossary=terms, context_tokens=context_tokens
+        )
+        transcriber.load_model()
+
+        wall_seconds = 0.0
+        audio_seconds = 0.0
+        error_rates = []
+        term_rates = []
+        fallbacks = 0
+        for audio_path, reference in fixtures:
+            audio = transcriber.load_audio(audio_path)
+            chunk = int(chunk_seconds * SAMPLE_RATE)
+            texts = []
+            for offset in range(0, len(audio), chunk):
+                start = time.perf_counter()
+                transcript = transcriber.transcribe_audio(
+                    audio[offset : offset + chunk], offset=offset / SAMPLE_RATE
+                )
+                wall_seconds += time.perf_counter() - start
+                texts.append(transcript.text)
+                fallbacks += transcript.metadata["decoding"]["fallback_segments"]
+            audio_seconds += len(audio) / SAMPLE_RATE
+            hypothesis = " ".join(texts)
+            error_rates.append(character_error_rate(reference, hypothesis))
+            term_rates.append(term_accuracy(reference, hypothesis, glossary))
+
+        report[name] = {
+            "wall_seconds": wall_seconds,
+            "real_time_factor": wall_seconds / audio_seconds if audio_seconds else 0.0,
+            "mean_cer": sum(error_rates) / len(error_rates) if error_rates else 0.0,
+            "term_accuracy": sum(term_rates) / len(term_rates) if term_rates else 0.0,
+            "fallback_segments": fallbacks,
+        }
+    return report
+
+
+def stress_test_pipeline(
+    source: AudioSource, model_size: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Push an audio source through recorder, transcriber and formatter.
+
+    Args:
+        source: Audio source to record from (e.g. a FileSource at 50x speed)
+        model_size: Whisper model size; recording only when None
+
+    Returns:
+        Figures for each pipeline stage that was run
+    """
+    recorder = AudioRecorder(source=source)
+    recorder.start_recording()
+    recorder.wait_until_finished()
+    recorder.stop_recording()
+    report: Dict[str, Dict[str, Any]] = {"record": recorder.get_stats()}
+
+    if model_size is not None:
+        transcriber = SpeechTranscriber(model_size)
+        transcriber.load_model()
+        start = time.perf_counter()
+        transcript = transcriber.transcribe_bytes(recorder.get_audio_bytes())
+        transcribe_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        MinutesFormatter().format_minutes(transcript)
+        format_seconds = time.perf_counter() - start
+        audio_seconds = report["record"]["audio_seconds"]
+        report["transcribe"] = {
+            "audio_seconds": audio_seconds,
+            "wall_seconds": transcribe_seconds,
+            "speed": audio_seconds / transcribe_seconds if transcribe_seconds else 0.0,
+        }
+        report["format"] = {"wall_seconds": format_seconds}
+
+    return report
+
+
+def benchmark_preprocessing(
+    seconds: float = 60.0, sample_rate: int = 44100, block_size: int = 1024
+) -> Dict[str, Dict[str, Any]]:
+    """Measure the CPU cost of each preprocessing stage.
+
+    Args:
+        seconds: Length of the synthetic test audio
+        sample_rate: Sample rate of the test audio
+        block_size: Frames per block, as delivered by the recorder
+
+    Returns:
+        CPU seconds per audio second keyed by stage configuration
+    """
+    blocks: List[np.ndarray] = []
+    SyntheticSource(seconds, sample_rate, block_size=block_size).stream(
+        lambda block, overflowed: blocks.append(block), lambda: True
+    )
+
+    configurations = {
+        "highpass": {"highpass": True, "noise_gate": False, "agc": False},
+        "noise_gate": {"highpass": False, "noise_gate": True, "agc": False},
+        "agc": {"highpass": False, "noise_gate": False, "agc": True},
+        "all": {"highpass": True, "noise_gate": True, "agc": True},
+    }
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, stages in configurations.items():
+        preprocessor = AudioPreprocessor(sample_rate, **stages)
+        start = time.process_time()
+        for block in blocks:
+            preprocessor.process(block.copy())
+        cpu_seconds = time.process_time() - start
+        report[name] = {
+            "cpu_seconds": cpu_seconds,
+            "cpu_seconds_per_audio_second": cpu_seconds / seconds,
+            "microseconds_per_block": cpu_seconds / len(blocks) * 1e6,
+        }
+    return report
+
+
+# (fundamental frequency, formant frequencies) of the synthetic speakers
+SYNTHETIC_VOICES = [
+    (120.0, (700.0, 1200.0, 2600.0)),
+    (210.0, (400.0, 2000.0, 2900.0)),
+    (160.0, (500.0, 900.0, 2400.0)),
+    (95.0, (600.0, 1500.0, 2500.0)),
+]
+
+
+def synthetic_conversation(
+    seconds: float, speakers: int = 2, sample_rate: int = SAMPLE_RATE, seed: int = 0
+) -> Tuple[np.ndarray, Transcript, List[int]]:
+    """Generate a conversation of vowel-like voices taking random turns.
+
+    Args:
+        seconds: Approximate length of the conversation
+        speakers: Number of distinct voices (up to len(SYNTHETIC_VOICES))
+        sample_rate: Sample rate of the generated audio
+        seed: Random seed for turn order, turn lengths and noise
+
+    Returns:
+        Mono samples, a transcript with one segment per turn and the true
+        speaker index of each turn
+    """
+    rng = np.random.default_rng(seed)
+    builder = TranscriptBuilder()
+    turns: List[np.ndarray] = []
+    truth: List[int] = []
+    position = 0.0
+    while position < seconds:
+        speaker = int(rng.integers(speakers))
+        duration = float(rng.uniform(1.5, 4.0))
+        fundamental, formants = SYNTHETIC_VOICES[speaker]
+
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        pitch = fundamental * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voice = np.zeros_like(t)
+        for harmonic in range(1, int(4000 / fundamental)):
+            frequency = harmonic * fundamental
+            envelope = sum(np.exp(-(((frequency - f) / 150) ** 2)) for f in formants)
+            voice += (envelope + 0.05) / np.sqrt(harmonic) * np.sin(harmonic * phase)
+        voice *= 0.1 / np.sqrt(np.mean(voice**2))
+        voice += rng.normal(0.0, 0.003, len(voice))
+
+        turns.append(voice.astype(np.float32))
+        truth.append(speaker)
+        builder.append(position, position + duration, f"turn {len(truth)}")
+        position += duration
+
+    return np.concatenate(turns), builder.build(), truth
+
+
+def benchmark_diarization(
+    seconds: float = 600.0, speaker_counts: Sequence[int] = (2, 3, 4)
+) -> Dict[int, Dict[str, Any]]:
+    """Measure diarization speed and labelling purity on synthetic voices.
+
+    Args:
+        seconds: Length of each synthetic conversation
+        speaker_counts: Numbers of speakers to test
+
+    Returns:
+        Real-time factor and purity keyed by speaker count
+    """
+    report: Dict[int, Dict[str, Any]] = {}
+    for speakers in speaker_counts:
+        audio, transcript, truth = synthetic_conversation(seconds, speakers)
+        diarizer = SpeakerDiarizer()
+
+        start = time.process_time()
+        diarizer.annotate(transcript, audio)
+        cpu_seconds = time.process_time() - start
+
+        # Purity: share of segments whose label agrees with the majority
+        # true speaker of that label
+        labels = transcript.fields["speaker"].tolist()
+        majority = 0
+        for label in set(labels):
+            members = [truth[i] for i, value in enumerate(labels) if value == label]
+            majority += max(members.count(speaker) for speaker in set(members))
+
+        report[speakers] = {
+            "segments": transcript.segment_count,
+            "found_speakers": diarizer.clusterer.speaker_count,
+            "purity": majority / len(labels),
+            "cpu_seconds": cpu_seconds,
+            "real_time_factor": cpu_seconds / (len(audio) / SAMPLE_RATE),
+        }
+    return report
+
+
+def benchmark_channel_scaling(
+    model_size: str = "tiny",
+    seconds: float = 60.0,
+    channel_counts: Sequence[int] = (1, 2, 4),
+) -> Dict[int, Dict[str, Any]]:
+    """Measure how per-channel transcription scales with the channel count.
+
+    Every channel gets its own worker, and the CPU cores are split between
+    the workers.
+
+    Args:
+        model_size: Whisper model size
+        seconds: Length of each channel's synthetic audio
+        channel_counts: Numbers of channels to test
+
+    Returns:
+        Wall time, CPU time and throughput keyed by channel count. Efficiency
+        is the throughput relative to channels times the one-channel
+        throughput.
+    """
+    report: Dict[int, Dict[str, Any]] = {}
+    single_channel_throughput: Optional[float] = None
+    for channels in channel_counts:
+        blocks: List[np.ndarray] = []
+        SyntheticSource(seconds, SAMPLE_RATE, channels=channels).stream(
+            lambda block, overflowed: blocks.append(block), lambda: True
+        )
+        audio = np.concatenate(blocks)
+
+        transcriber = MultiChannelTranscriber(model_size, workers=channels)
+        transcriber.load_model()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        transcriber.transcribe_channels(audio, SAMPLE_RATE)
+        cpu_seconds = time.process_time() - cpu_start
+        wall_seconds = time.perf_counter() - wall_start
+
+        throughput = channels * seconds / wall_seconds
+        if single_channel_throughput is None:
+            single_channel_throughput = throughput / channels
+        report[channels] = {
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "audio_seconds_per_second": throughput,
+            "efficiency": throughput / (channels * single_channel_throughput),
+        }
+    return report
+
+
+def format_report(rows: Dict[Any, Dict[str, Any]], key_label: str) -> str:
+    """Format benchmark results as a plain text table.
+
+    Args:
+        rows: Benchmark figures keyed by the compared setting
+        key_label: Column label for the compared setting
+
+    Returns:
+        Table as a string
+    """
+    if not rows:
+        return ""
+
+    columns: List[str] = []
+    for figures in rows.values():
+        columns.extend(column for column in figures if column not in columns)
+
+    lines = ["\t".join([key_label] + columns)]
+    for key, figures in rows.items():
+        cells = [str(key)]
+        for column in columns:
+            value = figures.get(column, "")
+            cells.append(f"{value:.3f}" if isinstance(value, float) else str(value))
+        lines.append("\t".join(cells))
+    return "\n".join(lines)
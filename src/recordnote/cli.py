@@ -0,0 +1,346 @@
+"""Command line interface for RecordNote."""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the recordnote command."""
+    parser = argparse.ArgumentParser(
+        prog="recordnote", description="Japanese voice recording and minutes tool"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("app", help="Launch the desktop application (default)")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a local transcription server with a model pool"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Listen address")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Listen port")
+    serve_parser.add_argument("--model", default="base", help="Whisper model size")
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of models loaded in the pool"
+    )
+    serve_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="Requests allowed to wait for a model before returning 503",
+    )
+
+    transcribe_parser = subparsers.add_parser(
+        "transcribe", help="Transcribe an audio file and export it"
+    )
+    transcribe_parser.add_argument("audio_file", type=Path)
+    transcribe_parser.add_argument(
+        "--format",
+        nargs="+",
+        default=["md"],
+        choices=["md", "srt", "vtt", "json"],
+        help="Output formats, all written in one pass",
+    )
+    transcribe_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Output path without extension (default: next to the audio file)",
+    )
+    transcribe_parser.add_argument("--model", default="base", help="Whisper model size")
+    transcribe_parser.add_argument("--title", default="", help="Meeting title")
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Transcribe recordings dropped into a directory"
+    )
+    watch_parser.add_argument("directory", type=Path)
+    watch_parser.add_argument("--model", default="base", help="Whisper model size")
+    watch_parser.add_argument(
+        "--workers", type=int, default=1, help="Recordings transcribed concurrently"
+    )
+    watch_parser.add_argument(
+        "--format",
+        nargs="+",
+        default=["md"],
+        choices=["md", "srt", "vtt", "json"],
+        help="Output formats written next to each recording",
+    )
+    watch_parser.add_argument(
+        "--urgent",
+        nargs="+",
+        default=[],
+        metavar="PATTERN",
+        help="File name patterns transcribed before other recordings",
+    )
+    watch_parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=2.0,
+        help="Seconds a file must stay unchanged before it is transcribed",
+    )
+    watch_parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds between checks"
+    )
+    watch_parser.add_argument(
+        "--polling", action="store_true", help="Poll the directory instead of inotify"
+    )
+    watch_parser.add_argument(
+        "--rescan-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between full directory scans (catches network-share writes)",
+    )
+    watch_parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between throughput/queue metric log lines",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="Run performance benchmarks")
+    bench_subparsers = bench_parser.add_subparsers(dest="suite", required=True)
+
+    batch_parser = bench_subparsers.add_parser(
+        "batch", help="Compare sequential and batched transcription throughput"
+    )
+    batch_parser.add_argument("audio_files", nargs="+", type=Path)
+    batch_parser.add_argument("--model", default="base", help="Whisper model size")
+    batch_parser.add_argument(
+        "--batch-sizes",
+        nargs="+",
+        type=int,
+        default=[1, 8],
+        help="Batch sizes to compare (1 is the sequential path)",
+    )
+
+    transcript_parser = bench_subparsers.add_parser(
+        "transcript", help="Compare transcript memory and formatting time"
+    )
+    transcript_parser.add_argument(
+        "--segments", type=int, default=100000, help="Number of synthetic segments"
+    )
+
+    refine_parser = bench_subparsers.add_parser(
+        "refine", help="Measure latency and accuracy of draft/refine transcription"
+    )
+    refine_parser.add_argument(
+        "fixture_dir", type=Path, help="Directory of audio files with .txt references"
+    )
+    refine_parser.add_argument("--draft-model", default="tiny")
+    refine_parser.add_argument("--refine-model", default="medium")
+
+    decoding_parser = bench_subparsers.add_parser(
+        "decoding", help="Compare beam search and adaptive decoding"
+    )
+    decoding_parser.add_argument(
+        "fixture_dir", type=Path, help="Directory of audio files with .txt references"
+    )
+    decoding_parser.add_argument("--model", default="base", help="Whisper model size")
+
+    context_parser = bench_subparsers.add_parser(
+        "context", help="Compare chunked decoding with and without glossary/context"
+    )
+    context_parser.add_argument(
+        "fixture_dir", type=Path, help="Directory of audio files with .txt references"
+    )
+    context_parser.add_argument(
+        "--glossary", nargs="+", default=[], help="Glossary terms (e.g. product names)"
+    )
+    context_parser.add_argument("--model", default="base", help="Whisper model size")
+    context_parser.add_argument("--chunk-seconds", type=float, default=30.0)
+
+    replay_parser = bench_subparsers.add_parser(
+        "replay", help="Stress-test the recording pipeline faster than real time"
+    )
+    replay_source = replay_parser.add_mutually_exclusive_group(required=True)
+    replay_source.add_argument("--file", type=Path, help="WAV or FLAC file to replay")
+    replay_source.add_argument(
+        "--synthetic", type=float, metavar="SECONDS", help="Generate synthetic audio"
+    )
+    replay_parser.add_argument(
+        "--speed",
+        type=float,
+        default=50.0,
+        help="Replay speed as a multiple of real time (0 for unthrottled)",
+    )
+    replay_parser.add_argument(
+        "--model", help="Also transcribe and format with this Whisper model size"
+    )
+
+    preprocess_parser = bench_subparsers.add_parser(
+        "preprocess", help="Measure CPU cost of the audio preprocessing stages"
+    )
+    preprocess_parser.add_argument("--seconds", type=float, default=60.0)
+    preprocess_parser.add_argument("--sample-rate", type=int, default=44100)
+    preprocess_parser.add_argument("--block-size", type=int, default=1024)
+
+    diarization_parser = bench_subparsers.add_parser(
+        "diarization", help="Measure speaker diarization speed on synthetic voices"
+    )
+    diarization_parser.add_argument("--seconds", type=float, default=600.0)
+    diarization_parser.add_argument(
+        "--speakers", nargs="+", type=int, default=[2, 3, 4]
+    )
+
+    channels_parser = bench_subparsers.add_parser(
+        "channels", help="Measure per-channel transcription scaling"
+    )
+    channels_parser.add_argument("--model", default="tiny", help="Whisper model size")
+    channels_parser.add_argument("--seconds", type=float, default=60.0)
+    channels_parser.add_argument("--channels", nargs="+", type=int, default=[1, 2, 4])
+
+    return parser
+
+
+def _run_benchmark(args: argparse.Namespace) -> None:
+    """Run the benchmark suite selected on the command line."""
+    from . import benchmark
+
+    report: Dict[Any, Dict[str, Any]]
+    if args.suite == "batch":
+        report = benchmark.compare_batch_sizes(
+            args.model, args.audio_files, args.batch_sizes
+        )
+        print(benchmark.format_report(report, "batch_size"))
+    elif args.suite == "transcript":
+        report = benchmark.measure_transcript_footprint(args.segments)
+        print(benchmark.format_report(report, "representation"))
+    elif args.suite == "refine":
+        fixtures = benchmark.load_fixtures(args.fixture_dir)
+        report = benchmark.benchmark_draft_refine(
+            fixtures, args.draft_model, args.refine_model
+        )
+        print(benchmark.format_report(report, "fixture"))
+    elif args.suite == "replay":
+        from .sources import AudioSource, FileSource, SyntheticSource
+
+        speed = args.speed or None
+        source: AudioSource
+        if args.file:
+            source = FileSource(args.file, speed=speed)
+        else:
+            source = SyntheticSource(args.synthetic, speed=speed)
+        report = benchmark.stress_test_pipeline(source, args.model)
+        print(benchmark.format_report(report, "stage"))
+    elif args.suite == "preprocess":
+        report = benchmark.benchmark_preprocessing(
+            args.seconds, args.sample_rate, args.block_size
+        )
+        print(benchmark.format_report(report, "stages"))
+    elif args.suite == "decoding":
+        fixtures = benchmark.load_fixtures(args.fixture_dir)
+        report = benchmark.benchmark_decoding(fixtures, args.model)
+        print(benchmark.format_report(report, "strategy"))
+    elif args.suite == "context":
+        fixtures = benchmark.load_fixtures(args.fixture_dir)
+        report = benchmark.benchmark_context(
+            fixtures, args.glossary, args.model, args.chunk_seconds
+        )
+        print(benchmark.format_report(report, "prompt"))
+    elif args.suite == "diarization":
+        report = benchmark.benchmark_diarization(args.seconds, args.speakers)
+        print(benchmark.format_report(report, "speakers"))
+    elif args.suite == "channels":
+        report = benchmark.benchmark_channel_scaling(
+            args.model, args.seconds, args.channels
+        )
+        print(benchmark.format_report(report, "channels"))
+
+
+def _run_transcribe(args: argparse.Namespace) -> None:
+    """Transcribe an audio file straight into the selected export formats."""
+    from .exporters import EXPORTERS, export_segments
+    from .transcriber import SpeechTranscriber
+
+    stem = args.output or args.audio_file.with_suffix("")
+    outputs = {
+        name: stem.with_name(stem.name + EXPORTERS[name].extension)
+        for name in args.format
+    }
+
+    # Segments go from the decoder to every file without building a transcript
+    transcriber = SpeechTranscriber(args.model)
+    info, segments = transcriber.stream_file(args.audio_file)
+    export_segments(
+        segments,
+        outputs,
+        language=info["language"],
+        duration=info["duration"],
+        metadata={"decoding": transcriber.last_decoding_stats},
+        title=args.title,
+    )
+    for path in outputs.values():
+        print(f"Wrote {path}")
+
+
+def _run_watch(args: argparse.Namespace) -> None:
+    """Run the watch-folder ingestion daemon until interrupted."""
+    import os
+    from fnmatch import fnmatch
+
+    from .ingest import IngestDaemon
+    from .transcriber import SpeechTranscriber
+
+    cpu_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    daemon = IngestDaemon(
+        args.directory,
+        lambda: SpeechTranscriber(args.model, cpu_threads=cpu_threads),
+        workers=args.workers,
+        formats=args.format,
+        priority=lambda path: (
+            0 if any(fnmatch(path.name, pattern) for pattern in args.urgent) else 1
+        ),
+        settle_seconds=args.settle_seconds,
+        poll_interval=args.poll_interval,
+        use_inotify=not args.polling,
+        rescan_interval=args.rescan_interval,
+    )
+    daemon.pool.load_all()
+    print(f"RecordNote watching {args.directory}")
+    daemon.start()
+    try:
+        daemon.run(args.report_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the recordnote command.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    # Resource governor decisions are logged for tuning
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
+
+    # Heavy modules are imported per command so that e.g. benchmarks
+    # do not pull in the GUI toolkit.
+    if args.command in (None, "app"):
+        from .kivy_app import run_kivy_app
+
+        run_kivy_app()
+    elif args.command == "serve":
+        from .server import serve
+
+        serve(args.host, args.port, args.model, args.workers, args.queue_size)
+    elif args.command == "transcribe":
+        _run_transcribe(args)
+    elif args.command == "watch":
+        _run_watch(args)
+    elif args.command == "bench":
+        _run_benchmark(args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+"""Client for the RecordNote transcription server."""
+
+import http.client
+import json
+import select
+import socket
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+from urllib.parse import urlsplit
+
+from .tempaudio import temporary_wav
+from .transcript import Transcript, TranscriptBuilder
+
+# Seconds to wait for "100 Continue" before uploading anyway
+CONTINUE_TIMEOUT = 2.0
+
+# Bytes per upload chunk, sent by the client and read by the server
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when the transcription server rejects a request as overloaded."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize the error.
+
+        Args:
+            retry_after: Seconds the server asked the client to wait
+        """
+        super().__init__(f"Transcription server busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class RemoteTranscriber:
+    """Transcriber that delegates to a RecordNote transcription server.
+
+    Offers the same methods as SpeechTranscriber, so it can be used in its
+    place by the desktop app and scripts without loading a model locally.
+    """
+
+    def __init__(self, server_url: str, timeout: float = 600.0) -> None:
+        """Initialize the remote transcriber.
+
+        Args:
+            server_url: Base URL of the server (e.g. http://127.0.0.1:8765)
+            timeout: Socket timeout in seconds
+        """
+        parts = urlsplit(server_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported server URL: {server_url}")
+
+        self.server_url = server_url
+        self.timeout = timeout
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._health: Dict[str, Any] = {}
+
+    @property
+    def model_size(self) -> str:
+        """Model size reported by the server."""
+        self.load_model()
+        return str(self._health.get("model_size", ""))
+
+    def load_model(self) -> None:
+        """Check that the server is reachable. Models live on the server."""
+        if not self._health:
+            self._health = self.get_health()
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get model and queue information from the server.
+
+        Returns:
+            Health dictionary reported by the server
+        """
+        connection = self._connect()
+        try:
+            connection.request("GET", "/health")
+            response = connection.getresponse()
+            health: Dict[str, Any] = json.loads(response.read().decode("utf-8"))
+            return health
+        finally:
+            connection.close()
+
+    def stream_file(
+        self, audio_file_path: Path
+    ) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Upload an audio file and receive segments as the server decodes them.
+
+        Args:
+            audio_file_path: Path to the audio file
+
+        Returns:
+            Tuple of (language/duration info, lazy iterator of segment dicts)
+
+        Raises:
+            ServerBusyError: If the server's request queue is full
+        """
+        if not audio_file_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+        connection = self._connect()
+        try:
+            # The body is only sent once the server has admitted the request,
+            # so a busy server answers 503 without receiving the upload
+            connection.putrequest("POST", "/transcribe")
+            connection.putheader("Content-Type", "audio/wav")
+            connection.putheader("Transfer-Encoding", "chunked")
+            connection.putheader("Expect", "100-continue")
+            connection.endheaders()
+            if self._await_continue(connection):
+                with open(audio_file_path, "rb") as f:
+                    for block in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+                        connection.send(
+                            f"{len(block):X}\r\n".encode("ascii") + block + b"\r\n"
+                        )
+                connection.send(b"0\r\n\r\n")
+            response = connection.getresponse()
+
+            if response.status == http.client.SERVICE_UNAVAILABLE:
+                response.read()
+                raise ServerBusyError(float(response.getheader("Retry-After", "1")))
+            if response.status != http.client.OK:
+                payload = json.loads(response.read().decode("utf-8") or "{}")
+                raise RuntimeError(
+                    f"Transcription server error: {payload.get('error', response.status)}"
+                )
+
+            info = self._read_message(response)
+            info.pop("type", None)
+        except BaseException:
+            connection.close()
+            raise
+
+        return info, self._iter_segments(connection, response)
+
+    def _await_continue(self, connection: http.client.HTTPConnection) -> bool:
+        """Wait for the server's reply to "Expect: 100-continue".
+
+        Args:
+            connection: Connection whose request headers have been sent
+
+        Returns:
+            True if the body should be sent (100 Continue received, or no
+            reply in time), False if the final response has already arrived
+        """
+        sock = connection.sock
+        deadline = CONTINUE_TIMEOUT
+        while True:
+            readable, _, _ = select.select([sock], [], [], deadline)
+            if not readable:
+                return True
+            head = sock.recv(1024, socket.MSG_PEEK)
+            if not head.startswith((b"HTTP/1.1 100", b"HTTP/1.0 100")):
+                return False
+            end = head.find(b"\r\n\r\n")
+            if end >= 0:
+                # Consume the interim response; the final one follows the body
+                sock.recv(end + 4)
+                return True
+            deadline = self.timeout
+
+    def _iter_segments(
+        self, connection: http.client.HTTPConnection, response: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield segment messages until the server reports completion."""
+        try:
+            while True:
+                message = self._read_message(response)
+                message_type = message.pop("type", None)
+                if message_type == "segment":
+                    yield message
+                elif message_type == "done":
+                    return
+                else:
+                    raise RuntimeError(
+                        f"Transcription server error: {message.get('error')}"
+                    )
+        finally:
+            connection.close()
+
+    def _read_message(self, response: Any) -> Dict[str, Any]:
+        """Read one NDJSON message from a streaming response."""
+        line = response.readline()
+        if not line:
+            raise ConnectionError("Transcription server closed the stream early")
+        message: Dict[str, Any] = json.loads(line.decode("utf-8"))
+        return message
+
+    def transcribe_file(self, audio_file_path: Path) -> Transcript:
+        """Transcribe audio file to text on the server.
+
+        Args:
+            audio_file_path: Path to the audio file
+
+        Returns:
+            Transcript containing transcribed text, segments and language info
+        """
+        info, segments = self.stream_file(audio_file_path)
+        builder = TranscriptBuilder(
+            language=info.get("language", "ja"), duration=info.get("duration", 0.0)
+        )
+        for segment in segments:
+            builder.append_segment(segment)
+        return builder.build()
+
+    def transcribe_files(self, audio_file_paths: Iterable[Path]) -> List[Transcript]:
+        """Transcribe several audio files on the server.
+
+        Args:
+            audio_file_paths: Paths to the audio files
+
+        Returns:
+            List of transcription results in the same order as the input
+        """
+        return [self.transcribe_file(path) for path in audio_file_paths]
+
+    def transcribe_bytes(self, audio_bytes: bytes) -> Transcript:
+        """Transcribe audio from bytes data on the server.
+
+        Args:
+            audio_bytes: Audio data as bytes (WAV format)
+
+        Returns:
+            Transcript containing transcribed text, segments and language info
+        """
+        with temporary_wav(audio_bytes) as temp_path:
+            return self.transcribe_file(temp_path)
+
+    def get_model_info(self) -> Dict[str, Union[str, bool, int]]:
+        """Get information about the server's models.
+
+        Returns:
+            Dictionary with model information
+        """
+        try:
+            self.load_model()
+        except OSError:
+            return {"model_size": "", "server_url": self.server_url, "loaded": False}
+        return {
+            "model_size": str(self._health.get("model_size", "")),
+            "server_url": self.server_url,
+            "workers": int(self._health.get("workers", 0)),
+            "loaded": True,
+        }
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Open a connection to the server."""
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
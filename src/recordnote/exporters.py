@@ -0,0 +1,323 @@
+"""Single-pass export of transcripts to Markdown, SRT, WebVTT and JSON."""
+
+import json
+import math
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Type
+
+from .analytics import MeetingAnalytics
+from .formatter import MinutesFormatter, TextCleaner
+
+# Segment details of the Markdown minutes are kept in memory up to this size
+# and spooled to a temporary file beyond it
+MARKDOWN_SPOOL_SIZE = 1024 * 1024
+
+
+class SegmentExporter(ABC):
+    """Writes one output format while segments are streamed through it."""
+
+    extension: str = ""
+
+    def __init__(self, stream: IO[str], title: str = "") -> None:
+        """Initialize the exporter.
+
+        Args:
+            stream: Text stream receiving the output
+            title: Meeting title (used by formats that have one)
+        """
+        self.stream = stream
+        self.title = title
+        self.formatter = MinutesFormatter()
+
+    def begin(self, language: str, duration: float) -> None:
+        """Write anything that comes before the first segment.
+
+        Args:
+            language: Language code of the transcript
+            duration: Audio duration in seconds
+        """
+
+    @abstractmethod
+    def write_segment(self, segment: Mapping[str, Any]) -> None:
+        """Write one segment.
+
+        Args:
+            segment: Segment dictionary with start, end, text and optional
+                fields such as speaker or channel
+        """
+
+    def finish(self, metadata: Mapping[str, Any]) -> None:
+        """Write anything that comes after the last segment.
+
+        Args:
+            metadata: Transcript metadata
+        """
+
+    def _label(self, segment: Mapping[str, Any]) -> str:
+        """Get the channel/speaker label of a segment."""
+        return self.formatter.segment_label(
+            segment.get("channel", ""), segment.get("speaker", "")
+        )
+
+
+class SrtExporter(SegmentExporter):
+    """SubRip subtitles."""
+
+    extension = ".srt"
+
+    def __init__(self, stream: IO[str], title: str = "") -> None:
+        """Initialize the exporter.
+
+        Args:
+            stream: Text stream receiving the output
+            title: Unused
+        """
+        super().__init__(stream, title)
+        self._index = 0
+
+    def write_segment(self, segment: Mapping[str, Any]) -> None:
+        """Write one subtitle cue."""
+        text = segment.get("text", "").strip()
+        if not text:
+            return
+        self._index += 1
+        label = self._label(segment)
+        start = _format_cue_time(segment.get("start", 0.0), ",")
+        end = _format_cue_time(segment.get("end", 0.0), ",")
+        prefix = f"[{label}] " if label else ""
+        self.stream.write(f"{self._index}\n{start} --> {end}\n{prefix}{text}\n\n")
+
+
+class WebVttExporter(SegmentExporter):
+    """WebVTT subtitles; labels become voice spans."""
+
+    extension = ".vtt"
+
+    def begin(self, language: str, duration: float) -> None:
+        """Write the WebVTT header."""
+        self.stream.write("WEBVTT\n\n")
+
+    def write_segment(self, segment: Mapping[str, Any]) -> None:
+        """Write one subtitle cue."""
+        text = segment.get("text", "").strip()
+        if not text:
+            return
+        label = self._label(segment)
+        start = _format_cue_time(segment.get("start", 0.0), ".")
+        end = _format_cue_time(segment.get("end", 0.0), ".")
+        voice = f"<v {label}>" if label else ""
+        self.stream.write(f"{start} --> {end}\n{voice}{text}\n\n")
+
+
+class JsonExporter(SegmentExporter):
+    """JSON document with every segment field, written segment by segment."""
+
+    extension = ".json"
+
+    def __init__(self, stream: IO[str], title: str = "") -> None:
+        """Initialize the exporter.
+
+        Args:
+            stream: Text stream receiving the output
+            title: Unused
+        """
+        super().__init__(stream, title)
+        self._first = True
+
+    def begin(self, language: str, duration: float) -> None:
+        """Open the document and the segment list."""
+        self.stream.write(
+            f'{{"language": {json.dumps(language)}, '
+            f'"duration": {_to_json(float(duration))}, "segments": ['
+        )
+
+    def write_segment(self, segment: Mapping[str, Any]) -> None:
+        """Write one segment object."""
+        self.stream.write(
+            ("\n  " if self._first else ",\n  ") + _to_json(dict(segment))
+        )
+        self._first = False
+
+    def finish(self, metadata: Mapping[str, Any]) -> None:
+        """Close the segment list and write the metadata."""
+        self.stream.write('\n], "metadata": ' + _to_json(dict(metadata)) + "}\n")
+
+
+class MarkdownExporter(SegmentExporter):
+    """Meeting minutes in the same layout as MinutesFormatter.format_minutes.
+
+    The cleaned full text is written as segments arrive. The timestamped
+    details come after it in the document, so they are spooled (in memory,
+    then on disk) and copied over at the end.
+    """
+
+    extension = ".md"
+
+    def __init__(self, stream: IO[str], title: str = "") -> None:
+        """Initialize the exporter.
+
+        Args:
+            stream: Text stream receiving the output
+            title: Meeting title
+        """
+        super().__init__(stream, title)
+        self._language = "ja"
+        self._cleaner = TextCleaner()
+        self.analytics = MeetingAnalytics()
+        self._details = tempfile.SpooledTemporaryFile(
+            max_size=MARKDOWN_SPOOL_SIZE, mode="w+", encoding="utf-8"
+        )
+
+    def begin(self, language: str, duration: float) -> None:
+        """Write the header and the start of the recognized text section."""
+        self._language = language
+        self.analytics.duration = duration
+        self.stream.write(f"{self.formatter.generate_header(self.title)}\n\n")
+        self.stream.write("## 音声認識結果\n\n")
+
+    def write_segment(self, segment: Mapping[str, Any]) -> None:
+        """Add a segment to the text section and the details."""
+        text = segment.get("text", "")
+        row = (
+            segment.get("start", 0.0),
+            segment.get("end", 0.0),
+            text,
+            self._label(segment),
+        )
+        self.stream.write(self._cleaner.feed(text))
+        self._details.write(self.formatter.format_segments([row]))
+        self.analytics.add(*row)
+
+    def finish(self, metadata: Mapping[str, Any]) -> None:
+        """Copy the spooled details and write the statistics and footer."""
+        self.stream.write("\n\n")
+        if self._details.tell():
+            self.stream.write("## タイムスタンプ付き詳細\n\n")
+            self._details.seek(0)
+            shutil.copyfileobj(self._details, self.stream)
+        self._details.close()
+        if self.analytics.segment_count:
+            self.stream.write(self.analytics.format_markdown())
+
+        self.stream.write(f"\n\n---\n\n**言語**: {self._language}\n")
+        self.stream.write(
+            f"**作成日時**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n"
+        )
+
+
+# Exporters by format name
+EXPORTERS: Dict[str, Type[SegmentExporter]] = {
+    "md": MarkdownExporter,
+    "srt": SrtExporter,
+    "vtt": WebVttExporter,
+    "json": JsonExporter,
+}
+
+
+def format_for_path(path: Path) -> str:
+    """Get the export format matching a file extension.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Format name (a key of EXPORTERS)
+
+    Raises:
+        ValueError: If the extension belongs to no format
+    """
+    for name, exporter in EXPORTERS.items():
+        if path.suffix.lower() == exporter.extension:
+            return name
+    raise ValueError(f"Unsupported export format: {path.suffix}")
+
+
+def export_segments(
+    segments: Iterable[Mapping[str, Any]],
+    outputs: Mapping[str, Path],
+    language: str = "ja",
+    duration: float = 0.0,
+    metadata: Optional[Mapping[str, Any]] = None,
+    title: str = "",
+) -> None:
+    """Export segments to several formats in one pass.
+
+    Segments may come straight from a decoder; each is written to every
+    output as it arrives and is not kept afterwards.
+
+    Args:
+        segments: Segment dictionaries in time order
+        outputs: Output path keyed by format name
+        language: Language code of the transcript
+        duration: Audio duration in seconds
+        metadata: Transcript metadata (written to JSON)
+        title: Meeting title (used by Markdown)
+    """
+    with ExitStack() as stack:
+        exporters: List[SegmentExporter] = []
+        for name, path in outputs.items():
+            if name not in EXPORTERS:
+                raise ValueError(f"Unsupported export format: {name}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stream = stack.enter_context(open(path, "w", encoding="utf-8"))
+            exporters.append(EXPORTERS[name](stream, title))
+
+        for exporter in exporters:
+            exporter.begin(language, duration)
+        for segment in segments:
+            for exporter in exporters:
+                exporter.write_segment(segment)
+        for exporter in exporters:
+            exporter.finish(metadata or {})
+
+
+def export_transcript(
+    transcript: Mapping[str, Any], outputs: Mapping[str, Path], title: str = ""
+) -> None:
+    """Export a transcript or result dictionary to several formats in one pass.
+
+    Args:
+        transcript: Transcript or result dictionary
+        outputs: Output path keyed by format name
+        title: Meeting title (used by Markdown)
+    """
+    export_segments(
+        transcript.get("segments", []),
+        outputs,
+        language=transcript.get("language", "ja"),
+        duration=transcript.get("duration", 0.0),
+        metadata=transcript.get("metadata", {}),
+        title=title,
+    )
+
+
+def _format_cue_time(seconds: float, decimal_separator: str) -> str:
+    """Format seconds as HH:MM:SS plus milliseconds for subtitles."""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_separator}{milliseconds:03d}"
+
+
+def _to_json(value: Any) -> str:
+    """Serialize a value as strict JSON (NaN and infinities become null)."""
+    return json.dumps(_json_safe(value), ensure_ascii=False, allow_nan=False)
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert NumPy values and non-finite floats for json.dumps."""
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, Mapping):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
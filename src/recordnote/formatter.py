@@ -1,8 +1,50 @@
 """Meeting minutes formatting module."""
 
+import math
 import re
 from datetime import datetime
-from typing import Any, Dict, List
+from itertools import repeat
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from .analytics import MeetingAnalytics, count_characters
+from .transcript import Transcript
+
+
+class TextCleaner:
+    """Cleans transcribed text incrementally, one piece at a time.
+
+    Whitespace is collapsed, and complete sentences (ending in 。！？) are
+    emitted with a paragraph break after every second sentence. Text after
+    the last sentence end is held back until more text arrives.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cleaner."""
+        self._pending = ""
+        self._sentences = 0
+
+    def feed(self, text: str) -> str:
+        """Add text and return the cleaned output it completes.
+
+        Args:
+            text: Next piece of raw text (pieces are joined with a space)
+
+        Returns:
+            Cleaned text of the sentences completed by this piece
+        """
+        self._pending = f"{self._pending} {text}" if self._pending else text
+        parts = re.split(r"([。！？])", self._pending)
+        self._pending = parts[-1]
+
+        output = []
+        for i in range(0, len(parts) - 1, 2):
+            sentence = re.sub(r"\s+", " ", parts[i] + parts[i + 1]).strip()
+            if self._sentences:
+                # Line breaks every 2 sentences for readability
+                output.append("\n\n" if self._sentences % 2 == 0 else " ")
+            output.append(sentence)
+            self._sentences += 1
+        return "".join(output)
 
 
 class MinutesFormatter:
@@ -13,27 +55,35 @@ class MinutesFormatter:
         pass
 
     def format_minutes(
-        self, transcription_result: Dict[str, Any], title: str = ""
+        self,
+        transcription_result: Mapping[str, Any],
+        title: str = "",
+        analytics: Optional[MeetingAnalytics] = None,
     ) -> str:
         """Format transcription result into meeting minutes.
 
         Args:
             transcription_result: Result from transcriber containing text and segments
             title: Optional title for the meeting minutes
+            analytics: Statistics filled in while the segments are formatted
+                and appended to the minutes (default: a new MeetingAnalytics)
 
         Returns:
             Formatted meeting minutes as string
         """
         # Extract data from transcription result
         full_text = transcription_result.get("text", "")
-        segments = transcription_result.get("segments", [])
         language = transcription_result.get("language", "ja")
 
         # Generate header
-        header = self._generate_header(title)
+        header = self.generate_header(title)
 
-        # Format segments with timestamps
-        formatted_segments = self._format_segments(segments)
+        # Format segments with timestamps, collecting statistics on the way
+        if analytics is None:
+            analytics = MeetingAnalytics(transcription_result.get("duration", 0.0))
+        formatted_segments = self.format_segments(
+            analytics.track(self.iter_segment_rows(transcription_result))
+        )
 
         # Clean and format full text
         cleaned_text = self._clean_text(full_text)
@@ -47,12 +97,15 @@ class MinutesFormatter:
             minutes += "## タイムスタンプ付き詳細\n\n"
             minutes += formatted_segments
 
+        if analytics.segment_count:
+            minutes += analytics.format_markdown()
+
         minutes += f"\n\n---\n\n**言語**: {language}\n"
         minutes += f"**作成日時**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n"
 
         return minutes
 
-    def _generate_header(self, title: str) -> str:
+    def generate_header(self, title: str) -> str:
         """Generate header for meeting minutes.
 
         Args:
@@ -66,28 +119,76 @@ class MinutesFormatter:
 
         return f"# {title}\n\n**日時**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}"
 
-    def _format_segments(self, segments: List[Dict[str, Any]]) -> str:
-        """Format segments with timestamps.
+    def iter_segment_rows(
+        self, transcription_result: Mapping[str, Any]
+    ) -> Iterator[Tuple[float, float, str, str]]:
+        """Iterate over (start, end, text, label) rows of a transcription result.
+
+        Transcripts are read straight from their columns; plain result
+        dictionaries are read segment by segment. The label combines the
+        channel and speaker of a segment and is empty when neither is known.
 
         Args:
-            segments: List of segment dictionaries with start, end, and text
+            transcription_result: Transcript or result dictionary
 
         Returns:
-            Formatted segments string
+            Iterator of (start, end, text, label) tuples
         """
-        if not segments:
-            return ""
+        if isinstance(transcription_result, Transcript):
+            columns = [
+                repeat("") if column is None else column.tolist()
+                for column in (
+                    transcription_result.field("channel"),
+                    transcription_result.field("speaker"),
+                )
+            ]
+            return (
+                (start, end, text, self.segment_label(channel, speaker))
+                for (start, end, text), channel, speaker in zip(
+                    transcription_result.iter_rows(), *columns
+                )
+            )
 
-        formatted = ""
-        for segment in segments:
-            start_time = self._format_timestamp(segment.get("start", 0))
-            end_time = self._format_timestamp(segment.get("end", 0))
-            text = segment.get("text", "").strip()
+        return (
+            (
+                segment.get("start", 0),
+                segment.get("end", 0),
+                segment.get("text", ""),
+                self.segment_label(
+                    segment.get("channel", ""), segment.get("speaker", "")
+                ),
+            )
+            for segment in transcription_result.get("segments", [])
+        )
 
+    def segment_label(self, channel: Any, speaker: Any) -> str:
+        """Combine the channel and speaker of a segment into one label.
+
+        Missing values (None, NaN or "") are left out, and numeric ids are
+        shown without a trailing ".0".
+        """
+        parts = (_label_part(channel), _label_part(speaker))
+        return " / ".join(part for part in parts if part)
+
+    def format_segments(self, rows: Iterable[Tuple[float, float, str, str]]) -> str:
+        """Format segments with timestamps and channel/speaker labels.
+
+        Args:
+            rows: (start, end, text, label) tuples for each segment
+
+        Returns:
+            Formatted segments string
+        """
+        lines = []
+        for start, end, text, label in rows:
+            text = text.strip()
             if text:
-                formatted += f"**{start_time} - {end_time}**: {text}\n\n"
+                start_time = self._format_timestamp(start)
+                end_time = self._format_timestamp(end)
+                tag = f" [{label}]" if label else ""
+                lines.append(f"**{start_time} - {end_time}**{tag}: {text}\n\n")
 
-        return formatted
+        return "".join(lines)
 
     def _format_timestamp(self, seconds: float) -> str:
         """Format timestamp from seconds to MM:SS format.
@@ -111,34 +212,7 @@ class MinutesFormatter:
         Returns:
             Cleaned and formatted text
         """
-        if not text:
-            return ""
-
-        # Remove extra whitespace
-        cleaned = re.sub(r"\s+", " ", text.strip())
-
-        # Add proper line breaks for readability
-        # Split into sentences and add line breaks
-        sentences = re.split(r"([。！？])", cleaned)
-        formatted_sentences = []
-
-        for i in range(0, len(sentences) - 1, 2):
-            sentence = sentences[i] + (
-                sentences[i + 1] if i + 1 < len(sentences) else ""
-            )
-            if sentence.strip():
-                formatted_sentences.append(sentence.strip())
-
-        # Join sentences with line breaks every 2-3 sentences for readability
-        result = ""
-        for i, sentence in enumerate(formatted_sentences):
-            result += sentence
-            if (i + 1) % 2 == 0 and i < len(formatted_sentences) - 1:
-                result += "\n\n"
-            elif i < len(formatted_sentences) - 1:
-                result += " "
-
-        return result
+        return TextCleaner().feed(text)
 
     def export_to_file(self, minutes: str, file_path: str) -> None:
         """Export formatted minutes to a file.
@@ -155,7 +229,9 @@ class MinutesFormatter:
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(minutes)
 
-    def get_summary_stats(self, transcription_result: Dict[str, Any]) -> Dict[str, Any]:
+    def get_summary_stats(
+        self, transcription_result: Mapping[str, Any]
+    ) -> Dict[str, Any]:
         """Get summary statistics of the transcription.
 
         Args:
@@ -172,16 +248,37 @@ class MinutesFormatter:
                 "total_duration": 0,
                 "segment_count": 0,
                 "word_count": len(full_text.split()) if full_text else 0,
-                "character_count": len(full_text) if full_text else 0,
+                "character_count": count_characters(full_text),
+                "sentence_count": 0,
             }
 
+        analytics = MeetingAnalytics(transcription_result.get("duration", 0.0))
+        for row in self.iter_segment_rows(transcription_result):
+            analytics.add(*row)
+        stats = analytics.snapshot()
+
         total_duration = segments[-1].get("end", 0) if segments else 0
         word_count = len(full_text.split()) if full_text else 0
-        character_count = len(full_text) if full_text else 0
 
         return {
             "total_duration": total_duration,
             "segment_count": len(segments),
             "word_count": word_count,
-            "character_count": character_count,
+            "character_count": stats["character_count"],
+            "sentence_count": stats["sentence_count"],
+            "speech_ratio": stats["speech_ratio"],
+            "chars_per_minute": stats["chars_per_minute"],
+            "speakers": stats["speakers"],
         }
+
+
+def _label_part(value: Any) -> str:
+    """Format a channel or speaker value, returning "" when it is missing."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
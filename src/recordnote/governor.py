@@ -0,0 +1,239 @@
+"""Memory-pressure governor for model size and audio buffer decisions."""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Model sizes from largest to smallest
+MODEL_SIZES = ["large", "medium", "small", "base", "tiny"]
+
+# Approximate parameter counts of the Whisper models, in millions
+MODEL_PARAMETERS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+}
+
+# Bytes per weight for the CTranslate2 compute types available on CPU
+BYTES_PER_PARAMETER = {"int8": 1, "int8_float32": 1, "int16": 2, "float32": 4}
+
+# Runtime and tokenizer memory on top of the weights, in MB
+MODEL_OVERHEAD_MB = 150
+
+MB = 1024 * 1024
+
+
+def estimate_model_mb(model_size: str, compute_type: str) -> float:
+    """Estimate the resident memory of a loaded model.
+
+    Args:
+        model_size: Whisper model size (unknown names count as large)
+        compute_type: CTranslate2 compute type
+
+    Returns:
+        Estimated memory in MB
+    """
+    parameters = MODEL_PARAMETERS_M.get(model_size, MODEL_PARAMETERS_M["large"])
+    bytes_per_parameter = BYTES_PER_PARAMETER.get(compute_type, 4)
+    return parameters * bytes_per_parameter * 1e6 / MB + MODEL_OVERHEAD_MB
+
+
+def read_memory() -> Dict[str, float]:
+    """Read process and system memory figures with psutil.
+
+    Returns:
+        Dictionary with rss_mb, available_mb and total_mb
+    """
+    system = psutil.virtual_memory()
+    return {
+        "rss_mb": psutil.Process().memory_info().rss / MB,
+        "available_mb": system.available / MB,
+        "total_mb": system.total / MB,
+    }
+
+
+class ResourceGovernor:
+    """Keeps model and buffer choices within the memory the machine has.
+
+    Decisions are logged through the ``recordnote.governor`` logger and
+    queued as events that the UI can turn into warnings.
+    """
+
+    def __init__(
+        self,
+        reserve_mb: float = 1024.0,
+        low_memory_mb: float = 1024.0,
+        max_buffer_mb: float = 256.0,
+        max_rss_share: float = 0.5,
+        memory_reader: Optional[Callable[[], Dict[str, float]]] = None,
+    ) -> None:
+        """Initialize the governor.
+
+        Args:
+            reserve_mb: Memory left free for decoding, recording and the rest
+                of the system when choosing a model
+            low_memory_mb: Available memory below which memory is considered
+                under pressure (buffers are spilled and a warning is raised)
+            max_buffer_mb: In-memory audio above this is spilled to disk even
+                without pressure
+            max_rss_share: Share of total memory this process may use before
+                a warning is raised
+            memory_reader: Callable returning rss_mb, available_mb and
+                total_mb (default: read_memory)
+        """
+        self.reserve_mb = reserve_mb
+        self.low_memory_mb = low_memory_mb
+        self.max_buffer_mb = max_buffer_mb
+        self.max_rss_share = max_rss_share
+        self.memory_reader = memory_reader or read_memory
+        self._events: List[Dict[str, Any]] = []
+        self._events_lock = threading.Lock()
+        self._under_pressure = False
+
+    def choose_model(
+        self, model_size: str, compute_type: str = "int8"
+    ) -> Tuple[str, str]:
+        """Pick the model to load, downgrading when memory is short.
+
+        The requested compute type is tried first, then int8 weights, then
+        smaller models with int8 weights.
+
+        Args:
+            model_size: Requested Whisper model size
+            compute_type: Requested compute type
+
+        Returns:
+            (model size, compute type) to load
+        """
+        memory = self.memory_reader()
+        budget = memory["available_mb"] - self.reserve_mb
+
+        candidates = [(model_size, compute_type)]
+        if compute_type != "int8":
+            candidates.append((model_size, "int8"))
+        if model_size in MODEL_SIZES:
+            smaller = MODEL_SIZES[MODEL_SIZES.index(model_size) + 1 :]
+            candidates.extend((size, "int8") for size in smaller)
+
+        chosen = candidates[-1]
+        for candidate in candidates:
+            if estimate_model_mb(*candidate) <= budget:
+                chosen = candidate
+                break
+
+        estimate = estimate_model_mb(*chosen)
+        if chosen == (model_size, compute_type):
+            logger.info(
+                "Loading %s/%s: estimated %.0f MB, budget %.0f MB",
+                model_size,
+                compute_type,
+                estimate,
+                budget,
+            )
+        else:
+            logger.warning(
+                "Downgraded %s/%s to %s/%s: estimated %.0f MB, budget %.0f MB "
+                "(available %.0f MB, reserve %.0f MB)",
+                model_size,
+                compute_type,
+                chosen[0],
+                chosen[1],
+                estimate,
+                budget,
+                memory["available_mb"],
+                self.reserve_mb,
+            )
+            self._add_event(
+                {
+                    "type": "model_downgraded",
+                    "requested": f"{model_size}/{compute_type}",
+                    "chosen": f"{chosen[0]}/{chosen[1]}",
+                    "available_mb": memory["available_mb"],
+                }
+            )
+        return chosen
+
+    def should_spill(self, buffer_bytes: int) -> bool:
+        """Decide whether in-memory audio should be moved to disk.
+
+        Args:
+            buffer_bytes: Size of the audio currently held in memory
+
+        Returns:
+            True if the buffer is large or memory is under pressure
+        """
+        buffer_mb = buffer_bytes / MB
+        if buffer_mb > self.max_buffer_mb:
+            logger.info(
+                "Spilling %.0f MB of audio: above the %.0f MB buffer limit",
+                buffer_mb,
+                self.max_buffer_mb,
+            )
+            return True
+        if buffer_mb > 0 and self.check_pressure():
+            logger.info("Spilling %.0f MB of audio: memory under pressure", buffer_mb)
+            return True
+        return False
+
+    def check_pressure(self) -> bool:
+        """Check memory pressure, raising a warning event when it begins.
+
+        Returns:
+            True if available memory is low or this process uses too much
+        """
+        memory = self.memory_reader()
+        under_pressure = (
+            memory["available_mb"] < self.low_memory_mb
+            or memory["rss_mb"] > self.max_rss_share * memory["total_mb"]
+        )
+        if under_pressure and not self._under_pressure:
+            logger.warning(
+                "Memory under pressure: available %.0f MB, process RSS %.0f MB "
+                "of %.0f MB",
+                memory["available_mb"],
+                memory["rss_mb"],
+                memory["total_mb"],
+            )
+            self._add_event({"type": "low_memory", **memory})
+        elif not under_pressure and self._under_pressure:
+            logger.info(
+                "Memory pressure relieved: available %.0f MB", memory["available_mb"]
+            )
+        self._under_pressure = under_pressure
+        return under_pressure
+
+    def pop_events(self) -> List[Dict[str, Any]]:
+        """Take the events raised since the last call.
+
+        Returns:
+            Event dictionaries with a "type" key (model_downgraded,
+            low_memory or audio_spilled)
+        """
+        with self._events_lock:
+            events, self._events = self._events, []
+        return events
+
+    def record_spill(self, spilled_mb: float, total_spilled_mb: float) -> None:
+        """Record that audio was moved to disk.
+
+        Args:
+            spilled_mb: Audio moved in this spill
+            total_spilled_mb: Audio on disk for the current recording
+        """
+        logger.info(
+            "Spilled %.1f MB of audio to disk (%.1f MB on disk)",
+            spilled_mb,
+            total_spilled_mb,
+        )
+        self._add_event({"type": "audio_spilled", "spilled_mb": total_spilled_mb})
+
+    def _add_event(self, event: Dict[str, Any]) -> None:
+        """Queue an event for pop_events()."""
+        with self._events_lock:
+            self._events.append(event)
@@ -0,0 +1,617 @@
+"""Watch-folder ingestion of recordings dropped by meeting-room devices."""
+
+import ctypes
+import ctypes.util
+import itertools
+import logging
+import os
+import queue
+import select
+import struct
+import threading
+import time
+from collections import deque
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .exporters import EXPORTERS, export_segments
+from .pool import ModelPool
+from .transcriber import SpeechTranscriber
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+_INOTIFY_READ_SIZE = 64 * 1024
+
+# Audio file names picked up by default
+DEFAULT_PATTERNS = ("*.wav", "*.WAV")
+
+
+class PollingWatcher:
+    """Reports the audio files of a directory by scanning it periodically."""
+
+    def __init__(self, directory: Path, patterns: Sequence[str]) -> None:
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch
+            patterns: File name patterns to report
+        """
+        self.directory = directory
+        self.patterns = list(patterns)
+        self._closed = threading.Event()
+
+    def wait(self, timeout: float) -> List[Path]:
+        """Wait for the next scan.
+
+        Args:
+            timeout: Seconds between scans
+
+        Returns:
+            Every matching file currently in the directory
+        """
+        if self._closed.wait(timeout):
+            return []
+        return scan_directory(self.directory, self.patterns)
+
+    def close(self) -> None:
+        """Stop waiting."""
+        self._closed.set()
+
+
+class InotifyWatcher:
+    """Reports files written or moved into a directory, using Linux inotify.
+
+    The kernel interface is called through ctypes, so no extra package is
+    needed. Files that are closed after writing or moved in are reported;
+    if the event queue overflows, the whole directory is rescanned.
+    """
+
+    def __init__(self, directory: Path, patterns: Sequence[str]) -> None:
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch
+            patterns: File name patterns to report
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        self.directory = directory
+        self.patterns = list(patterns)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        watch = libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, os.strerror(error), str(directory))
+
+    def wait(self, timeout: float) -> List[Path]:
+        """Wait for file events.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Matching files that were written or moved in
+        """
+        if self._fd < 0:
+            return []
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, _INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        paths: List[Path] = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logger.warning(
+                    "inotify queue overflowed; rescanning %s", self.directory
+                )
+                return scan_directory(self.directory, self.patterns)
+            if name and any(fnmatch(name, pattern) for pattern in self.patterns):
+                paths.append(self.directory / name)
+        return paths
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def scan_directory(directory: Path, patterns: Sequence[str]) -> List[Path]:
+    """List the files of a directory matching any of the patterns.
+
+    Args:
+        directory: Directory to scan
+        patterns: File name patterns
+
+    Returns:
+        Matching file paths
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file() and any(fnmatch(entry.name, p) for p in patterns)
+        ]
+
+
+class FileStabilityTracker:
+    """Holds files back until they have stopped changing.
+
+    Recorders may write a file in several passes (or over a network share),
+    so a file is only released once its size and modification time have
+    stayed the same for the settle time.
+    """
+
+    def __init__(self, settle_seconds: float = 2.0) -> None:
+        """Initialize the tracker.
+
+        Args:
+            settle_seconds: Seconds a file must stay unchanged
+        """
+        self.settle_seconds = settle_seconds
+        self._pending: Dict[Path, Tuple[int, float, float]] = {}
+
+    def __len__(self) -> int:
+        """Number of files waiting to settle."""
+        return len(self._pending)
+
+    def add(self, path: Path, now: float) -> None:
+        """Start or continue watching a file.
+
+        Args:
+            path: File to watch
+            now: Current monotonic time
+        """
+        if path not in self._pending:
+            self._pending[path] = (-1, 0.0, now)
+
+    def pop_stable(self, now: float) -> List[Path]:
+        """Take the files that have settled.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Files unchanged for the settle time (empty files never settle)
+        """
+        stable = []
+        for path, (size, mtime, since) in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime) != (size, mtime):
+                self._pending[path] = (stat.st_size, stat.st_mtime, now)
+            elif stat.st_size > 0 and now - since >= self.settle_seconds:
+                del self._pending[path]
+                stable.append(path)
+        return stable
+
+
+class IngestMetrics:
+    """Throughput and queue-depth statistics of the ingestion daemon."""
+
+    def __init__(self, window: int = 20) -> None:
+        """Initialize the metrics.
+
+        Args:
+            window: Number of recent files used for the steady-state rates
+        """
+        self.processed = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.max_queue_depth = 0
+        self._recent: Deque[Tuple[float, float, float, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._depth = 0
+        self._depth_area = 0.0
+        self._depth_changed = self._started
+
+    def set_queue_depth(self, depth: int) -> None:
+        """Record the number of queued files.
+
+        Args:
+            depth: Files waiting for a worker
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._depth_area += self._depth * (now - self._depth_changed)
+            self._depth_changed = now
+            self._depth = depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def record_file(
+        self, queued_at: float, started_at: float, finished_at: float, audio: float
+    ) -> None:
+        """Record a transcribed file.
+
+        Args:
+            queued_at: Monotonic time the file was queued
+            started_at: Monotonic time a worker started on it
+            finished_at: Monotonic time its minutes were written
+            audio: Audio duration in seconds
+        """
+        with self._lock:
+            self.processed += 1
+            self.audio_seconds += audio
+            self._recent.append((queued_at, started_at, finished_at, audio))
+
+    def record_failure(self) -> None:
+        """Record a file that could not be transcribed."""
+        with self._lock:
+            self.failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current statistics.
+
+        The steady-state rates cover the recent files only, from the first
+        of them starting to the last finishing, so start-up and idle time
+        before them do not dilute the figures.
+
+        Returns:
+            Dictionary with file counts, queue depth (current, maximum and
+            time-averaged), throughput (audio seconds per second and files
+            per hour) and mean queue wait and processing latency
+        """
+        with self._lock:
+            now = time.monotonic()
+            area = self._depth_area + self._depth * (now - self._depth_changed)
+            recent = list(self._recent)
+            snapshot: Dict[str, Any] = {
+                "processed": self.processed,
+                "failed": self.failed,
+                "audio_seconds": self.audio_seconds,
+                "queue_depth": self._depth,
+                "max_queue_depth": self.max_queue_depth,
+                "mean_queue_depth": area / (now - self._started)
+                if now > self._started
+                else 0.0,
+            }
+
+        span = (
+            max(finished for _, _, finished, _ in recent)
+            - min(started for _, started, _, _ in recent)
+            if recent
+            else 0.0
+        )
+        snapshot["throughput"] = (
+            sum(audio for *_, audio in recent) / span if span > 0 else 0.0
+        )
+        snapshot["files_per_hour"] = len(recent) * 3600 / span if span > 0 else 0.0
+        snapshot["mean_wait_seconds"] = (
+            sum(started - queued for queued, started, _, _ in recent) / len(recent)
+            if recent
+            else 0.0
+        )
+        snapshot["mean_latency_seconds"] = (
+            sum(finished - queued for queued, _, finished, _ in recent) / len(recent)
+            if recent
+            else 0.0
+        )
+        return snapshot
+
+
+class IngestDaemon:
+    """Transcribes recordings appearing in a directory into minutes beside them.
+
+    Settled files are queued by priority and then by size (smallest first,
+    which keeps the mean wait short) and transcribed by a fixed number of
+    workers sharing a ModelPool. A file whose outputs already exist and are
+    newer than the audio is skipped, so restarting the daemon does not
+    redo finished work. The directory is also rescanned periodically, which
+    catches files whose inotify events never arrive (network shares) and
+    forgets files that have been removed.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        transcriber_factory: Callable[[], SpeechTranscriber],
+        workers: int = 1,
+        formats: Sequence[str] = ("md",),
+        patterns: Sequence[str] = DEFAULT_PATTERNS,
+        priority: Optional[Callable[[Path], int]] = None,
+        settle_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        rescan_interval: float = 60.0,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            directory: Directory the recorders write to
+            transcriber_factory: Callable creating a transcriber for the pool
+            workers: Number of files transcribed concurrently (one model each)
+            formats: Export formats written next to each recording
+            patterns: File name patterns of recordings
+            priority: Callable giving a file's priority (lower runs first;
+                default: all files equal)
+            settle_seconds: Seconds a file must stay unchanged before it is
+                queued
+            poll_interval: Seconds between directory scans (polling) or
+                stability checks (inotify)
+            use_inotify: Use inotify where available instead of polling
+            rescan_interval: Seconds between full directory scans. inotify
+                does not see files written by other hosts to SMB/NFS shares,
+                so these are picked up by the rescan.
+        """
+        for name in formats:
+            if name not in EXPORTERS:
+                raise ValueError(f"Unsupported export format: {name}")
+
+        self.directory = directory
+        self.workers = workers
+        self.formats = list(formats)
+        self.patterns = list(patterns)
+        self.priority = priority or (lambda path: 0)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.rescan_interval = rescan_interval
+        self.pool = ModelPool(transcriber_factory, workers)
+        self.metrics = IngestMetrics()
+        self.tracker = FileStabilityTracker(settle_seconds)
+        self._queue: "queue.PriorityQueue[Tuple[int, int, int, float, Path]]" = (
+            queue.PriorityQueue()
+        )
+        self._sequence = itertools.count()
+        # Size and mtime of the files present that were queued or found
+        # finished; entries are dropped when the file disappears
+        self._known: Dict[Path, Tuple[int, float]] = {}
+        self._outstanding = 0
+        self._outstanding_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._watcher: Any = None
+
+    def outputs_for(self, audio_path: Path) -> Dict[str, Path]:
+        """Get the output paths written for a recording.
+
+        Args:
+            audio_path: Recording path
+
+        Returns:
+            Output path keyed by format name
+        """
+        return {
+            name: audio_path.with_suffix(EXPORTERS[name].extension)
+            for name in self.formats
+        }
+
+    def start(self) -> None:
+        """Start the workers and pick up recordings already in the directory."""
+        self._stopped.clear()
+        self._watcher = self._create_watcher()
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._rescan(time.monotonic())
+
+    def run(self, report_interval: float = 60.0) -> None:
+        """Watch the directory until stop() is called.
+
+        Args:
+            report_interval: Seconds between metric log lines (0 disables)
+        """
+        if self._watcher is None:
+            self.start()
+        watcher = self._watcher
+        last_report = last_scan = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                for path in watcher.wait(self.poll_interval):
+                    self._consider(path, time.monotonic())
+
+                now = time.monotonic()
+                if now - last_scan >= self.rescan_interval:
+                    last_scan = now
+                    self._rescan(now)
+                self._enqueue(self.tracker.pop_stable(now), now)
+
+                if report_interval and now - last_report >= report_interval:
+                    last_report = now
+                    self._log_metrics()
+        finally:
+            # Closed here rather than in stop() so that an inotify descriptor
+            # is never closed while this loop is waiting on it
+            watcher.close()
+
+    def stop(self) -> None:
+        """Stop watching and wait for the files being transcribed.
+
+        Files still queued are left for the next start.
+        """
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._watcher = None
+        self._log_metrics()
+
+    def is_idle(self) -> bool:
+        """Check whether no file is settling, queued or being transcribed.
+
+        Returns:
+            True if the daemon has nothing to do
+        """
+        with self._outstanding_lock:
+            outstanding = self._outstanding
+        return not self.tracker and outstanding == 0
+
+    def _create_watcher(self) -> Any:
+        """Create an inotify watcher, falling back to polling."""
+        if self.use_inotify:
+            try:
+                watcher = InotifyWatcher(self.directory, self.patterns)
+                logger.info("Watching %s with inotify", self.directory)
+                return watcher
+            except OSError as e:
+                logger.info("inotify unavailable (%s); polling instead", e)
+        logger.info("Polling %s every %.1f seconds", self.directory, self.poll_interval)
+        return PollingWatcher(self.directory, self.patterns)
+
+    def _rescan(self, now: float) -> None:
+        """Consider every recording in the directory and forget removed ones."""
+        present = scan_directory(self.directory, self.patterns)
+        for path in present:
+            self._consider(path, now)
+        removed = self._known.keys() - set(present)
+        for path in removed:
+            del self._known[path]
+
+    def _consider(self, path: Path, now: float) -> None:
+        """Start tracking a recording unless it was already handled."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return
+        if self._known.get(path) == (stat.st_size, stat.st_mtime):
+            return
+        if self._is_done(path, stat.st_mtime):
+            self._known[path] = (stat.st_size, stat.st_mtime)
+            return
+        self.tracker.add(path, now)
+
+    def _is_done(self, path: Path, mtime: float) -> bool:
+        """Check whether every output exists and is newer than the audio."""
+        for output in self.outputs_for(path).values():
+            try:
+                if output.stat().st_mtime < mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _enqueue(self, paths: List[Path], now: float) -> None:
+        """Queue settled recordings.
+
+        A batch is queued in scheduling order, so an idle worker does not
+        grab whichever file happened to be put first.
+        """
+        jobs = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            self._known[path] = (stat.st_size, stat.st_mtime)
+            jobs.append(
+                (self.priority(path), stat.st_size, next(self._sequence), now, path)
+            )
+
+        for job in sorted(jobs):
+            with self._outstanding_lock:
+                self._outstanding += 1
+            self._queue.put(job)
+            self.metrics.set_queue_depth(self._queue.qsize())
+            logger.info(
+                "Queued %s (%.1f MB, %d waiting)",
+                job[4].name,
+                job[1] / (1024 * 1024),
+                self._queue.qsize(),
+            )
+
+    def _work(self) -> None:
+        """Worker loop: transcribe queued recordings until stopped."""
+        while not self._stopped.is_set():
+            try:
+                _, _, _, queued_at, path = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self.metrics.set_queue_depth(self._queue.qsize())
+            try:
+                self._transcribe(path, queued_at)
+            except Exception as e:
+                self.metrics.record_failure()
+                logger.error("Failed to transcribe %s: %s", path.name, e)
+            finally:
+                with self._outstanding_lock:
+                    self._outstanding -= 1
+
+    def _transcribe(self, path: Path, queued_at: float) -> None:
+        """Transcribe one recording and write its outputs next to it.
+
+        Outputs are written under temporary names and renamed once complete,
+        so a partial file is never mistaken for finished minutes.
+        """
+        outputs = self.outputs_for(path)
+        partial = {
+            name: output.with_name(output.name + ".part")
+            for name, output in outputs.items()
+        }
+
+        with self.pool.acquire() as transcriber:
+            started_at = time.monotonic()
+            try:
+                info, segments = transcriber.stream_file(path)
+                export_segments(
+                    segments,
+                    partial,
+                    language=info["language"],
+                    duration=info["duration"],
+                    metadata={"source": path.name},
+                    title=path.stem,
+                )
+            except BaseException:
+                for output in partial.values():
+                    output.unlink(missing_ok=True)
+                raise
+
+        for name, output in partial.items():
+            os.replace(output, outputs[name])
+        finished_at = time.monotonic()
+        self.metrics.record_file(queued_at, started_at, finished_at, info["duration"])
+        logger.info(
+            "Wrote minutes for %s (%.0f s of audio in %.1f s)",
+            path.name,
+            info["duration"],
+            finished_at - started_at,
+        )
+
+    def _log_metrics(self) -> None:
+        """Log the current metrics."""
+        stats = self.metrics.snapshot()
+        logger.info(
+            "processed=%d failed=%d queue=%d (max %d, mean %.1f) "
+            "throughput=%.1fx files/h=%.1f wait=%.1fs latency=%.1fs",
+            stats["processed"],
+            stats["failed"],
+            stats["queue_depth"],
+            stats["max_queue_depth"],
+            stats["mean_queue_depth"],
+            stats["throughput"],
+            stats["files_per_hour"],
+            stats["mean_wait_seconds"],
+            stats["mean_latency_seconds"],
+        )
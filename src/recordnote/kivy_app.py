@@ -1,14 +1,16 @@
 """Main Kivy application for RecordNote."""
 
+import re
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, List, Optional, Union
 
 import japanize_kivy
 from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.checkbox import CheckBox
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.scrollview import ScrollView
@@ -23,9 +25,20 @@ from kivymd.uix.progressindicator import MDCircularProgressIndicator
 from kivymd.uix.textfield import MDTextField
 from plyer import filechooser
 
+from .analytics import MeetingAnalytics
+from .client import RemoteTranscriber
+from .diarization import SpeakerDiarizer
+from .exporters import export_transcript, format_for_path
 from .formatter import MinutesFormatter
+from .governor import ResourceGovernor
+from .multichannel import MultiChannelTranscriber, MultiDeviceSource
+from .preprocess import AudioPreprocessor
 from .recorder import AudioRecorder
+from .refine import DraftRefineTranscriber
+from .sources import AudioSource, MicrophoneSource
+from .tempaudio import temporary_wav
 from .transcriber import SpeechTranscriber
+from .transcript import Transcript, TranscriptBuilder
 
 
 class RecordNoteKivyApp(MDApp):
@@ -36,14 +49,19 @@ class RecordNoteKivyApp(MDApp):
         super().__init__(**kwargs)
 
         # Core components
+        self.governor = ResourceGovernor()
         self.recorder = AudioRecorder()
-        self.transcriber = SpeechTranscriber()
+        self.transcriber = SpeechTranscriber(governor=self.governor)
         self.formatter = MinutesFormatter()
+        self._multichannel_transcriber: Optional[MultiChannelTranscriber] = None
+        self._two_pass_transcriber: Optional[DraftRefineTranscriber] = None
 
         # State management
         self.recording_state = "stopped"  # stopped, recording, processing, completed
         self.transcribed_text = ""
         self.formatted_minutes = ""
+        self.transcript: Optional[Transcript] = None
+        self.analytics: Optional[MeetingAnalytics] = None
 
         # UI components (will be set in build method)
         self.meeting_title_input: Optional[MDTextField] = None
@@ -52,6 +70,12 @@ class RecordNoteKivyApp(MDApp):
         self.duration_label: Optional[MDLabel] = None
         self.status_label: Optional[MDLabel] = None
         self.model_spinner: Optional[Spinner] = None
+        self.server_url_input: Optional[MDTextField] = None
+        self.devices_input: Optional[MDTextField] = None
+        self.glossary_input: Optional[MDTextField] = None
+        self.two_pass_checkbox: Optional[CheckBox] = None
+        self.preprocess_checkbox: Optional[CheckBox] = None
+        self.diarize_checkbox: Optional[CheckBox] = None
         self.results_text: Optional[TextInput] = None
         self.download_button: Optional[MDButton] = None
         self.new_recording_button: Optional[MDButton] = None
@@ -59,6 +83,7 @@ class RecordNoteKivyApp(MDApp):
 
         # Scheduled events
         self.duration_update_event: Optional[Any] = None
+        self.memory_check_event: Optional[Any] = None
 
     def build(self) -> BoxLayout:
         """Build the main UI layout."""
@@ -84,6 +109,9 @@ class RecordNoteKivyApp(MDApp):
         right_panel = self._create_right_panel()
         main_layout.add_widget(right_panel)
 
+        # Watch memory and surface the resource governor's warnings
+        self.memory_check_event = Clock.schedule_interval(self._check_memory, 2.0)
+
         return main_layout
 
     def _create_left_panel(self) -> MDCard:
@@ -168,7 +196,7 @@ class RecordNoteKivyApp(MDApp):
     def _create_settings_section(self) -> MDBoxLayout:
         """Create settings section."""
         layout = MDBoxLayout(
-            orientation="vertical", spacing=15, size_hint_y=None, height="150dp"
+            orientation="vertical", spacing=15, size_hint_y=None, height="420dp"
         )
 
         # Settings title
@@ -200,6 +228,57 @@ class RecordNoteKivyApp(MDApp):
 
         layout.add_widget(model_layout)
 
+        # Optional transcription server (uses the local model when empty)
+        self.server_url_input = MDTextField(
+            hint_text="文字起こしサーバーURL（オプション）",
+            size_hint_y=None,
+            height="48dp",
+        )
+        layout.add_widget(self.server_url_input)
+
+        # Several input devices are recorded side by side as separate channels
+        self.devices_input = MDTextField(
+            hint_text="入力デバイス（カンマ区切りで複数指定、チャンネル別に認識）",
+            size_hint_y=None,
+            height="48dp",
+        )
+        layout.add_widget(self.devices_input)
+
+        # Glossary: product names etc. given to the decoder as a prompt
+        self.glossary_input = MDTextField(
+            hint_text="用語集（製品名などをカンマ区切りで入力）",
+            size_hint_y=None,
+            height="48dp",
+        )
+        layout.add_widget(self.glossary_input)
+
+        # Two-pass mode: tiny draft first, selected model refines it
+        two_pass_layout = BoxLayout(
+            orientation="horizontal", size_hint_y=None, height="30dp"
+        )
+        self.two_pass_checkbox = CheckBox(size_hint_x=None, width="30dp")
+        two_pass_layout.add_widget(self.two_pass_checkbox)
+        two_pass_layout.add_widget(Label(text="二段階認識（下書き→高精度）"))
+        layout.add_widget(two_pass_layout)
+
+        # Preprocessing: high-pass, noise gate and gain control while recording
+        preprocess_layout = BoxLayout(
+            orientation="horizontal", size_hint_y=None, height="30dp"
+        )
+        self.preprocess_checkbox = CheckBox(size_hint_x=None, width="30dp")
+        preprocess_layout.add_widget(self.preprocess_checkbox)
+        preprocess_layout.add_widget(Label(text="音声前処理（ノイズ除去・音量補正）"))
+        layout.add_widget(preprocess_layout)
+
+        # Speaker diarization: label each segment with who spoke
+        diarize_layout = BoxLayout(
+            orientation="horizontal", size_hint_y=None, height="30dp"
+        )
+        self.diarize_checkbox = CheckBox(size_hint_x=None, width="30dp")
+        diarize_layout.add_widget(self.diarize_checkbox)
+        diarize_layout.add_widget(Label(text="話者分離（話者ラベルを付与）"))
+        layout.add_widget(diarize_layout)
+
         return layout
 
     def _create_right_panel(self) -> MDCard:
@@ -277,6 +356,16 @@ class RecordNoteKivyApp(MDApp):
     def start_recording(self, instance: Any) -> None:
         """Start audio recording."""
         try:
+            self.recorder = AudioRecorder(
+                source=self._get_audio_source(), governor=self.governor
+            )
+            if self.preprocess_checkbox and self.preprocess_checkbox.active:
+                self.recorder.preprocessor = AudioPreprocessor(
+                    self.recorder.sample_rate, self.recorder.channels
+                )
+            else:
+                self.recorder.preprocessor = None
+
             self.recorder.start_recording()
             self.recording_state = "recording"
             self._update_ui_for_recording_state()
@@ -317,47 +406,165 @@ class RecordNoteKivyApp(MDApp):
             Clock.schedule_once(lambda dt: self._update_status("音声を認識中..."), 0)
 
             # Transcribe audio
-            transcription_result = self.transcriber.transcribe_bytes(audio_bytes)
+            transcriber = self._get_transcriber()
+            if isinstance(transcriber, DraftRefineTranscriber):
+                transcription_result = transcriber.transcribe_bytes(
+                    audio_bytes, on_update=self._on_draft_update
+                )
+            elif isinstance(transcriber, SpeechTranscriber):
+                transcription_result = self._transcribe_live(audio_bytes)
+            else:
+                transcription_result = transcriber.transcribe_bytes(audio_bytes)
             self.transcribed_text = transcription_result["text"]
 
+            if self.diarize_checkbox and self.diarize_checkbox.active:
+                Clock.schedule_once(lambda dt: self._update_status("話者を分離中..."), 0)
+                SpeakerDiarizer(self.recorder.sample_rate).annotate(
+                    transcription_result, self.recorder.get_audio_array()
+                )
+
             # Update UI on main thread
             Clock.schedule_once(lambda dt: self._update_status("議事録を整形中..."), 0)
 
-            # Format minutes
-            meeting_title = (
-                self.meeting_title_input.text
-                if self.meeting_title_input and self.meeting_title_input.text.strip()
-                else "会議録"
-            )
+            # Format minutes, collecting the meeting statistics on the way
+            analytics = MeetingAnalytics(transcription_result.get("duration", 0.0))
             formatted_minutes = self.formatter.format_minutes(
-                transcription_result, meeting_title
+                transcription_result, self._get_meeting_title(), analytics
             )
 
             self.formatted_minutes = formatted_minutes
+            self.transcript = transcription_result
+            self.analytics = analytics
             self.recording_state = "completed"
 
             # Update UI on main thread
             Clock.schedule_once(self._update_ui_after_processing, 0)
 
         except Exception as ex:
-            Clock.schedule_once(lambda dt: self._show_error(f"処理エラー: {ex}"), 0)
+            message = f"処理エラー: {ex}"
+            Clock.schedule_once(lambda dt: self._show_error(message), 0)
             self.recording_state = "stopped"
             Clock.schedule_once(lambda dt: self._update_ui_for_recording_state(), 0)
 
+    def _transcribe_live(self, audio_bytes: bytes) -> Transcript:
+        """Transcribe with the local model, showing statistics as it decodes.
+
+        Args:
+            audio_bytes: Audio data as bytes (WAV format)
+
+        Returns:
+            Transcript of the recording
+        """
+        with temporary_wav(audio_bytes) as temp_path:
+            info, segments = self.transcriber.stream_file(temp_path)
+            builder = TranscriptBuilder(info["language"], info["duration"])
+            analytics = MeetingAnalytics(info["duration"])
+            for segment in segments:
+                builder.append_segment(segment)
+                analytics.add_segment(segment)
+                status = f"音声を認識中... {analytics.summary_line()}"
+                Clock.schedule_once(
+                    lambda dt, status=status: self._update_status(status), 0
+                )
+            transcript = builder.build()
+            transcript.metadata["decoding"] = dict(self.transcriber.last_decoding_stats)
+            return transcript
+
+    def _get_input_devices(self) -> List[Union[int, str]]:
+        """Get the input devices entered by the user (indices or names)."""
+        text = self.devices_input.text if self.devices_input else ""
+        names = [name.strip() for name in text.split(",") if name.strip()]
+        return [int(name) if name.isdigit() else name for name in names]
+
+    def _get_audio_source(self) -> AudioSource:
+        """Get the audio source: one microphone, or several side by side."""
+        devices = self._get_input_devices()
+        if len(devices) > 1:
+            return MultiDeviceSource([MicrophoneSource(device=d) for d in devices])
+        return MicrophoneSource(device=devices[0] if devices else None)
+
+    def _get_transcriber(self) -> Any:
+        """Get the transcriber to use.
+
+        Multi-channel recordings are transcribed per channel; otherwise the
+        server is used if configured, else the local model.
+        """
+        glossary = self._get_glossary()
+        if self.recorder.channels > 1:
+            labels = [str(device) for device in self._get_input_devices()]
+            if (
+                self._multichannel_transcriber is None
+                or self._multichannel_transcriber.model_size
+                != self.transcriber.model_size
+                or self._multichannel_transcriber.channel_labels != labels
+                or self._multichannel_transcriber.glossary != glossary
+            ):
+                self._multichannel_transcriber = MultiChannelTranscriber(
+                    self.transcriber.model_size,
+                    labels,
+                    workers=len(labels),
+                    glossary=glossary,
+                    governor=self.governor,
+                )
+            return self._multichannel_transcriber
+
+        server_url = self.server_url_input.text.strip() if self.server_url_input else ""
+        if server_url:
+            return RemoteTranscriber(server_url)
+        if (
+            self.two_pass_checkbox
+            and self.two_pass_checkbox.active
+            and self.transcriber.model_size != "tiny"
+        ):
+            # Reused between recordings so both models stay loaded
+            two_pass = self._two_pass_transcriber
+            if two_pass is None or (
+                two_pass.draft.model_size,
+                two_pass.refiner.model_size,
+            ) != ("tiny", self.transcriber.model_size):
+                two_pass = DraftRefineTranscriber("tiny", self.transcriber.model_size)
+                two_pass.draft.governor = two_pass.refiner.governor = self.governor
+                self._two_pass_transcriber = two_pass
+            two_pass.draft.glossary = two_pass.refiner.glossary = glossary
+            return two_pass
+        self.transcriber.glossary = glossary
+        return self.transcriber
+
+    def _get_glossary(self) -> List[str]:
+        """Get the glossary terms entered by the user."""
+        text = self.glossary_input.text if self.glossary_input else ""
+        return [term.strip() for term in re.split("[,、]", text) if term.strip()]
+
+    def _on_draft_update(self, transcript: Transcript) -> None:
+        """Show draft or partially refined minutes while refinement continues."""
+        analytics = MeetingAnalytics(transcript.get("duration", 0.0))
+        minutes = self.formatter.format_minutes(
+            transcript, self._get_meeting_title(), analytics
+        )
+        status = f"高精度モデルで補正中... {analytics.summary_line()}"
+
+        def show(dt: float) -> None:
+            if self.results_text:
+                self.results_text.text = minutes
+
+        Clock.schedule_once(show, 0)
+        Clock.schedule_once(lambda dt: self._update_status(status), 0)
+
+    def _get_meeting_title(self) -> str:
+        """Get the meeting title entered by the user, or the default title."""
+        if self.meeting_title_input and self.meeting_title_input.text.strip():
+            return str(self.meeting_title_input.text)
+        return "会議録"
+
     def _update_ui_after_processing(self, dt: float) -> None:
         """Update UI after processing is complete."""
         if self.results_text:
             self.results_text.text = self.formatted_minutes
 
-        # Get stats and show completion message
-        try:
-            transcription_result = {"text": self.transcribed_text, "segments": []}
-            stats = self.formatter.get_summary_stats(transcription_result)
-            status_msg = (
-                f"✅ 完了! 文字数: {stats['character_count']}, " f"単語数: {stats['word_count']}"
-            )
-            self._update_status(status_msg)
-        except Exception:
+        # Show the statistics collected while the minutes were formatted
+        if self.analytics is not None and self.analytics.segment_count:
+            self._update_status(f"✅ 完了! {self.analytics.summary_line()}")
+        else:
             self._update_status("✅ 処理完了!")
 
         self._update_ui_for_recording_state()
@@ -368,6 +575,24 @@ class RecordNoteKivyApp(MDApp):
             duration = self.recorder.get_duration()
             self.duration_label.text = f"録音時間: {duration:.1f}秒"
 
+    def _check_memory(self, dt: float) -> None:
+        """Warn about memory pressure and the governor's decisions."""
+        self.governor.check_pressure()
+        for event in self.governor.pop_events():
+            if event["type"] == "model_downgraded":
+                self._update_status(
+                    f"⚠ メモリ不足のため {event['requested']} の代わりに "
+                    f"{event['chosen']} を使用します"
+                )
+            elif event["type"] == "low_memory":
+                self._update_status(
+                    f"⚠ 空きメモリが少なくなっています" f"（残り {event['available_mb']:.0f} MB）"
+                )
+            elif event["type"] == "audio_spilled":
+                self._update_status(
+                    f"💾 録音データをディスクに退避しました" f"（{event['spilled_mb']:.0f} MB）"
+                )
+
     def _update_ui_for_recording_state(self) -> None:
         """Update UI based on current recording state."""
         if self.recording_state == "stopped":
@@ -421,10 +646,10 @@ class RecordNoteKivyApp(MDApp):
     def on_model_change(self, spinner: Any, text: str) -> None:
         """Handle model selection change."""
         if text != self.transcriber.model_size:
-            self.transcriber = SpeechTranscriber(text)
+            self.transcriber = SpeechTranscriber(text, governor=self.governor)
 
     def download_minutes(self, instance: Any) -> None:
-        """Download the formatted minutes as a file."""
+        """Save the minutes, or subtitles/JSON chosen by file extension."""
         if not self.formatted_minutes:
             return
 
@@ -436,14 +661,31 @@ class RecordNoteKivyApp(MDApp):
             # Open file chooser
             path = filechooser.save_file(
                 title="議事録を保存",
-                filters=[("Markdown files", "*.md"), ("All files", "*.*")],
+                filters=[
+                    ("Markdown files", "*.md"),
+                    ("SubRip subtitles", "*.srt"),
+                    ("WebVTT subtitles", "*.vtt"),
+                    ("JSON files", "*.json"),
+                ],
                 path=filename,
             )
 
             if path:
                 # Save the file
                 save_path = Path(path[0]) if isinstance(path, list) else Path(path)
-                self.formatter.export_to_file(self.formatted_minutes, str(save_path))
+                if not save_path.suffix:
+                    save_path = save_path.with_suffix(".md")
+                export_format = format_for_path(save_path)
+                if export_format == "md":
+                    self.formatter.export_to_file(
+                        self.formatted_minutes, str(save_path)
+                    )
+                elif self.transcript is not None:
+                    export_transcript(
+                        self.transcript,
+                        {export_format: save_path},
+                        self._get_meeting_title(),
+                    )
                 self._show_info(f"ファイルを保存しました: {save_path.name}")
 
         except Exception as e:
@@ -454,6 +696,8 @@ class RecordNoteKivyApp(MDApp):
         self.recording_state = "stopped"
         self.transcribed_text = ""
         self.formatted_minutes = ""
+        self.transcript = None
+        self.analytics = None
 
         if self.results_text:
             self.results_text.text = "録音を開始して音声を議事録に変換してください。"
@@ -0,0 +1,330 @@
+"""Multi-channel and multi-device capture with per-channel transcription."""
+
+import heapq
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from math import gcd
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+from .governor import ResourceGovernor
+from .pool import ModelPool
+from .sources import AudioSource, BlockCallback, integer_scale
+from .transcriber import SAMPLE_RATE, SpeechTranscriber
+from .transcript import Transcript, TranscriptBuilder
+
+
+class MultiDeviceSource(AudioSource):
+    """Records several sources at once as one multi-channel stream.
+
+    Each source is streamed in its own thread. Blocks are aligned by sample
+    count from a common start and delivered with the channels of all sources
+    side by side, so AudioRecorder stores them like any other multi-channel
+    recording. Sources that end early are padded with silence. Clock drift
+    between independent devices is not corrected.
+    """
+
+    def __init__(self, sources: Sequence[AudioSource], block_size: int = 1024) -> None:
+        """Initialize the multi-device source.
+
+        Args:
+            sources: Sources to combine; all must share one sample rate
+            block_size: Frames per delivered block
+        """
+        if not sources:
+            raise ValueError("At least one source is required")
+        sample_rates = {source.sample_rate for source in sources}
+        if len(sample_rates) != 1:
+            raise ValueError(f"Sources use different sample rates: {sample_rates}")
+
+        self.sources = list(sources)
+        self.block_size = block_size
+        self.sample_rate = sources[0].sample_rate
+        self.channels = sum(source.channels for source in sources)
+
+    def stream(self, callback: BlockCallback, is_active: Callable[[], bool]) -> None:
+        """Deliver aligned blocks until every source has ended or is stopped."""
+        count = len(self.sources)
+        buffers: List[Deque[np.ndarray]] = [deque() for _ in range(count)]
+        buffered = [0] * count
+        overflowed = [False] * count
+        finished = [False] * count
+        condition = threading.Condition()
+
+        def run(index: int, source: AudioSource) -> None:
+            def on_block(block: np.ndarray, block_overflowed: bool) -> None:
+                with condition:
+                    buffers[index].append(block)
+                    buffered[index] += len(block)
+                    overflowed[index] |= block_overflowed
+                    condition.notify()
+
+            try:
+                source.stream(on_block, is_active)
+            except Exception as e:
+                print(f"Recording error on source {index}: {e}")
+            finally:
+                with condition:
+                    finished[index] = True
+                    condition.notify()
+
+        threads = [
+            threading.Thread(target=run, args=(index, source), daemon=True)
+            for index, source in enumerate(self.sources)
+        ]
+        for thread in threads:
+            thread.start()
+
+        def ready() -> bool:
+            return all(
+                buffered[i] >= self.block_size or finished[i] for i in range(count)
+            )
+
+        try:
+            while True:
+                with condition:
+                    condition.wait_for(ready, timeout=0.1)
+                    if not ready():
+                        if not is_active():
+                            break
+                        continue
+                    frames = min(self.block_size, max(buffered))
+                    if frames == 0:
+                        break
+                    parts = [
+                        self._take(buffers[i], frames, self.sources[i].channels)
+                        for i in range(count)
+                    ]
+                    for i in range(count):
+                        buffered[i] = max(0, buffered[i] - frames)
+                    block_overflowed = any(overflowed)
+                    overflowed[:] = [False] * count
+                callback(np.concatenate(parts, axis=1), block_overflowed)
+        finally:
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def _take(buffer: Deque[np.ndarray], frames: int, channels: int) -> np.ndarray:
+        """Remove frames from a source buffer, padding with silence if short."""
+        output = np.zeros((frames, channels), dtype=np.float32)
+        filled = 0
+        while filled < frames and buffer:
+            block = buffer[0]
+            taken = min(frames - filled, len(block))
+            output[filled : filled + taken] = block[:taken]
+            filled += taken
+            if taken == len(block):
+                buffer.popleft()
+            else:
+                buffer[0] = block[taken:]
+        return output
+
+
+class MultiChannelTranscriber:
+    """Transcribes each channel separately and merges the segments by time.
+
+    Every channel is decoded by its own worker from a ModelPool, so separate
+    room and remote-call channels are transcribed in parallel and are not
+    mixed into one stream. Merged segments carry a "channel" field with the
+    channel's label.
+    """
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        channel_labels: Optional[Sequence[str]] = None,
+        workers: int = 2,
+        transcriber_factory: Optional[Callable[[], SpeechTranscriber]] = None,
+        glossary: Sequence[str] = (),
+        governor: Optional[ResourceGovernor] = None,
+    ) -> None:
+        """Initialize the multi-channel transcriber.
+
+        Args:
+            model_size: Whisper model size used by every worker
+            channel_labels: Labels of the channels in order (default
+                "チャンネル1", "チャンネル2", ...)
+            workers: Number of channels decoded concurrently (one model each)
+            transcriber_factory: Callable creating a worker's transcriber
+                (default: SpeechTranscriber with the CPU cores split evenly
+                between the workers)
+            glossary: Glossary terms prompted by the default workers
+            governor: Resource governor consulted by the default workers
+                before each model is loaded
+        """
+        cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+        self.channel_labels = list(channel_labels or [])
+        self.workers = workers
+        self.glossary = list(glossary)
+        self.pool = ModelPool(
+            transcriber_factory
+            or (
+                lambda: SpeechTranscriber(
+                    model_size,
+                    cpu_threads=cpu_threads,
+                    glossary=glossary,
+                    governor=governor,
+                )
+            ),
+            workers,
+        )
+
+    @property
+    def model_size(self) -> str:
+        """Model size used by the workers."""
+        return self.pool.model_size
+
+    def load_model(self) -> None:
+        """Load every worker's model."""
+        self.pool.load_all()
+
+    def channel_label(self, channel: int) -> str:
+        """Get the label of a channel.
+
+        Args:
+            channel: Zero-based channel index
+
+        Returns:
+            Configured label, or "チャンネルN" when none was given
+        """
+        if channel < len(self.channel_labels):
+            return self.channel_labels[channel]
+        return f"チャンネル{channel + 1}"
+
+    def transcribe_channels(self, audio: np.ndarray, sample_rate: int) -> Transcript:
+        """Transcribe every channel of a recording and merge the results.
+
+        Args:
+            audio: Float samples of shape (frames, channels)
+            sample_rate: Sample rate of the audio
+
+        Returns:
+            Transcript with segments of all channels ordered by start time.
+            Per-channel decode times are stored under metadata["channels"].
+        """
+        if audio.ndim == 1:
+            audio = audio[:, None]
+
+        divisor = gcd(SAMPLE_RATE, sample_rate)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    self._transcribe_channel,
+                    resample_poly(
+                        audio[:, channel],
+                        SAMPLE_RATE // divisor,
+                        sample_rate // divisor,
+                    ).astype(np.float32),
+                )
+                for channel in range(audio.shape[1])
+            ]
+            results = [future.result() for future in futures]
+
+        transcripts = [transcript for transcript, _ in results]
+        merged = self._merge(transcripts, len(audio) / sample_rate)
+        merged.metadata["channels"] = [
+            {
+                "channel": self.channel_label(channel),
+                "segments": transcript.segment_count,
+                "decode_seconds": seconds,
+            }
+            for channel, (transcript, seconds) in enumerate(results)
+        ]
+        return merged
+
+    def transcribe_file(self, audio_file_path: Path) -> Transcript:
+        """Transcribe a multi-channel WAV file channel by channel.
+
+        Args:
+            audio_file_path: Path to the WAV file
+
+        Returns:
+            Merged transcript
+        """
+        if not audio_file_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        return self._transcribe_wav(str(audio_file_path))
+
+    def transcribe_bytes(self, audio_bytes: bytes) -> Transcript:
+        """Transcribe multi-channel WAV bytes channel by channel.
+
+        Args:
+            audio_bytes: Audio data as bytes (WAV format)
+
+        Returns:
+            Merged transcript
+        """
+        return self._transcribe_wav(io.BytesIO(audio_bytes))
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about the worker models.
+
+        Returns:
+            Dictionary with model information
+        """
+        return {
+            "model_size": self.model_size,
+            "workers": self.workers,
+            "channel_labels": self.channel_labels,
+        }
+
+    def _transcribe_wav(self, wav: Any) -> Transcript:
+        """Read a WAV file or buffer and transcribe its channels."""
+        sample_rate, data = wavfile.read(wav)
+        scale = integer_scale(data.dtype)
+        if scale is None:
+            audio = data.astype(np.float32)
+        else:
+            audio = (data.astype(np.float32) - scale[0]) / scale[1]
+        return self.transcribe_channels(audio, int(sample_rate))
+
+    def _transcribe_channel(self, audio: np.ndarray) -> Tuple[Transcript, float]:
+        """Transcribe one channel with a worker from the pool.
+
+        Args:
+            audio: Mono float32 samples at SAMPLE_RATE
+
+        Returns:
+            Transcript and decode wall time in seconds
+        """
+        with self.pool.acquire() as transcriber:
+            start = time.perf_counter()
+            transcript = transcriber.transcribe_audio(audio)
+            return transcript, time.perf_counter() - start
+
+    def _merge(self, transcripts: List[Transcript], duration: float) -> Transcript:
+        """Merge per-channel transcripts into one ordered by start time.
+
+        Args:
+            transcripts: Transcript of each channel, in channel order
+            duration: Recording duration in seconds
+
+        Returns:
+            Merged transcript with a "channel" field
+        """
+        language = next((t.language for t in transcripts if t.segment_count), "ja")
+        builder = TranscriptBuilder(language=language, duration=duration)
+
+        # Each channel's segments are already in time order
+        channel_segments = [
+            zip(
+                transcript.starts.tolist(),
+                repeat(channel),
+                range(transcript.segment_count),
+                transcript["segments"],
+            )
+            for channel, transcript in enumerate(transcripts)
+        ]
+        for _, channel, _, segment in heapq.merge(*channel_segments):
+            builder.append_segment({**segment, "channel": self.channel_label(channel)})
+        return builder.build()
@@ -0,0 +1,69 @@
+"""Pool of loaded speech transcribers shared between worker threads."""
+
+import queue
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from .transcriber import SpeechTranscriber
+
+
+class ModelPool:
+    """Fixed-size pool of transcribers, each holding its own loaded model."""
+
+    def __init__(
+        self, transcriber_factory: Callable[[], SpeechTranscriber], size: int = 1
+    ) -> None:
+        """Initialize the model pool.
+
+        Args:
+            transcriber_factory: Callable creating a new transcriber
+            size: Number of transcribers (and therefore models) in the pool
+        """
+        if size < 1:
+            raise ValueError("Model pool size must be at least 1")
+
+        self.size = size
+        self._transcribers: List[SpeechTranscriber] = [
+            transcriber_factory() for _ in range(size)
+        ]
+        self._available: "queue.Queue[SpeechTranscriber]" = queue.Queue()
+        for transcriber in self._transcribers:
+            self._available.put(transcriber)
+
+    def load_all(self) -> None:
+        """Load every model up front instead of on first use."""
+        for transcriber in self._transcribers:
+            transcriber.load_model()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[SpeechTranscriber]:
+        """Borrow a transcriber from the pool.
+
+        Args:
+            timeout: Seconds to wait for a free transcriber (None waits forever)
+
+        Yields:
+            A transcriber that is exclusively owned until the block exits
+
+        Raises:
+            TimeoutError: If no transcriber became free within the timeout
+        """
+        try:
+            transcriber = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No transcriber available in the model pool")
+
+        try:
+            yield transcriber
+        finally:
+            self._available.put(transcriber)
+
+    @property
+    def available(self) -> int:
+        """Number of transcribers currently free."""
+        return self._available.qsize()
+
+    @property
+    def model_size(self) -> str:
+        """Model size of the pooled transcribers."""
+        return self._transcribers[0].model_size
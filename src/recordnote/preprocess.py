@@ -0,0 +1,310 @@
+"""Block-wise audio preprocessing applied between recorder and transcriber.
+
+Every stage keeps a fixed amount of state and processes one block at a time,
+so the cost per block is constant no matter how long the recording gets.
+Blocks are float32 arrays of shape (frames, channels).
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+
+class HighPassFilter:
+    """Butterworth high-pass filter that also removes DC offset."""
+
+    def __init__(
+        self, sample_rate: int, channels: int = 1, cutoff: float = 80.0, order: int = 2
+    ) -> None:
+        """Initialize the filter.
+
+        Args:
+            sample_rate: Sample rate of the audio
+            channels: Number of channels
+            cutoff: Cutoff frequency in Hz
+            order: Filter order
+        """
+        self._sos = butter(
+            order, cutoff, btype="highpass", fs=sample_rate, output="sos"
+        )
+        # Filter state carried between blocks: (sections, 2, channels)
+        self._zi = np.zeros((self._sos.shape[0], 2, channels))
+        self._primed = False
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter one block.
+
+        Args:
+            block: Samples of shape (frames, channels)
+
+        Returns:
+            Filtered samples
+        """
+        if not self._primed:
+            # Start from the steady state of the first sample to avoid a click
+            self._zi = sosfilt_zi(self._sos)[:, :, None] * block[0]
+            self._primed = True
+        filtered, self._zi = sosfilt(self._sos, block, axis=0, zi=self._zi)
+        output: np.ndarray = filtered.astype(np.float32, copy=False)
+        return output
+
+
+class AutomaticGainControl:
+    """Smoothly normalises loudness towards a target RMS level."""
+
+    def __init__(
+        self,
+        target_rms: float = 0.1,
+        max_gain: float = 20.0,
+        attack: float = 0.5,
+        release: float = 0.05,
+        silence_rms: float = 1e-4,
+    ) -> None:
+        """Initialize the gain control.
+
+        Args:
+            target_rms: RMS level speech is normalised to
+            max_gain: Largest gain applied to quiet input
+            attack: Smoothing factor per block when the gain has to drop
+            release: Smoothing factor per block when the gain may rise
+            silence_rms: Blocks quieter than this leave the gain unchanged
+        """
+        self.target_rms = target_rms
+        self.max_gain = max_gain
+        self.attack = attack
+        self.release = release
+        self.silence_rms = silence_rms
+        self.gain = 1.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Apply gain to one block in place.
+
+        Args:
+            block: Samples of shape (frames, channels)
+
+        Returns:
+            The same array, scaled and clipped to [-1, 1]
+        """
+        rms = float(np.sqrt(np.mean(np.square(block)))) if block.size else 0.0
+        previous_gain = self.gain
+        if rms > self.silence_rms:
+            desired = min(self.target_rms / rms, self.max_gain)
+            rate = self.attack if desired < self.gain else self.release
+            self.gain += rate * (desired - self.gain)
+
+        # Ramp between the old and new gain to avoid zipper noise
+        ramp = np.linspace(previous_gain, self.gain, len(block), dtype=np.float32)
+        np.multiply(block, ramp[:, None], out=block)
+        np.clip(block, -1.0, 1.0, out=block)
+        return block
+
+
+class SpectralNoiseGate:
+    """Attenuates frequency bins that do not rise above the noise floor.
+
+    Uses a short-time Fourier transform with 50% overlapping square-root Hann
+    windows, which reconstructs the input exactly when nothing is gated.
+    Output is aligned with the input but held back by up to frame_size
+    samples, so blocks may come out shorter than they went in; flush()
+    returns the held-back tail at the end of a recording.
+    """
+
+    def __init__(
+        self,
+        channels: int = 1,
+        frame_size: int = 512,
+        threshold: float = 3.0,
+        attenuation: float = 0.1,
+        noise_adaptation: float = 0.95,
+    ) -> None:
+        """Initialize the noise gate.
+
+        Args:
+            channels: Number of channels
+            frame_size: FFT frame length in samples (even)
+            threshold: Bins need this multiple of the noise power to pass
+            attenuation: Gain applied to gated bins
+            noise_adaptation: Smoothing factor of the noise floor estimate
+        """
+        self.frame_size = frame_size
+        self.hop = frame_size // 2
+        self.threshold = threshold
+        self.attenuation = attenuation
+        self.noise_adaptation = noise_adaptation
+
+        self.channels = channels
+        self._window = np.sqrt(np.hanning(frame_size + 1)[:-1]).astype(np.float32)
+        self._noise: Optional[np.ndarray] = None
+        self._start_stream()
+
+    def _start_stream(self) -> None:
+        """Reset the buffers for a new recording."""
+        # Primed with one hop of silence so the first frame is complete; its
+        # output is skipped so the output stays aligned with the input
+        self._input = np.zeros((self.hop, self.channels), dtype=np.float32)
+        self._overlap = np.zeros((self.hop, self.channels), dtype=np.float32)
+        self._skip = self.hop
+        self._received = 0
+        self._emitted = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Gate one block.
+
+        Args:
+            block: Samples of shape (frames, channels)
+
+        Returns:
+            Gated samples, as many as could be completed (at most frame_size
+            samples fewer than have been passed in so far)
+        """
+        self._received += len(block)
+        # Only the unprocessed remainder (< hop) is carried over, so this
+        # concatenation is bounded by the block size
+        pending = np.concatenate((self._input, block), axis=0)
+        hops = (len(pending) - self.hop) // self.hop
+
+        produced = []
+        if hops > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(
+                pending[: (hops + 1) * self.hop], self.frame_size, axis=0
+            )[:: self.hop]
+            # frames: (hops, channels, frame_size)
+            spectrum = np.fft.rfft(frames * self._window, axis=-1)
+            spectrum *= self._gains(np.abs(spectrum) ** 2)
+            gated = np.fft.irfft(spectrum, n=self.frame_size, axis=-1)
+            gated = (gated * self._window).astype(np.float32)
+
+            # Overlap-add: each hop is the second half of the previous frame
+            # plus the first half of the current one
+            first_halves = np.moveaxis(gated[:, :, : self.hop], 2, 1)
+            second_halves = np.moveaxis(gated[:, :, self.hop :], 2, 1)
+            hop_output = first_halves.copy()
+            hop_output[0] += self._overlap
+            hop_output[1:] += second_halves[:-1]
+            self._overlap = second_halves[-1].copy()
+            produced.append(hop_output.reshape(-1, block.shape[1]))
+
+        self._input = pending[hops * self.hop :].copy()
+
+        if not produced:
+            return np.zeros((0, block.shape[1]), dtype=np.float32)
+        output = produced[0]
+        if self._skip:
+            skipped = min(self._skip, len(output))
+            output = output[skipped:]
+            self._skip -= skipped
+        self._emitted += len(output)
+        return output
+
+    def flush(self) -> np.ndarray:
+        """Return the samples still held back and start a new recording.
+
+        Returns:
+            Gated samples of the end of the input, so that all output blocks
+            together are as long as the input
+        """
+        held = self._received - self._emitted
+        tail = self.process(np.zeros((self.frame_size, self.channels), np.float32))
+        self._start_stream()
+        return tail[:held]
+
+    def _gains(self, power: np.ndarray) -> np.ndarray:
+        """Compute per-bin gains and update the noise floor estimate.
+
+        Args:
+            power: Power spectra of shape (hops, channels, bins)
+
+        Returns:
+            Gains of the same shape
+        """
+        if self._noise is None:
+            # Recordings usually start before anyone speaks
+            self._noise = power.mean(axis=0)
+
+        # Frames close to the current floor are treated as noise-only and
+        # used to track slow changes in the background
+        frame_power = power.sum(axis=-1)
+        noise_power = self._noise.sum(axis=-1)
+        noise_frames = frame_power < self.threshold * noise_power
+        counts = noise_frames.sum(axis=0)
+        has_noise = counts > 0
+        if has_noise.any():
+            observed = (power * noise_frames[..., None]).sum(axis=0)
+            observed_mean = observed[has_noise] / counts[has_noise, None]
+            self._noise[has_noise] = (
+                self.noise_adaptation * self._noise[has_noise]
+                + (1 - self.noise_adaptation) * observed_mean
+            )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gains = 1.0 - self.threshold * self._noise / power
+        clipped: np.ndarray = np.clip(
+            np.nan_to_num(gains, nan=0.0), self.attenuation, 1.0
+        )
+        return clipped
+
+
+class AudioPreprocessor:
+    """Chain of switchable preprocessing stages.
+
+    Stages run in the order high-pass, noise gate, gain control, so that the
+    gain control does not amplify noise that the gate would remove.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        highpass: bool = True,
+        noise_gate: bool = True,
+        agc: bool = True,
+        highpass_cutoff: float = 80.0,
+    ) -> None:
+        """Initialize the preprocessor.
+
+        Args:
+            sample_rate: Sample rate of the audio
+            channels: Number of channels
+            highpass: Enable the high-pass / DC removal stage
+            noise_gate: Enable the spectral noise gate
+            agc: Enable automatic gain control
+            highpass_cutoff: High-pass cutoff frequency in Hz
+        """
+        self.channels = channels
+        self.stages: List[Any] = []
+        if highpass:
+            self.stages.append(HighPassFilter(sample_rate, channels, highpass_cutoff))
+        if noise_gate:
+            self.stages.append(SpectralNoiseGate(channels))
+        if agc:
+            self.stages.append(AutomaticGainControl())
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Run one block through every enabled stage.
+
+        Args:
+            block: Float32 samples of shape (frames, channels)
+
+        Returns:
+            Processed samples; the noise gate may hold some back until
+            flush()
+        """
+        for stage in self.stages:
+            block = stage.process(block)
+        return block
+
+    def flush(self) -> np.ndarray:
+        """Return the samples held back by the stages at the end of a recording.
+
+        Returns:
+            Processed samples still owed for the blocks passed in so far
+        """
+        block = np.zeros((0, self.channels), dtype=np.float32)
+        for stage in self.stages:
+            if len(block):
+                block = stage.process(block)
+            flush = getattr(stage, "flush", None)
+            if flush is not None:
+                block = np.concatenate((block, flush()), axis=0)
+        return block
@@ -1,31 +1,67 @@
-"""Audio recording module using sounddevice."""
+"""Audio recording module using pluggable audio sources."""
 
 import io
+import tempfile
 import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Dict, Optional
 
 import numpy as np
-import sounddevice as sd
 from scipy.io import wavfile
 
+from .governor import ResourceGovernor
+from .preprocess import AudioPreprocessor
+from .sources import AudioSource, MicrophoneSource
+
+# Seconds between two memory checks of the spill thread
+SPILL_CHECK_SECONDS = 1.0
+
 
 class AudioRecorder:
     """Audio recorder class for recording voice to WAV files."""
 
-    def __init__(self, sample_rate: int = 44100, channels: int = 1) -> None:
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        channels: int = 1,
+        source: Optional[AudioSource] = None,
+        preprocessor: Optional[AudioPreprocessor] = None,
+        governor: Optional[ResourceGovernor] = None,
+    ) -> None:
         """Initialize the audio recorder.
 
         Args:
             sample_rate: Sample rate for recording (default: 44100 Hz)
             channels: Number of audio channels (default: 1 for mono)
+            source: Audio source to record from (default: the microphone).
+                When given, its sample rate and channel count are used.
+            preprocessor: Optional preprocessing applied to each block as it
+                arrives
+            governor: Resource governor deciding when recorded audio is
+                spilled from memory to a temporary file. Memory is checked
+                and spills are written on a separate thread, never in the
+                audio callback.
         """
-        self.sample_rate = sample_rate
-        self.channels = channels
+        self.source = source or MicrophoneSource(sample_rate, channels)
+        self.sample_rate = self.source.sample_rate
+        self.channels = self.source.channels
+        self.preprocessor = preprocessor
+        self.governor = governor
         self.recording = False
         self.audio_data: list[np.ndarray] = []
+        self._spill_file: Optional[IO[bytes]] = None
+        self._spilled_frames = 0
+        self._spilling_frames = 0
+        self._buffered_bytes = 0
+        self._buffer_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._spill_thread: Optional[threading.Thread] = None
+        self._spill_stop = threading.Event()
         self._recording_thread: Optional[threading.Thread] = None
+        self._stats_start: Optional[float] = None
+        self._stats_end: Optional[float] = None
+        self._reset_stats()
 
     def start_recording(self) -> None:
         """Start audio recording."""
@@ -34,17 +70,47 @@ class AudioRecorder:
 
         self.recording = True
         self.audio_data = []
+        self._discard_spill()
+        self._reset_stats()
         self._recording_thread = threading.Thread(target=self._record_audio)
         self._recording_thread.start()
+        if self.governor is not None:
+            self._spill_stop.clear()
+            self._spill_thread = threading.Thread(
+                target=self._watch_memory, daemon=True
+            )
+            self._spill_thread.start()
 
     def stop_recording(self) -> None:
-        """Stop audio recording."""
-        if not self.recording:
+        """Stop audio recording.
+
+        Finite sources (file replay, synthetic audio) stop on their own; this
+        can still be called afterwards to wait for the recording thread.
+        """
+        if not self.recording and self._recording_thread is None:
             raise RuntimeError("No recording in progress")
 
         self.recording = False
         if self._recording_thread:
             self._recording_thread.join()
+            self._recording_thread = None
+        self._stop_spill_thread()
+
+    def wait_until_finished(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a finite source to deliver all of its audio.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if the source has finished
+        """
+        if self._recording_thread:
+            self._recording_thread.join(timeout)
+            if self._recording_thread.is_alive():
+                return False
+        self._stop_spill_thread()
+        return True
 
     def save_to_file(self, file_path: Path) -> None:
         """Save recorded audio to WAV file.
@@ -52,11 +118,10 @@ class AudioRecorder:
         Args:
             file_path: Path to save the WAV file
         """
-        if not self.audio_data:
+        if not self.audio_data and not self._spilled_frames:
             raise RuntimeError("No audio data to save")
 
-        # Concatenate all audio chunks
-        audio_array = np.concatenate(self.audio_data, axis=0)
+        audio_array = self.get_audio_array()
 
         # Ensure the directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -70,11 +135,7 @@ class AudioRecorder:
         Returns:
             Audio data as bytes in WAV format
         """
-        if not self.audio_data:
-            raise RuntimeError("No audio data available")
-
-        # Concatenate all audio chunks
-        audio_array = np.concatenate(self.audio_data, axis=0)
+        audio_array = self.get_audio_array()
 
         # Create WAV bytes using io.BytesIO
         wav_buffer = io.BytesIO()
@@ -82,31 +143,156 @@ class AudioRecorder:
         wav_buffer.seek(0)
         return wav_buffer.read()
 
-    def _record_audio(self) -> None:
-        """Internal method to record audio in a separate thread."""
+    def get_audio_array(self) -> np.ndarray:
+        """Get the whole recording as one array.
 
-        def audio_callback(
-            indata: np.ndarray, frames: int, time_info: dict, status: sd.CallbackFlags
-        ) -> None:
-            """Callback function for audio recording."""
-            if status:
-                print(f"Audio callback status: {status}")
-            if self.recording:
-                self.audio_data.append(indata.copy())
+        When audio has been spilled, the rest is spilled too and the array
+        is memory-mapped from the temporary file, so the recording is not
+        loaded back into memory. Call this after recording has stopped.
 
+        Returns:
+            Samples of shape (frames, channels)
+        """
+        self._stop_spill_thread()
+        if self._spill_file is None:
+            if not self.audio_data:
+                raise RuntimeError("No audio data available")
+            return np.concatenate(self.audio_data, axis=0)
+
+        self._spill()
+        self._spill_file.flush()
+        audio: np.ndarray = np.memmap(
+            self._spill_file,
+            dtype=np.float32,
+            mode="r",
+            shape=(self._spilled_frames, self.channels),
+        )
+        return audio
+
+    def _record_audio(self) -> None:
+        """Internal method to record audio in a separate thread."""
+        self._stats_start = time.perf_counter()
         try:
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                callback=audio_callback,
-                dtype=np.float32,
-            ):
-                while self.recording:
-                    time.sleep(0.1)
+            self.source.stream(self._on_block, self.is_recording)
         except Exception as e:
             print(f"Recording error: {e}")
+        finally:
+            if self.preprocessor is not None:
+                # The noise gate holds back the last samples until flushed
+                tail = self.preprocessor.flush()
+                with self._buffer_lock:
+                    self.audio_data.append(tail)
+                    self._buffered_bytes += tail.nbytes
+                self._frames += len(tail)
+            self._stats_end = time.perf_counter()
             self.recording = False
 
+    def _on_block(self, block: np.ndarray, overflowed: bool) -> None:
+        """Store a block delivered by the audio source.
+
+        This runs in the audio callback, so it only appends to the in-memory
+        buffer; memory checks and spill writes happen on the spill thread.
+        """
+        if self.preprocessor is not None:
+            block = self.preprocessor.process(block)
+        with self._buffer_lock:
+            self.audio_data.append(block)
+            self._buffered_bytes += block.nbytes
+        self._blocks += 1
+        self._frames += len(block)
+        if overflowed:
+            self._overflows += 1
+            self._dropped_frames += len(block)
+
+    def _watch_memory(self) -> None:
+        """Spill thread: ask the governor periodically whether to spill."""
+        assert self.governor is not None
+        while not self._spill_stop.wait(SPILL_CHECK_SECONDS):
+            if self.governor.should_spill(self._buffered_bytes):
+                self._spill()
+
+    def _stop_spill_thread(self) -> None:
+        """Stop the spill thread once recording has ended."""
+        if self._spill_thread is not None:
+            self._spill_stop.set()
+            self._spill_thread.join()
+            self._spill_thread = None
+
+    def _spill(self) -> None:
+        """Move the audio held in memory to the temporary spill file."""
+        with self._spill_lock:
+            # Take the buffer under the lock and write it without holding it,
+            # so the audio callback is never kept waiting on disk I/O
+            with self._buffer_lock:
+                blocks = self.audio_data
+                self.audio_data = []
+                self._buffered_bytes = 0
+                self._spilling_frames = sum(len(block) for block in blocks)
+            if not blocks:
+                return
+
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="recordnote-")
+            self._spill_file.seek(0, io.SEEK_END)
+            spilled_bytes = 0
+            for block in blocks:
+                data = np.ascontiguousarray(block, dtype=np.float32)
+                self._spill_file.write(data.tobytes())
+                spilled_bytes += data.nbytes
+
+            with self._buffer_lock:
+                self._spilled_frames += self._spilling_frames
+                self._spilling_frames = 0
+            if self.governor is not None:
+                self.governor.record_spill(
+                    spilled_bytes / (1024 * 1024),
+                    self._spilled_frames * self.channels * 4 / (1024 * 1024),
+                )
+
+    def _discard_spill(self) -> None:
+        """Delete the spill file of a previous recording."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._spilled_frames = 0
+        self._spilling_frames = 0
+        self._buffered_bytes = 0
+
+    def _reset_stats(self) -> None:
+        """Reset the delivery statistics."""
+        self._blocks = 0
+        self._frames = 0
+        self._overflows = 0
+        self._dropped_frames = 0
+        self._stats_start = None
+        self._stats_end = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery statistics of the current or last recording.
+
+        Dropped frames are the frames of blocks the source flagged as
+        overflowed: for a microphone, frames lost by the device; for replayed
+        or synthetic audio, blocks delivered later than a device could buffer.
+
+        Returns:
+            Dictionary with block/frame counts, dropped frames and throughput
+        """
+        if self._stats_start is None:
+            wall_seconds = 0.0
+        else:
+            wall_seconds = (self._stats_end or time.perf_counter()) - self._stats_start
+        audio_seconds = self._frames / self.sample_rate
+
+        return {
+            "blocks": self._blocks,
+            "frames": self._frames,
+            "overflows": self._overflows,
+            "dropped_frames": self._dropped_frames,
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall_seconds,
+            "speed": audio_seconds / wall_seconds if wall_seconds else 0.0,
+        }
+
     def is_recording(self) -> bool:
         """Check if recording is currently active.
 
@@ -121,8 +307,10 @@ class AudioRecorder:
         Returns:
             Duration in seconds
         """
-        if not self.audio_data:
-            return 0.0
-
-        total_frames = sum(len(chunk) for chunk in self.audio_data)
+        with self._buffer_lock:
+            total_frames = (
+                self._spilled_frames
+                + self._spilling_frames
+                + sum(len(chunk) for chunk in self.audio_data)
+            )
         return total_frames / self.sample_rate
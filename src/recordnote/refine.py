@@ -0,0 +1,282 @@
+"""Two-pass transcription: a fast draft refined by a larger model."""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .tempaudio import temporary_wav
+from .transcriber import SAMPLE_RATE, SpeechTranscriber
+from .transcript import Transcript, TranscriptBuilder
+
+# Audio added around each window when it is re-transcribed, in seconds
+WINDOW_PADDING = 0.2
+
+# Seconds between draft updates passed to on_update while decoding
+DRAFT_UPDATE_SECONDS = 1.0
+
+# Longest window handed to the refine model, in seconds (Whisper's input length)
+MAX_WINDOW_SECONDS = 30.0
+
+
+class DraftRefineTranscriber:
+    """Transcriber that shows a draft quickly and then refines it.
+
+    A small model produces draft segments first. Low-confidence segments are
+    merged into windows of up to MAX_WINDOW_SECONDS, and a larger model
+    re-transcribes each window on a worker thread while the draft is still
+    being decoded. The on_update callback is invoked with the partial draft
+    as it grows, whenever a refined window replaces its draft text, and with
+    the finished transcript, so the caller can redraw the minutes.
+    """
+
+    def __init__(
+        self,
+        draft_model_size: str = "tiny",
+        refine_model_size: str = "medium",
+        logprob_threshold: float = -0.5,
+        no_speech_threshold: float = 0.5,
+        refine_all: bool = False,
+    ) -> None:
+        """Initialize the draft/refine transcriber.
+
+        Args:
+            draft_model_size: Whisper model size used for the draft pass
+            refine_model_size: Whisper model size used for the refine pass
+            logprob_threshold: Segments with avg_logprob below this are
+                considered low confidence
+            no_speech_threshold: Segments with no_speech_prob above this are
+                considered low confidence
+            refine_all: Refine every segment instead of only the low
+                confidence ones
+        """
+        self.draft = SpeechTranscriber(draft_model_size)
+        self.refiner = SpeechTranscriber(refine_model_size)
+        self.logprob_threshold = logprob_threshold
+        self.no_speech_threshold = no_speech_threshold
+        self.refine_all = refine_all
+
+    @property
+    def model_size(self) -> str:
+        """Model size of the final (refine) pass."""
+        return self.refiner.model_size
+
+    def load_model(self) -> None:
+        """Load both models."""
+        self.draft.load_model()
+        self.refiner.load_model()
+
+    def transcribe_file(
+        self,
+        audio_file_path: Path,
+        on_update: Optional[Callable[[Transcript], None]] = None,
+    ) -> Transcript:
+        """Transcribe an audio file in two passes.
+
+        Args:
+            audio_file_path: Path to the audio file
+            on_update: Called with the partial draft as segments are decoded
+                (at most every DRAFT_UPDATE_SECONDS, and whenever a refined
+                window is merged), and with the finished transcript
+
+        Returns:
+            Refined transcript. Timing figures and whether the text has been
+            refined yet are stored under metadata["refine"].
+        """
+        start_time = time.perf_counter()
+        audio = self.draft.load_audio(audio_file_path)
+        info, segments = self.draft.stream_audio(audio)
+        builder = TranscriptBuilder(info["language"], info["duration"])
+        draft_segments: List[Dict[str, Any]] = []
+        refined_texts: Dict[int, str] = {}
+        pending: Dict["Future[List[str]]", List[int]] = {}
+        stats: Dict[str, Any] = {
+            "draft_model": self.draft.model_size,
+            "refine_model": self.refiner.model_size,
+            "first_text_latency": None,
+            "windows": 0,
+            "refined_segments": 0,
+        }
+        last_update = start_time
+
+        def snapshot(refined: bool) -> Transcript:
+            transcript = builder.build()
+            if refined_texts:
+                transcript.update_segments(
+                    {index: {"text": text} for index, text in refined_texts.items()}
+                )
+            transcript.metadata["decoding"] = dict(self.draft.last_decoding_stats)
+            transcript.metadata["refine"] = {
+                **stats,
+                "refined": refined,
+                "changed_segments": len(refined_texts),
+            }
+            return transcript
+
+        def notify(force: bool) -> None:
+            nonlocal last_update
+            now = time.perf_counter()
+            if on_update and (force or now - last_update >= DRAFT_UPDATE_SECONDS):
+                last_update = now
+                on_update(snapshot(refined=False))
+
+        def apply(future: "Future[List[str]]") -> None:
+            indices = pending.pop(future)
+            for index, text in zip(indices, future.result()):
+                if text and text != draft_segments[index]["text"]:
+                    refined_texts[index] = text
+
+        def collect() -> Iterator[Dict[str, Any]]:
+            for segment in segments:
+                builder.append_segment(segment)
+                draft_segments.append(segment)
+                if stats["first_text_latency"] is None:
+                    stats["first_text_latency"] = time.perf_counter() - start_time
+                    notify(force=True)
+                    yield segment
+                    continue
+                finished = [future for future in pending if future.done()]
+                for future in finished:
+                    apply(future)
+                notify(force=bool(finished))
+                yield segment
+
+        # Windows are refined on a worker thread as soon as the draft has
+        # decoded past them, so both passes run at the same time
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for indices in self.refine_windows(collect()):
+                window = [draft_segments[index] for index in indices]
+                previous_text = (
+                    draft_segments[indices[0] - 1]["text"] if indices[0] > 0 else None
+                )
+                future = executor.submit(
+                    self._refine_window, audio, window, previous_text
+                )
+                pending[future] = indices
+                stats["windows"] += 1
+                stats["refined_segments"] += len(indices)
+
+            if stats["first_text_latency"] is None:
+                stats["first_text_latency"] = time.perf_counter() - start_time
+            notify(force=True)
+
+            for future in as_completed(list(pending)):
+                apply(future)
+                if pending:
+                    notify(force=True)
+
+        stats["total_seconds"] = time.perf_counter() - start_time
+        transcript = snapshot(refined=True)
+        if on_update:
+            on_update(transcript)
+        return transcript
+
+    def transcribe_bytes(
+        self,
+        audio_bytes: bytes,
+        on_update: Optional[Callable[[Transcript], None]] = None,
+    ) -> Transcript:
+        """Transcribe WAV bytes in two passes.
+
+        Args:
+            audio_bytes: Audio data as bytes (WAV format)
+            on_update: See transcribe_file()
+
+        Returns:
+            Refined transcript
+        """
+        with temporary_wav(audio_bytes) as temp_path:
+            return self.transcribe_file(temp_path, on_update)
+
+    def refine_windows(self, segments: Iterable[Dict[str, Any]]) -> Iterator[List[int]]:
+        """Group the segments to refine into windows for the refine model.
+
+        Consecutive segments picked for refinement share a window as long as
+        it stays within MAX_WINDOW_SECONDS. Windows are yielded as soon as
+        they are closed, so segments may still be being decoded.
+
+        Args:
+            segments: Draft segment dicts in time order
+
+        Returns:
+            Iterator over the segment indices of each window
+        """
+        window: List[int] = []
+        window_start = 0.0
+        limit = MAX_WINDOW_SECONDS - 2 * WINDOW_PADDING
+        for index, segment in enumerate(segments):
+            if window and (
+                not self._should_refine(segment)
+                or segment["end"] - window_start > limit
+            ):
+                yield window
+                window = []
+            if self._should_refine(segment):
+                if not window:
+                    window_start = segment["start"]
+                window.append(index)
+        if window:
+            yield window
+
+    def _should_refine(self, segment: Dict[str, Any]) -> bool:
+        """Check whether a draft segment is refined."""
+        return (
+            self.refine_all
+            or segment.get("avg_logprob", 0.0) < self.logprob_threshold
+            or segment.get("no_speech_prob", 0.0) > self.no_speech_threshold
+        )
+
+    def _refine_window(
+        self,
+        audio: np.ndarray,
+        segments: List[Dict[str, Any]],
+        previous_text: Optional[str],
+    ) -> List[str]:
+        """Re-transcribe a window of draft segments with the refine model.
+
+        Args:
+            audio: Full recording samples at SAMPLE_RATE
+            segments: Draft segments of the window
+            previous_text: Text of the draft segment before the window, if any
+
+        Returns:
+            Refined text of each draft segment (empty where the refine model
+            heard nothing)
+        """
+        start = max(0.0, segments[0]["start"] - WINDOW_PADDING)
+        end = segments[-1]["end"] + WINDOW_PADDING
+        window = audio[int(start * SAMPLE_RATE) : int(end * SAMPLE_RATE)]
+        if len(window) == 0:
+            return [""] * len(segments)
+
+        # Windows are not contiguous, so the context carried over from the
+        # previous window must not leak into this one
+        self.refiner.reset_context()
+        refined = self.refiner.transcribe_audio(
+            window, offset=start, previous_text=previous_text
+        )
+
+        # Each refined segment goes to the draft segment it overlaps most
+        texts: List[List[str]] = [[] for _ in segments]
+        for refined_start, refined_end, text in refined.iter_rows():
+            overlaps = [
+                min(refined_end, segment["end"]) - max(refined_start, segment["start"])
+                for segment in segments
+            ]
+            texts[int(np.argmax(overlaps))].append(text)
+        return ["".join(parts) for parts in texts]
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about the loaded models.
+
+        Returns:
+            Dictionary with model information
+        """
+        return {
+            "model_size": self.refiner.model_size,
+            "draft_model_size": self.draft.model_size,
+            "loaded": bool(self.draft.get_model_info()["loaded"])
+            and bool(self.refiner.get_model_info()["loaded"]),
+        }
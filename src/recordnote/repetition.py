@@ -0,0 +1,129 @@
+"""Online detection of repetition loops in decoded segments."""
+
+import re
+import zlib
+from typing import Optional
+
+
+def compression_ratio(text: str) -> float:
+    """Compute the zlib compression ratio of a text, as Whisper does.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Length of the UTF-8 bytes divided by their compressed length
+    """
+    data = text.encode("utf-8")
+    if not data:
+        return 0.0
+    return len(data) / len(zlib.compress(data))
+
+
+def _normalize(text: str) -> str:
+    """Remove whitespace and punctuation so near-identical segments match."""
+    return re.sub(r"[\s、。，．,.!?！？「」]", "", text)
+
+
+class RepetitionDetector:
+    """Spots hallucination loops one segment at a time.
+
+    Three signals are checked, each in constant time per segment:
+
+    - the same text repeated in consecutive segments
+    - a segment made mostly of repeated character n-grams
+    - a high compression ratio of the segment's text, as Whisper checks
+    """
+
+    def __init__(
+        self,
+        compression_ratio_threshold: float = 2.4,
+        max_repeats: int = 2,
+        min_repeat_chars: int = 4,
+        ngram_size: int = 3,
+        ngram_repeat_share: float = 0.6,
+        min_ngrams: int = 12,
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            compression_ratio_threshold: Segment text compressing better
+                than this is treated as a loop
+            max_repeats: Times a text may repeat back to back before another
+                consecutive occurrence is treated as a loop (the same phrase
+                recurring between other segments is ordinary speech)
+            min_repeat_chars: Shorter texts (e.g. "はい") may repeat freely
+            ngram_size: Length of the character n-grams checked in a segment
+            ngram_repeat_share: Share of repeated n-grams that marks a loop
+                within one segment
+            min_ngrams: Segments with fewer n-grams skip the n-gram check
+        """
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.max_repeats = max_repeats
+        self.min_repeat_chars = min_repeat_chars
+        self.ngram_size = ngram_size
+        self.ngram_repeat_share = ngram_repeat_share
+        self.min_ngrams = min_ngrams
+        self._last = ""
+        self._run_length = 0
+
+    @property
+    def pending_repeats(self) -> int:
+        """Consecutive occurrences of the last text, if it could become a loop.
+
+        Returns:
+            Length of the current run of identical segments, or 0 when the
+            last text is too short to count as a loop
+        """
+        if len(self._last) < self.min_repeat_chars:
+            return 0
+        return self._run_length
+
+    def reset(self) -> None:
+        """Forget the previous segments."""
+        self._last = ""
+        self._run_length = 0
+
+    def check(self, text: str) -> Optional[str]:
+        """Check the next segment and remember it.
+
+        Args:
+            text: Segment text
+
+        Returns:
+            Reason the segment looks like part of a loop ("repeated_segment",
+            "ngram_repetition" or "compression_ratio"), or None
+        """
+        normalized = _normalize(text)
+        reason = self._find_loop(normalized)
+        if normalized and normalized == self._last:
+            self._run_length += 1
+        else:
+            self._run_length = 1
+        self._last = normalized
+        return reason
+
+    def _find_loop(self, normalized: str) -> Optional[str]:
+        """Run the checks on a normalized segment text."""
+        if not normalized:
+            return None
+
+        if (
+            len(normalized) >= self.min_repeat_chars
+            and normalized == self._last
+            and self._run_length >= self.max_repeats
+        ):
+            return "repeated_segment"
+
+        ngram_count = len(normalized) - self.ngram_size + 1
+        if ngram_count >= self.min_ngrams:
+            unique = len(
+                {normalized[i : i + self.ngram_size] for i in range(ngram_count)}
+            )
+            if 1 - unique / ngram_count > self.ngram_repeat_share:
+                return "ngram_repetition"
+
+        if compression_ratio(normalized) > self.compression_ratio_threshold:
+            return "compression_ratio"
+
+        return None
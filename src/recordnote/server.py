@@ -0,0 +1,270 @@
+"""Local transcription service sharing a pool of loaded Whisper models."""
+
+import json
+import tempfile
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .client import UPLOAD_CHUNK_SIZE
+from .pool import ModelPool
+from .transcriber import SpeechTranscriber
+
+
+class TranscriptionServer(ThreadingHTTPServer):
+    """HTTP server that transcribes uploaded audio with a shared model pool.
+
+    Endpoints:
+        GET /health: Model and queue information as JSON
+        POST /transcribe: Audio file body (Content-Length or chunked upload);
+            the response streams newline-delimited JSON: one "info" line,
+            one "segment" line per decoded segment and a final "done" line.
+
+    At most ``workers + queue_size`` requests are admitted at a time. Further
+    requests are answered with 503 and Retry-After before their body is read,
+    and the connection is closed, so clients back off instead of piling up
+    work on the server. Clients sending "Expect: 100-continue" are admitted
+    or rejected before they upload anything.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple,
+        transcriber_factory: Callable[[], SpeechTranscriber],
+        workers: int = 1,
+        queue_size: int = 4,
+    ) -> None:
+        """Initialize the transcription server.
+
+        Args:
+            address: (host, port) to listen on
+            transcriber_factory: Callable creating a transcriber for the pool
+            workers: Number of models loaded and decoding concurrently
+            queue_size: Number of admitted requests allowed to wait for a model
+        """
+        self.pool = ModelPool(transcriber_factory, workers)
+        self.capacity = workers + queue_size
+        self._admission = threading.BoundedSemaphore(self.capacity)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        super().__init__(address, _TranscriptionRequestHandler)
+
+    def try_admit(self) -> bool:
+        """Admit a request if the queue has room.
+
+        Returns:
+            True if admitted (release() must be called afterwards)
+        """
+        if not self._admission.acquire(blocking=False):
+            return False
+        with self._pending_lock:
+            self._pending += 1
+        return True
+
+    def release(self) -> None:
+        """Release a slot taken by try_admit()."""
+        with self._pending_lock:
+            self._pending -= 1
+        self._admission.release()
+
+    def health(self) -> Dict[str, Any]:
+        """Get model and queue information.
+
+        Returns:
+            Dictionary with model size, worker count and queue occupancy
+        """
+        with self._pending_lock:
+            pending = self._pending
+        return {
+            "model_size": self.pool.model_size,
+            "workers": self.pool.size,
+            "available_workers": self.pool.available,
+            "pending": pending,
+            "capacity": self.capacity,
+        }
+
+
+class _TranscriptionRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for TranscriptionServer."""
+
+    protocol_version = "HTTP/1.1"
+    server: TranscriptionServer
+    _admitted = False
+
+    def do_GET(self) -> None:
+        """Handle GET requests."""
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        self._send_json(HTTPStatus.OK, self.server.health())
+
+    def do_POST(self) -> None:
+        """Handle POST requests."""
+        if self.path != "/transcribe":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+
+        admitted = self._admitted or self.server.try_admit()
+        self._admitted = False
+        if not admitted:
+            self._reject_busy()
+            return
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                audio_path = Path(temp_dir) / "upload.wav"
+                with open(audio_path, "wb") as f:
+                    self._receive_upload(f)
+                with self.server.pool.acquire() as transcriber:
+                    self._stream_transcription(transcriber, audio_path)
+        finally:
+            self.server.release()
+
+    def handle_expect_100(self) -> bool:
+        """Admit a request before the client uploads its body.
+
+        Returns:
+            True to let the client send the body, False if it was rejected
+        """
+        if self.command == "POST" and self.path == "/transcribe":
+            if not self.server.try_admit():
+                self._reject_busy()
+                return False
+            self._admitted = True
+        try:
+            return super().handle_expect_100()
+        except OSError:
+            # The client went away before do_POST could release the slot
+            if self._admitted:
+                self._admitted = False
+                self.server.release()
+            raise
+
+    def _reject_busy(self) -> None:
+        """Answer 503 without reading the body and close the connection."""
+        self._send_json(
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            {"error": "server busy"},
+            headers={"Retry-After": "1", "Connection": "close"},
+        )
+        self.close_connection = True
+
+    def _receive_upload(self, f: Any) -> None:
+        """Stream the request body into a file without buffering it in memory.
+
+        Args:
+            f: Binary file object receiving the body
+        """
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                self._copy_body(f, size)
+                self.rfile.readline()
+        else:
+            self._copy_body(f, int(self.headers.get("Content-Length", 0)))
+
+    def _copy_body(self, f: Any, size: int) -> None:
+        """Copy a number of body bytes from the request into a file."""
+        remaining = size
+        while remaining > 0:
+            data = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remaining))
+            if not data:
+                raise ConnectionError("Upload ended early")
+            f.write(data)
+            remaining -= len(data)
+
+    def _stream_transcription(
+        self, transcriber: SpeechTranscriber, audio_path: Path
+    ) -> None:
+        """Transcribe a file and stream segments back as they are decoded.
+
+        Args:
+            transcriber: Transcriber borrowed from the pool
+            audio_path: Uploaded audio file
+        """
+        try:
+            info, segments = transcriber.stream_file(audio_path)
+        except Exception as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        self._write_chunk({"type": "info", **info})
+        try:
+            for segment in segments:
+                self._write_chunk({"type": "segment", **segment})
+            self._write_chunk({"type": "done"})
+        except Exception as e:
+            self._write_chunk({"type": "error", "error": str(e)})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, message: Dict[str, Any]) -> None:
+        """Write one NDJSON line as an HTTP chunk."""
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(
+        self,
+        status: HTTPStatus,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Send a complete JSON response."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests to stdout like the rest of the application."""
+        print(f"[server] {self.address_string()} {format % args}")
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    model_size: str = "base",
+    workers: int = 1,
+    queue_size: int = 4,
+) -> None:
+    """Run the transcription server until interrupted.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        model_size: Whisper model size loaded by every worker
+        workers: Number of models loaded and decoding concurrently
+        queue_size: Number of requests allowed to wait for a free model
+    """
+    server = TranscriptionServer(
+        (host, port),
+        lambda: SpeechTranscriber(model_size),
+        workers=workers,
+        queue_size=queue_size,
+    )
+    server.pool.load_all()
+    print(f"RecordNote transcription server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
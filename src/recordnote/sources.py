@@ -0,0 +1,263 @@
+"""Audio sources feeding the recorder: microphone, file replay and synthetic."""
+
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from scipy.io import wavfile
+
+# Called with each block of float32 samples (frames x channels) and whether
+# frames were lost before this block
+BlockCallback = Callable[[np.ndarray, bool], None]
+
+
+class AudioSource(ABC):
+    """Source of audio blocks for AudioRecorder."""
+
+    sample_rate: int
+    channels: int
+
+    @abstractmethod
+    def stream(self, callback: BlockCallback, is_active: Callable[[], bool]) -> None:
+        """Deliver audio blocks until the source ends or is_active() is False.
+
+        Args:
+            callback: Called with each block and an overflow flag
+            is_active: Returns False when the consumer wants to stop
+        """
+
+
+class MicrophoneSource(AudioSource):
+    """Live capture from an input device via sounddevice."""
+
+    def __init__(
+        self,
+        sample_rate: int = 44100,
+        channels: int = 1,
+        device: Optional[Union[int, str]] = None,
+    ) -> None:
+        """Initialize the microphone source.
+
+        Args:
+            sample_rate: Sample rate for recording
+            channels: Number of input channels
+            device: sounddevice device index or name (None for the default)
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.device = device
+
+    def stream(self, callback: BlockCallback, is_active: Callable[[], bool]) -> None:
+        """Capture from the device until is_active() is False."""
+        # Imported here so file and synthetic sources work on machines
+        # without PortAudio (e.g. headless CI)
+        import sounddevice as sd
+
+        def audio_callback(
+            indata: np.ndarray, frames: int, time_info: dict, status: sd.CallbackFlags
+        ) -> None:
+            """Callback function for audio recording."""
+            if status:
+                print(f"Audio callback status: {status}")
+            if is_active():
+                callback(indata.copy(), bool(status.input_overflow))
+
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            device=self.device,
+            callback=audio_callback,
+            dtype=np.float32,
+        ):
+            while is_active():
+                time.sleep(0.1)
+
+
+# Audio a live input device can buffer before it overflows, in seconds
+DEVICE_BUFFER_SECONDS = 0.25
+
+
+class _Pacer:
+    """Throttles block delivery to a multiple of real time."""
+
+    def __init__(self, sample_rate: int, speed: Optional[float]) -> None:
+        """Initialize the pacer.
+
+        Args:
+            sample_rate: Sample rate of the delivered audio
+            speed: Playback speed (1.0 is real time, None is unthrottled)
+        """
+        self.sample_rate = sample_rate
+        self.speed = speed
+        self._max_lag = DEVICE_BUFFER_SECONDS / speed if speed else 0.0
+        self._start = time.perf_counter()
+        self._frames = 0
+
+    def wait(self, frames: int) -> bool:
+        """Wait until a block of the given size is due.
+
+        Args:
+            frames: Frames in the block about to be delivered
+
+        Returns:
+            True if delivery is later than a live device could have buffered,
+            i.e. the device would have overflowed
+        """
+        if not self.speed:
+            return False
+
+        due = self._start + self._frames / (self.sample_rate * self.speed)
+        self._frames += frames
+        lag = time.perf_counter() - due
+        if lag < 0:
+            time.sleep(-lag)
+            return False
+        return lag > self._max_lag
+
+
+class FileSource(AudioSource):
+    """Replays an audio file in blocks, in real time or faster.
+
+    WAV files are read with SciPy; FLAC files need the optional soundfile
+    package.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        speed: Optional[float] = 1.0,
+        block_size: int = 1024,
+    ) -> None:
+        """Initialize the file source.
+
+        Args:
+            file_path: Path to a WAV or FLAC file
+            speed: Playback speed (1.0 is real time, None is unthrottled)
+            block_size: Frames per delivered block
+        """
+        if not file_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+        self.file_path = file_path
+        self.speed = speed
+        self.block_size = block_size
+        self.sample_rate, self.channels = self._read_format()
+
+    def _read_format(self) -> Tuple[int, int]:
+        """Read sample rate and channel count from the file header."""
+        if self.file_path.suffix.lower() == ".flac":
+            import soundfile
+
+            info = soundfile.info(str(self.file_path))
+            return int(info.samplerate), int(info.channels)
+
+        sample_rate, data = wavfile.read(str(self.file_path), mmap=True)
+        return int(sample_rate), 1 if data.ndim == 1 else int(data.shape[1])
+
+    def _iter_blocks(self) -> Iterator[np.ndarray]:
+        """Yield float32 blocks of shape (frames, channels)."""
+        if self.file_path.suffix.lower() == ".flac":
+            import soundfile
+
+            for block in soundfile.blocks(
+                str(self.file_path),
+                blocksize=self.block_size,
+                dtype="float32",
+                always_2d=True,
+            ):
+                yield block
+            return
+
+        # Memory-mapped so long recordings are not loaded up front
+        _, data = wavfile.read(str(self.file_path), mmap=True)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        scale = integer_scale(data.dtype)
+        for offset in range(0, len(data), self.block_size):
+            block = np.asarray(data[offset : offset + self.block_size])
+            if scale is None:
+                yield block.astype(np.float32)
+            else:
+                yield (block.astype(np.float32) - scale[0]) / scale[1]
+
+    def stream(self, callback: BlockCallback, is_active: Callable[[], bool]) -> None:
+        """Deliver the file's blocks until the end or until stopped."""
+        pacer = _Pacer(self.sample_rate, self.speed)
+        for block in self._iter_blocks():
+            if not is_active():
+                return
+            callback(block, pacer.wait(len(block)))
+
+
+class SyntheticSource(AudioSource):
+    """Generates speech-like test audio: tone bursts separated by pauses."""
+
+    def __init__(
+        self,
+        duration: float,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        speed: Optional[float] = None,
+        block_size: int = 1024,
+        frequency: float = 220.0,
+        noise_level: float = 0.01,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the synthetic source.
+
+        Args:
+            duration: Length of the generated audio in seconds
+            sample_rate: Sample rate of the generated audio
+            channels: Number of channels (each gets a different pitch)
+            speed: Playback speed (1.0 is real time, None is unthrottled)
+            block_size: Frames per delivered block
+            frequency: Base tone frequency in Hz
+            noise_level: Standard deviation of the background noise
+            seed: Random seed for reproducible noise
+        """
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.speed = speed
+        self.block_size = block_size
+        self.frequency = frequency
+        self.noise_level = noise_level
+        self.seed = seed
+
+    def stream(self, callback: BlockCallback, is_active: Callable[[], bool]) -> None:
+        """Generate and deliver blocks until the duration is reached."""
+        rng = np.random.default_rng(self.seed)
+        pacer = _Pacer(self.sample_rate, self.speed)
+        total_frames = int(self.duration * self.sample_rate)
+        frequencies = self.frequency * (1.0 + 0.25 * np.arange(self.channels))
+
+        for offset in range(0, total_frames, self.block_size):
+            if not is_active():
+                return
+            frames = min(self.block_size, total_frames - offset)
+            t = (offset + np.arange(frames)) / self.sample_rate
+            # Two seconds of "speech" followed by one second of pause
+            voiced = (t % 3.0) < 2.0
+            tone = 0.3 * np.sin(2 * np.pi * np.outer(t, frequencies))
+            block = tone * voiced[:, None]
+            block += rng.normal(0.0, self.noise_level, size=block.shape)
+            callback(block.astype(np.float32), pacer.wait(frames))
+
+
+def integer_scale(dtype: np.dtype) -> Optional[Tuple[float, float]]:
+    """Get the offset and scale that map integer PCM samples to [-1, 1].
+
+    Args:
+        dtype: Sample type of the PCM data
+
+    Returns:
+        (offset, scale) such that (sample - offset) / scale is in [-1, 1],
+        or None for floating-point samples, which need no conversion
+    """
+    if dtype == np.uint8:
+        return (128.0, 128.0)
+    if np.issubdtype(dtype, np.integer):
+        return (0.0, float(np.iinfo(dtype).max) + 1.0)
+    return None
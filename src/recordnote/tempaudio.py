@@ -0,0 +1,27 @@
+"""Temporary audio files for decoders that read from a path."""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+@contextmanager
+def temporary_wav(audio_bytes: bytes) -> Iterator[Path]:
+    """Write WAV bytes to a temporary file for the duration of the block.
+
+    Args:
+        audio_bytes: Audio data as bytes (WAV format)
+
+    Returns:
+        Context manager yielding the path of the file, which is deleted when
+        the block exits
+    """
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+        temp_file.write(audio_bytes)
+        temp_path = Path(temp_file.name)
+
+    try:
+        yield temp_path
+    finally:
+        temp_path.unlink(missing_ok=True)
@@ -1,97 +1,672 @@
 """Speech-to-text transcription module using Faster Whisper."""
 
-import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+
+from .governor import ResourceGovernor
+from .repetition import RepetitionDetector
+from .tempaudio import temporary_wav
+from .transcript import Transcript, TranscriptBuilder
+
+# Sample rate expected by Whisper models
+SAMPLE_RATE = 16000
+
+# Whisper uses at most this many prompt tokens (half its text context)
+MAX_PROMPT_TOKENS = 223
+
+# Tokenized prompts kept before the cache is cleared
+PROMPT_CACHE_SIZE = 256
+
+# Temperatures tried when a repetition loop is re-decoded
+REPETITION_TEMPERATURES = (0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Repetition loops handled per call before the rest of the audio is dropped
+MAX_REPETITION_EVENTS = 20
 
 
 class SpeechTranscriber:
     """Speech transcriber using Faster Whisper for Japanese audio."""
 
-    def __init__(self, model_size: str = "base") -> None:
+    def __init__(
+        self,
+        model_size: str = "base",
+        batch_size: int = 1,
+        word_timestamps: bool = False,
+        decoding: str = "beam",
+        beam_size: int = 5,
+        logprob_threshold: float = -1.0,
+        compression_ratio_threshold: float = 2.4,
+        fallback_temperatures: Tuple[float, ...] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        cpu_threads: int = 0,
+        glossary: Sequence[str] = (),
+        context_tokens: int = 64,
+        repetition: str = "redecode",
+        compute_type: str = "int8",
+        governor: Optional[ResourceGovernor] = None,
+    ) -> None:
         """Initialize the speech transcriber.
 
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
+            batch_size: Number of audio chunks decoded together in one batch.
+                Values above 1 use the batched inference pipeline.
+            word_timestamps: Whether to extract word-level timestamps
+            decoding: "beam" decodes every window with beam search; "adaptive"
+                decodes greedily and re-decodes only low-confidence windows
+                with beam search and temperature fallback
+            beam_size: Beam size used for beam search
+            logprob_threshold: Adaptive mode re-decodes segments whose average
+                log probability is below this value
+            compression_ratio_threshold: Adaptive mode re-decodes segments whose
+                text compression ratio is above this value
+            fallback_temperatures: Temperatures tried in turn when a beam
+                search result fails the thresholds
+            cpu_threads: CPU threads used by the model (0 uses the
+                CTranslate2 default)
+            glossary: Terms (e.g. product names) given to the decoder as an
+                initial prompt for every call
+            context_tokens: Number of tokens from the end of the previous
+                call carried into the next one (0 disables carry-over)
+            repetition: What to do when decoding falls into a repetition loop:
+                "skip" drops the looping segment and resumes decoding after
+                it, "redecode" also re-decodes its window with voice activity
+                filtering, higher temperatures and no conditioning on
+                previous text, and "off" disables the detection
+            compute_type: CTranslate2 compute type of the model weights
+            governor: Resource governor consulted before the model is loaded;
+                it may downgrade the model size and compute type to fit the
+                available memory
         """
+        if decoding not in ("beam", "adaptive"):
+            raise ValueError(f"Unknown decoding strategy: {decoding}")
+        if repetition not in ("off", "skip", "redecode"):
+            raise ValueError(f"Unknown repetition handling: {repetition}")
+
         self.model_size = model_size
+        self.batch_size = batch_size
+        self.word_timestamps = word_timestamps
+        self.decoding = decoding
+        self.beam_size = beam_size
+        self.logprob_threshold = logprob_threshold
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.fallback_temperatures = fallback_temperatures
+        self.cpu_threads = cpu_threads
+        self.glossary = list(glossary)
+        self.context_tokens = context_tokens
+        self.repetition = repetition
+        self.compute_type = compute_type
+        self.governor = governor
+        # model_size and compute_type keep what was requested; the governor
+        # may load something smaller, which is recorded here
+        self.loaded_model_size: Optional[str] = None
+        self.loaded_compute_type: Optional[str] = None
+        self._context: List[int] = []
+        self._prompt_cache: Dict[str, List[int]] = {}
+        self.last_decoding_stats: Dict[str, Any] = {}
         self._model: Optional[WhisperModel] = None
+        self._batched_pipeline: Optional[BatchedInferencePipeline] = None
 
     def load_model(self) -> None:
         """Load the Whisper model. Called automatically when needed."""
         if self._model is None:
-            print(f"Loading Faster Whisper model: {self.model_size}")
+            model_size, compute_type = self.model_size, self.compute_type
+            if self.governor is not None:
+                model_size, compute_type = self.governor.choose_model(
+                    model_size, compute_type
+                )
+            print(f"Loading Faster Whisper model: {model_size}")
             self._model = WhisperModel(
-                self.model_size, device="cpu", compute_type="int8"
+                model_size,
+                device="cpu",
+                compute_type=compute_type,
+                cpu_threads=self.cpu_threads,
             )
+            self.loaded_model_size = model_size
+            self.loaded_compute_type = compute_type
 
-    def transcribe_file(self, audio_file_path: Path) -> Dict[str, Any]:
+        if self.batch_size > 1 and self._batched_pipeline is None:
+            self._batched_pipeline = BatchedInferencePipeline(model=self._model)
+
+    def transcribe_file(self, audio_file_path: Path) -> Transcript:
         """Transcribe audio file to text.
 
         Args:
             audio_file_path: Path to the audio file
 
         Returns:
-            Dictionary containing transcribed text and language info
+            Transcript containing transcribed text, segments and language info
+        """
+        segments, info = self._decode(audio_file_path)
+        return self._collect_segments(segments, info)
+
+    def transcribe_audio(
+        self,
+        audio: np.ndarray,
+        offset: float = 0.0,
+        previous_text: Optional[str] = None,
+    ) -> Transcript:
+        """Transcribe an in-memory audio window.
+
+        Windows of one recording passed in time order (live chunks, retries)
+        are decoded with the tail of the previous window as context. A window
+        at offset 0 starts a new recording and gets no carried context.
+
+        Args:
+            audio: Mono float32 samples at SAMPLE_RATE
+            offset: Start time of the window in seconds, added to timestamps
+            previous_text: Text preceding the window, used as context instead
+                of the carried-over tail (e.g. when windows are out of order)
+
+        Returns:
+            Transcript with timestamps relative to the start of the recording
+        """
+        segments, info = self._decode(audio, offset, previous_text)
+        return self._collect_segments(segments, info)
+
+    def load_audio(self, audio_file_path: Path) -> np.ndarray:
+        """Decode an audio file into samples suitable for transcribe_audio().
+
+        Args:
+            audio_file_path: Path to the audio file
+
+        Returns:
+            Mono float32 samples at SAMPLE_RATE
         """
         if not audio_file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        audio: np.ndarray = decode_audio(
+            str(audio_file_path), sampling_rate=SAMPLE_RATE
+        )
+        return audio
+
+    def stream_file(
+        self, audio_file_path: Path
+    ) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Transcribe audio file, yielding segments as they are decoded.
+
+        Args:
+            audio_file_path: Path to the audio file
+
+        Returns:
+            Tuple of (language/duration info, lazy iterator of segment dicts)
+        """
+        segments, info = self._decode(audio_file_path)
+        return {"language": info.language, "duration": info.duration}, segments
+
+    def stream_audio(
+        self, audio: np.ndarray, offset: float = 0.0
+    ) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Transcribe an in-memory audio window, yielding segments as decoded.
+
+        Args:
+            audio: Mono float32 samples at SAMPLE_RATE
+            offset: Start time of the window in seconds, added to timestamps
+
+        Returns:
+            Tuple of (language/duration info, lazy iterator of segment dicts)
+        """
+        segments, info = self._decode(audio, offset)
+        return {"language": info.language, "duration": info.duration}, segments
+
+    def reset_context(self) -> None:
+        """Forget the context carried over from previous calls."""
+        self._context = []
+
+    def _decode(
+        self,
+        audio: Union[Path, np.ndarray],
+        offset: float = 0.0,
+        previous_text: Optional[str] = None,
+    ) -> Tuple[Iterator[Dict[str, Any]], Any]:
+        """Start decoding an audio file or in-memory samples.
+
+        Args:
+            audio: Path to the audio file, or mono samples at SAMPLE_RATE
+            offset: Seconds added to every timestamp
+            previous_text: Context text overriding the carried-over tail
+
+        Returns:
+            Tuple of (lazy iterator of segment dicts, Faster Whisper info)
+        """
+        if isinstance(audio, Path):
+            if not audio.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio}")
+            source: Union[str, np.ndarray] = str(audio)
+        else:
+            source = audio
 
         self.load_model()
         assert self._model is not None
 
+        if offset == 0.0:
+            self.reset_context()
+        prompt = self._build_prompt(previous_text)
+
+        self.last_decoding_stats = {
+            "strategy": self.decoding,
+            "segments": 0,
+            "redecoded_windows": 0,
+            "redecoded_segments": 0,
+            "fallback_segments": 0,
+            "prompt_tokens": len(prompt or []),
+            "repetition_events": [],
+        }
+
+        segments, info = self._start_decode(source, offset, initial_prompt=prompt)
+        if self.repetition != "off":
+            segments = self._guard_repetition(source, segments, offset)
+        return segments, info
+
+    def _start_decode(
+        self, source: Union[str, np.ndarray], offset: float, **options: Any
+    ) -> Tuple[Iterator[Dict[str, Any]], Any]:
+        """Decode an audio source with the configured strategy.
+
+        Args:
+            source: Audio file path or mono samples at SAMPLE_RATE
+            offset: Seconds added to every timestamp
+            **options: Extra decoding options passed to Faster Whisper
+
+        Returns:
+            Tuple of (lazy iterator of segment dicts, Faster Whisper info)
+        """
+        if self.decoding == "adaptive":
+            # Low-confidence windows are cut out of the samples and re-decoded
+            samples = self._as_samples(source)
+            segments, info = self._run_model(
+                samples, beam_size=1, temperature=0.0, **options
+            )
+            return self._adaptive_segments(samples, segments, offset), info
+
+        segments, info = self._run_model(
+            source,
+            beam_size=self.beam_size,
+            temperature=self.fallback_temperatures,
+            **options,
+        )
+        return self._convert_segments(segments, offset), info
+
+    def _as_samples(self, source: Union[str, np.ndarray]) -> np.ndarray:
+        """Get the samples of an audio source, decoding files if needed."""
+        if isinstance(source, np.ndarray):
+            return source
+        samples: np.ndarray = decode_audio(source, sampling_rate=SAMPLE_RATE)
+        return samples
+
+    def _guard_repetition(
+        self,
+        source: Union[str, np.ndarray],
+        segments: Iterator[Dict[str, Any]],
+        offset: float,
+    ) -> Iterator[Dict[str, Any]]:
+        """Pass segments through until decoding falls into a repetition loop.
+
+        Segments that repeat the previous one are held back until the run
+        ends, so that when it turns out to be a loop every copy can be
+        dropped. When a loop is detected the looping decode is abandoned, its
+        segments are dropped (or replaced by a re-decode of their window) and
+        decoding resumes after them without conditioning on the looping text.
+        Every loop is recorded in last_decoding_stats["repetition_events"].
+
+        Args:
+            source: Audio file path or samples the segments were decoded from
+            segments: Segment dicts in time order
+            offset: Seconds added to every timestamp
+
+        Yields:
+            Segment dictionaries in time order
+        """
+        detector = RepetitionDetector(self.compression_ratio_threshold)
+        events: List[Dict[str, Any]] = self.last_decoding_stats["repetition_events"]
+        samples: Optional[np.ndarray] = None
+        resume = offset
+
+        while True:
+            loop: Optional[Dict[str, Any]] = None
+            reason: Optional[str] = None
+            held: List[Dict[str, Any]] = []
+            for segment in segments:
+                reason = detector.check(segment["text"])
+                if reason is not None:
+                    loop = segment
+                    break
+                # Hold a run of identical segments until it ends or loops
+                if detector.pending_repeats <= 1:
+                    yield from held
+                    held = []
+                if detector.pending_repeats:
+                    held.append(segment)
+                else:
+                    yield segment
+            if loop is None or reason is None:
+                yield from held
+                return
+
+            if reason == "repeated_segment":
+                looped = held + [loop]
+            else:
+                yield from held
+                looped = [loop]
+            loop = {**loop, "start": looped[0]["start"]}
+
+            # Stop the looping decode instead of consuming the rest of it
+            close = getattr(segments, "close", None)
+            if close is not None:
+                close()
+            self.reset_context()
+            if samples is None:
+                samples = self._as_samples(source)
+
+            event = {
+                "start": loop["start"],
+                "end": loop["end"],
+                "reason": reason,
+                "text": loop["text"],
+                "dropped_segments": len(looped),
+                "action": "skipped",
+            }
+            if self.repetition == "redecode":
+                # Decoded with different settings, so not checked against the
+                # looping history
+                replacement = self._redecode_repetition(samples, loop, offset)
+                if replacement:
+                    event["action"] = "redecoded"
+                    yield from replacement
+            events.append(event)
+            detector.reset()
+
+            # Skip ahead, by at least a second if the loop did not advance
+            resume = loop["end"] if loop["end"] > resume else resume + 1.0
+            start_sample = int((resume - offset) * SAMPLE_RATE)
+            if start_sample >= len(samples) or len(events) >= MAX_REPETITION_EVENTS:
+                return
+            options: Dict[str, Any] = {"initial_prompt": self._build_prompt()}
+            if self._batched_pipeline is None:
+                options["condition_on_previous_text"] = False
+            segments, _ = self._start_decode(samples[start_sample:], resume, **options)
+
+    def _redecode_repetition(
+        self, samples: np.ndarray, loop: Dict[str, Any], offset: float
+    ) -> List[Dict[str, Any]]:
+        """Re-decode the window of a looping segment with different settings.
+
+        Args:
+            samples: Samples the segment was decoded from
+            loop: The looping segment
+            offset: Seconds added to timestamps of the samples
+
+        Returns:
+            Re-decoded segment dicts (empty if only non-speech was found)
+        """
+        assert self._model is not None
+
+        start = max(0.0, loop["start"] - offset)
+        window = samples[
+            int(start * SAMPLE_RATE) : int((loop["end"] - offset) * SAMPLE_RATE)
+        ]
+        if len(window) == 0:
+            return []
+        redecoded, _ = self._model.transcribe(
+            window,
+            language="ja",
+            beam_size=self.beam_size,
+            temperature=REPETITION_TEMPERATURES,
+            condition_on_previous_text=False,
+            vad_filter=True,
+            initial_prompt=self._build_prompt(),
+            word_timestamps=self.word_timestamps,
+        )
+        return [self._segment_to_dict(segment, offset + start) for segment in redecoded]
+
+    def _build_prompt(self, previous_text: Optional[str] = None) -> Optional[List[int]]:
+        """Build the initial prompt tokens: carried context, then the glossary.
+
+        The glossary comes last because Whisper truncates long prompts from
+        the front.
+
+        Args:
+            previous_text: Context text overriding the carried-over tail
+
+        Returns:
+            Prompt token ids, or None if there is nothing to prompt with
+        """
+        context = self._encode_prompt(previous_text) if previous_text else self._context
+        context = context[-self.context_tokens :] if self.context_tokens else []
+        glossary = self._encode_prompt("、".join(self.glossary)) if self.glossary else []
+        prompt = context + glossary[: MAX_PROMPT_TOKENS - len(context)]
+        return prompt or None
+
+    def _encode_prompt(self, text: str) -> List[int]:
+        """Tokenize prompt text, reusing earlier results for the same text."""
+        tokens = self._prompt_cache.get(text)
+        if tokens is None:
+            assert self._model is not None
+            if len(self._prompt_cache) >= PROMPT_CACHE_SIZE:
+                self._prompt_cache.clear()
+            encoded: List[int] = self._model.hf_tokenizer.encode(
+                " " + text.strip(), add_special_tokens=False
+            ).ids
+            tokens = self._prompt_cache[text] = encoded
+        return tokens
+
+    def _run_model(
+        self, source: Union[str, np.ndarray], **options: Any
+    ) -> Tuple[Iterable[Any], Any]:
+        """Run the (batched or sequential) model on an audio source.
+
+        Args:
+            source: Audio file path or samples
+            **options: Decoding options passed to Faster Whisper
+
+        Returns:
+            Tuple of (lazy segment iterator, transcription info) from Faster Whisper
+        """
+        assert self._model is not None
+
         # Transcribe with Japanese language specified
-        segments, info = self._model.transcribe(
-            str(audio_file_path), language="ja", beam_size=5
+        if self._batched_pipeline is not None:
+            # The batched pipeline tokenizes the prompt itself and only
+            # accepts text, unlike WhisperModel.transcribe
+            prompt = options.get("initial_prompt")
+            if prompt is not None and not isinstance(prompt, str):
+                options["initial_prompt"] = self._model.hf_tokenizer.decode(prompt)
+            segments, info = self._batched_pipeline.transcribe(
+                source,
+                language="ja",
+                batch_size=self.batch_size,
+                word_timestamps=self.word_timestamps,
+                **options,
+            )
+        else:
+            segments, info = self._model.transcribe(
+                source,
+                language="ja",
+                word_timestamps=self.word_timestamps,
+                **options,
+            )
+
+        return segments, info
+
+    def _convert_segments(
+        self, segments: Iterable[Any], offset: float
+    ) -> Iterator[Dict[str, Any]]:
+        """Convert Faster Whisper segments to dicts as they are decoded."""
+        for segment in segments:
+            self.last_decoding_stats["segments"] += 1
+            yield self._segment_to_dict(segment, offset)
+
+    def _adaptive_segments(
+        self, samples: np.ndarray, segments: Iterable[Any], offset: float
+    ) -> Iterator[Dict[str, Any]]:
+        """Pass confident greedy segments through and re-decode the rest.
+
+        Consecutive low-confidence segments are merged into one window so the
+        re-decode sees them in context.
+
+        Args:
+            samples: Samples the greedy segments were decoded from
+            segments: Greedy segments from Faster Whisper
+            offset: Seconds added to every timestamp
+
+        Yields:
+            Segment dictionaries in time order
+        """
+        pending: List[Any] = []
+        for segment in segments:
+            self.last_decoding_stats["segments"] += 1
+            if self._needs_redecode(segment):
+                pending.append(segment)
+                continue
+            if pending:
+                yield from self._redecode_window(samples, pending, offset)
+                pending = []
+            yield self._segment_to_dict(segment, offset)
+
+        if pending:
+            yield from self._redecode_window(samples, pending, offset)
+
+    def _needs_redecode(self, segment: Any) -> bool:
+        """Check whether a greedy segment falls below the confidence thresholds."""
+        return bool(
+            segment.avg_logprob < self.logprob_threshold
+            or segment.compression_ratio > self.compression_ratio_threshold
+        )
+
+    def _redecode_window(
+        self, samples: np.ndarray, segments: List[Any], offset: float
+    ) -> List[Dict[str, Any]]:
+        """Re-decode the window covered by some greedy segments with beam search.
+
+        Args:
+            samples: Samples the greedy segments were decoded from
+            segments: Consecutive low-confidence greedy segments
+            offset: Seconds added to every timestamp
+
+        Returns:
+            Re-decoded segment dicts, or the greedy ones if nothing was decoded
+        """
+        assert self._model is not None
+
+        start = segments[0].start
+        window = samples[int(start * SAMPLE_RATE) : int(segments[-1].end * SAMPLE_RATE)]
+        redecoded, _ = self._model.transcribe(
+            window,
+            language="ja",
+            beam_size=self.beam_size,
+            temperature=self.fallback_temperatures,
+            initial_prompt=self._build_prompt(),
+            log_prob_threshold=self.logprob_threshold,
+            compression_ratio_threshold=self.compression_ratio_threshold,
+            word_timestamps=self.word_timestamps,
         )
+        results = [
+            self._segment_to_dict(segment, offset + start) for segment in redecoded
+        ]
+
+        self.last_decoding_stats["redecoded_windows"] += 1
+        if not results:
+            return [self._segment_to_dict(segment, offset) for segment in segments]
+        self.last_decoding_stats["redecoded_segments"] += len(segments)
+        return results
+
+    def transcribe_files(self, audio_file_paths: Iterable[Path]) -> List[Transcript]:
+        """Transcribe several audio files with the same loaded model.
+
+        Args:
+            audio_file_paths: Paths to the audio files
+
+        Returns:
+            List of transcription results in the same order as the input
+        """
+        return [self.transcribe_file(path) for path in audio_file_paths]
 
-        segments_list: List[Dict[str, Any]] = []
-        full_text = ""
+    def _collect_segments(
+        self, segments: Iterable[Dict[str, Any]], info: Any
+    ) -> Transcript:
+        """Consume decoded segments into a transcript.
+
+        Args:
+            segments: Segment dicts produced by _decode()
+            info: Transcription info returned by Faster Whisper
+
+        Returns:
+            Transcript containing transcribed text, segments and language info
+        """
+        builder = TranscriptBuilder(language=info.language, duration=info.duration)
 
         for segment in segments:
-            segment_dict = {
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip(),
-            }
-            segments_list.append(segment_dict)
-            full_text += segment.text.strip() + " "
+            builder.append_segment(segment)
 
-        return {
-            "text": full_text.strip(),
-            "language": info.language,
-            "segments": segments_list,
+        transcript = builder.build()
+        transcript.metadata["decoding"] = dict(self.last_decoding_stats)
+        return transcript
+
+    def _segment_to_dict(self, segment: Any, offset: float = 0.0) -> Dict[str, Any]:
+        """Convert a Faster Whisper segment into a plain dictionary.
+
+        Called once for every segment that ends up in the output, so it also
+        records the segment's tokens as context for the next call.
+
+        Args:
+            segment: Segment returned by Faster Whisper
+            offset: Seconds added to every timestamp
+
+        Returns:
+            Segment dictionary with timing, text and confidence values
+        """
+        segment_dict: Dict[str, Any] = {
+            "start": segment.start + offset,
+            "end": segment.end + offset,
+            "text": segment.text.strip(),
+            "avg_logprob": segment.avg_logprob,
+            "no_speech_prob": segment.no_speech_prob,
+            "compression_ratio": segment.compression_ratio,
         }
 
-    def transcribe_bytes(self, audio_bytes: bytes) -> Dict[str, Any]:
+        tokens = getattr(segment, "tokens", None)
+        if tokens and self.context_tokens:
+            self._context = (self._context + list(tokens))[-self.context_tokens :]
+        temperature = getattr(segment, "temperature", None)
+        if temperature and self.last_decoding_stats:
+            self.last_decoding_stats["fallback_segments"] += 1
+
+        if segment.words is not None:
+            segment_dict["words"] = [
+                {
+                    "start": word.start + offset,
+                    "end": word.end + offset,
+                    "word": word.word,
+                    "probability": word.probability,
+                }
+                for word in segment.words
+            ]
+        return segment_dict
+
+    def transcribe_bytes(self, audio_bytes: bytes) -> Transcript:
         """Transcribe audio from bytes data.
 
         Args:
             audio_bytes: Audio data as bytes (WAV format)
 
         Returns:
-            Dictionary containing transcribed text and language info
+            Transcript containing transcribed text, segments and language info
         """
-        # Create temporary file for audio bytes
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_file.write(audio_bytes)
-            temp_path = Path(temp_file.name)
-
-        try:
+        with temporary_wav(audio_bytes) as temp_path:
             return self.transcribe_file(temp_path)
-        finally:
-            # Clean up temporary file
-            temp_path.unlink(missing_ok=True)
 
-    def get_model_info(self) -> Dict[str, Union[str, bool]]:
+    def get_model_info(self) -> Dict[str, Union[str, bool, int]]:
         """Get information about the loaded model.
 
         Returns:
             Dictionary with model information
         """
         return {
-            "model_size": self.model_size,
+            "model_size": self.loaded_model_size or self.model_size,
+            "requested_model_size": self.model_size,
+            "compute_type": self.loaded_compute_type or self.compute_type,
+            "batch_size": self.batch_size,
             "loaded": self._model is not None,
         }
@@ -0,0 +1,586 @@
+"""Compact columnar representation of transcription results."""
+
+import json
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+SEGMENT_SEPARATOR = " "
+
+WordTuple = Tuple[float, float, str, float]
+
+
+class _TextColumn:
+    """Many strings stored in one buffer with an offsets array."""
+
+    def __init__(self, buffer: str, offsets: np.ndarray, separator: str) -> None:
+        """Initialize the text column.
+
+        Args:
+            buffer: All strings joined with the separator
+            offsets: Start offset of every string plus one past the end
+            separator: Separator placed between strings in the buffer
+        """
+        self.buffer = buffer
+        self.offsets = offsets
+        self.separator = separator
+
+    @classmethod
+    def from_strings(cls, strings: List[str], separator: str) -> "_TextColumn":
+        """Build a text column from a list of strings."""
+        lengths = np.fromiter(
+            (len(s) + len(separator) for s in strings),
+            dtype=np.int64,
+            count=len(strings),
+        )
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(separator.join(strings), offsets, separator)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start = int(self.offsets[index])
+        end = int(self.offsets[index + 1]) - len(self.separator)
+        return self.buffer[start:end]
+
+    def __iter__(self) -> Iterator[str]:
+        separator_length = len(self.separator)
+        buffer = self.buffer
+        bounds = self.offsets.tolist()
+        for start, end in zip(bounds, bounds[1:]):
+            yield buffer[start : end - separator_length]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the column in bytes."""
+        return len(self.buffer.encode("utf-8")) + self.offsets.nbytes
+
+
+class SegmentsView(Sequence):
+    """Read-only list-of-dicts view over a transcript's segments."""
+
+    def __init__(self, transcript: "Transcript") -> None:
+        """Initialize the view.
+
+        Args:
+            transcript: Transcript to expose
+        """
+        self._transcript = transcript
+
+    def __len__(self) -> int:
+        return self._transcript.segment_count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self._transcript.segment(index)
+
+
+class Transcript(Mapping):
+    """Transcription result stored as columns instead of one dict per segment.
+
+    Segment start and end times are float arrays and the segment texts share
+    one string buffer (which is also the full text). Optional per-segment
+    fields and word-level timings are stored the same way. The class behaves
+    like the result dictionary returned by earlier versions, so callers can
+    keep using ``result["text"]`` and ``result["segments"]``.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        texts: _TextColumn,
+        language: str = "ja",
+        duration: float = 0.0,
+        fields: Optional[Dict[str, np.ndarray]] = None,
+        words: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the transcript. Use TranscriptBuilder to create one.
+
+        Args:
+            starts: Segment start times in seconds
+            ends: Segment end times in seconds
+            texts: Segment texts
+            language: Detected language code
+            duration: Audio duration in seconds
+            fields: Optional extra per-segment columns
+            words: Optional word-level columns
+            metadata: Free-form metadata about how the transcript was produced
+        """
+        self.starts = starts
+        self.ends = ends
+        self._texts = texts
+        self.language = language
+        self.duration = duration
+        self.fields: Dict[str, np.ndarray] = fields or {}
+        self._words = words
+        self.metadata: Dict[str, Any] = metadata or {}
+
+    # Mapping interface for callers that expect the result dictionary
+
+    _KEYS = ("text", "language", "duration", "segments", "metadata")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "text":
+            return self.text
+        if key == "language":
+            return self.language
+        if key == "duration":
+            return self.duration
+        if key == "segments":
+            return SegmentsView(self)
+        if key == "metadata":
+            return self.metadata
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    # Columnar accessors
+
+    @property
+    def text(self) -> str:
+        """Full text with segments separated by single spaces."""
+        return self._texts.buffer.strip()
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments in the transcript."""
+        return len(self.starts)
+
+    @property
+    def has_words(self) -> bool:
+        """Whether word-level timestamps are available."""
+        return self._words is not None
+
+    def texts(self) -> Iterator[str]:
+        """Iterate over segment texts without building dictionaries."""
+        return iter(self._texts)
+
+    def iter_rows(self) -> Iterator[Tuple[float, float, str]]:
+        """Iterate over (start, end, text) tuples without building dictionaries."""
+        return zip(self.starts.tolist(), self.ends.tolist(), self._texts)
+
+    def field(self, name: str) -> Optional[np.ndarray]:
+        """Get an optional per-segment column.
+
+        Args:
+            name: Column name (e.g. avg_logprob)
+
+        Returns:
+            Column array, or None if the transcript has no such column
+        """
+        return self.fields.get(name)
+
+    def words(self, index: int) -> List[Dict[str, Any]]:
+        """Get the word-level timings of one segment.
+
+        Args:
+            index: Segment index
+
+        Returns:
+            List of word dictionaries (empty if words are not available)
+        """
+        if self._words is None:
+            return []
+
+        bounds = self._words["segment_bounds"]
+        word_texts: _TextColumn = self._words["text"]
+        return [
+            {
+                "start": float(self._words["start"][i]),
+                "end": float(self._words["end"][i]),
+                "word": word_texts[i],
+                "probability": float(self._words["probability"][i]),
+            }
+            for i in range(int(bounds[index]), int(bounds[index + 1]))
+        ]
+
+    def segment(self, index: int) -> Dict[str, Any]:
+        """Build the dictionary form of one segment.
+
+        Args:
+            index: Segment index
+
+        Returns:
+            Segment dictionary with start, end, text and any extra fields
+        """
+        segment: Dict[str, Any] = {
+            "start": float(self.starts[index]),
+            "end": float(self.ends[index]),
+            "text": self._texts[index],
+        }
+        for name, column in self.fields.items():
+            value = column[index]
+            segment[name] = value.item() if isinstance(value, np.generic) else value
+        if self._words is not None:
+            segment["words"] = self.words(index)
+        return segment
+
+    def update_segments(self, updates: Mapping) -> None:
+        """Replace the text and field values of some segments in place.
+
+        The text buffer is rebuilt once per call, so callers should batch
+        updates where possible.
+
+        Args:
+            updates: Mapping of segment index to a dictionary of new values
+                (text, start, end or any extra field)
+        """
+        texts = None
+        for index, values in updates.items():
+            for name, value in values.items():
+                if name == "text":
+                    if texts is None:
+                        texts = list(self._texts)
+                    texts[index] = value
+                elif name == "start":
+                    self.starts[index] = value
+                elif name == "end":
+                    self.ends[index] = value
+                else:
+                    column = self.fields.get(name)
+                    if column is None:
+                        column = _to_column(
+                            [_missing_value(value)] * self.segment_count
+                        )
+                    self.fields[name] = _set_value(column, index, value)
+
+        if texts is not None:
+            self._texts = _TextColumn.from_strings(texts, SEGMENT_SEPARATOR)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the transcript data in bytes."""
+        total = self.starts.nbytes + self.ends.nbytes + self._texts.nbytes
+        total += sum(column.nbytes for column in self.fields.values())
+        if self._words is not None:
+            total += self._words["start"].nbytes + self._words["end"].nbytes
+            total += self._words["probability"].nbytes
+            total += self._words["segment_bounds"].nbytes
+            total += self._words["text"].nbytes
+        return total
+
+    # Conversion and serialisation
+
+    @classmethod
+    def from_dict(cls, result: Mapping) -> "Transcript":
+        """Create a transcript from a result dictionary.
+
+        Args:
+            result: Dictionary with text, language and segments
+
+        Returns:
+            Equivalent transcript (returned as-is if already a Transcript)
+        """
+        if isinstance(result, Transcript):
+            return result
+
+        builder = TranscriptBuilder(
+            language=result.get("language", "ja"),
+            duration=result.get("duration", 0.0),
+        )
+        for segment in result.get("segments", []):
+            builder.append_segment(segment)
+        transcript = builder.build()
+        transcript.metadata.update(result.get("metadata", {}))
+        return transcript
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        """Save the transcript as an uncompressed NumPy archive.
+
+        Args:
+            file_path: Destination path (.npz)
+        """
+        arrays: Dict[str, np.ndarray] = {
+            "starts": self.starts,
+            "ends": self.ends,
+            "text": np.array(self._texts.buffer),
+            "text_offsets": self._texts.offsets,
+            "header": np.array(
+                json.dumps(
+                    {
+                        "language": self.language,
+                        "duration": self.duration,
+                        "metadata": self.metadata,
+                    },
+                    ensure_ascii=False,
+                )
+            ),
+        }
+        for name, column in self.fields.items():
+            if column.dtype.kind == "O":
+                # Mixed columns (e.g. ids with gaps) are stored as JSON so the
+                # archive loads without pickle
+                arrays[f"objfield_{name}"] = np.array(json.dumps(column.tolist()))
+            else:
+                arrays[f"field_{name}"] = column
+        if self._words is not None:
+            arrays["word_start"] = self._words["start"]
+            arrays["word_end"] = self._words["end"]
+            arrays["word_probability"] = self._words["probability"]
+            arrays["word_segment_bounds"] = self._words["segment_bounds"]
+            arrays["word_text"] = np.array(self._words["text"].buffer)
+            arrays["word_text_offsets"] = self._words["text"].offsets
+
+        output_path = Path(file_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path]) -> "Transcript":
+        """Load a transcript saved with save().
+
+        Args:
+            file_path: Path to the .npz archive
+
+        Returns:
+            Loaded transcript
+        """
+        with np.load(file_path, allow_pickle=False) as archive:
+            header = json.loads(str(archive["header"]))
+            fields = {}
+            for name in archive.files:
+                if name.startswith("field_"):
+                    fields[name[len("field_") :]] = archive[name]
+                elif name.startswith("objfield_"):
+                    fields[name[len("objfield_") :]] = _object_column(
+                        json.loads(str(archive[name]))
+                    )
+            words = None
+            if "word_start" in archive.files:
+                words = {
+                    "start": archive["word_start"],
+                    "end": archive["word_end"],
+                    "probability": archive["word_probability"],
+                    "segment_bounds": archive["word_segment_bounds"],
+                    "text": _TextColumn(
+                        str(archive["word_text"]), archive["word_text_offsets"], ""
+                    ),
+                }
+            return cls(
+                starts=archive["starts"],
+                ends=archive["ends"],
+                texts=_TextColumn(
+                    str(archive["text"]), archive["text_offsets"], SEGMENT_SEPARATOR
+                ),
+                language=header["language"],
+                duration=header["duration"],
+                fields=fields,
+                words=words,
+                metadata=header["metadata"],
+            )
+
+
+class TranscriptBuilder:
+    """Incrementally builds a Transcript from decoded segments."""
+
+    def __init__(self, language: str = "ja", duration: float = 0.0) -> None:
+        """Initialize the builder.
+
+        Args:
+            language: Detected language code
+            duration: Audio duration in seconds
+        """
+        self.language = language
+        self.duration = duration
+        self._starts = array("d")
+        self._ends = array("d")
+        self._texts: List[str] = []
+        self._fields: Dict[str, List[Any]] = {}
+        self._word_starts = array("d")
+        self._word_ends = array("d")
+        self._word_probabilities = array("d")
+        self._word_texts: List[str] = []
+        self._word_bounds = array("q", [0])
+        self._has_words = False
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def append(
+        self,
+        start: float,
+        end: float,
+        text: str,
+        words: Optional[List[WordTuple]] = None,
+        **fields: Any,
+    ) -> None:
+        """Append one segment.
+
+        Args:
+            start: Segment start time in seconds
+            end: Segment end time in seconds
+            text: Segment text
+            words: Optional (start, end, word, probability) tuples
+            **fields: Extra per-segment values such as avg_logprob or speaker
+        """
+        count = len(self._starts)
+        for name, value in fields.items():
+            column = self._fields.get(name)
+            if column is None:
+                column = [_missing_value(value)] * count
+                self._fields[name] = column
+            column.append(value)
+        for name, column in self._fields.items():
+            if len(column) == count:
+                column.append(_missing_value(column[0] if column else None))
+
+        self._starts.append(start)
+        self._ends.append(end)
+        self._texts.append(text)
+
+        if words is not None:
+            self._has_words = True
+            for word_start, word_end, word, probability in words:
+                self._word_starts.append(word_start)
+                self._word_ends.append(word_end)
+                self._word_texts.append(word)
+                self._word_probabilities.append(probability)
+        self._word_bounds.append(len(self._word_starts))
+
+    def append_segment(self, segment: Mapping) -> None:
+        """Append one segment given in dictionary form.
+
+        Args:
+            segment: Segment dictionary with start, end, text, optional words
+                and any extra fields
+        """
+        extra = {
+            key: value
+            for key, value in segment.items()
+            if key not in ("start", "end", "text", "words")
+        }
+        words = segment.get("words")
+        self.append(
+            segment.get("start", 0.0),
+            segment.get("end", 0.0),
+            segment.get("text", ""),
+            words=(
+                [(w["start"], w["end"], w["word"], w["probability"]) for w in words]
+                if words is not None
+                else None
+            ),
+            **extra,
+        )
+
+    def build(self) -> Transcript:
+        """Build the transcript from the appended segments.
+
+        Returns:
+            Columnar transcript
+        """
+        fields = {name: _to_column(values) for name, values in self._fields.items()}
+        words = None
+        if self._has_words:
+            words = {
+                "start": np.array(self._word_starts, dtype=np.float64),
+                "end": np.array(self._word_ends, dtype=np.float64),
+                "probability": np.array(self._word_probabilities, dtype=np.float64),
+                "segment_bounds": np.array(self._word_bounds, dtype=np.int64),
+                "text": _TextColumn.from_strings(self._word_texts, ""),
+            }
+        return Transcript(
+            starts=np.array(self._starts, dtype=np.float64),
+            ends=np.array(self._ends, dtype=np.float64),
+            texts=_TextColumn.from_strings(self._texts, SEGMENT_SEPARATOR),
+            language=self.language,
+            duration=self.duration,
+            fields=fields,
+            words=words,
+        )
+
+
+def _missing_value(example: Any) -> Any:
+    """Placeholder for a field that is missing on some segments.
+
+    Strings use "", floats NaN and anything else (e.g. integer ids) None.
+    """
+    if isinstance(example, str):
+        return ""
+    if isinstance(example, (float, np.floating)):
+        return float("nan")
+    return None
+
+
+def _value_kind(value: Any) -> str:
+    """Get the NumPy dtype kind a single field value fits in."""
+    if isinstance(value, str):
+        return "U"
+    if isinstance(value, (bool, np.bool_)):
+        return "b"
+    if isinstance(value, (int, np.integer)):
+        return "i"
+    if isinstance(value, (float, np.floating)):
+        return "f"
+    return "O"
+
+
+def _set_value(column: np.ndarray, index: int, value: Any) -> np.ndarray:
+    """Set one value in a column, widening or retyping it when needed."""
+    kind = _value_kind(value)
+    if (
+        column.dtype.kind == "O"
+        or kind == column.dtype.kind
+        or (kind == "i" and column.dtype.kind == "f")
+    ):
+        if column.dtype.kind == "U" and len(value) > column.dtype.itemsize // 4:
+            column = column.astype(f"<U{len(value)}")
+        column[index] = value
+        return column
+
+    values = column.tolist()
+    values[index] = value
+    return _to_column(values)
+
+
+def _to_column(values: List[Any]) -> np.ndarray:
+    """Convert a list of field values to a column array.
+
+    Strings give a string column (missing values ""), numbers with any float
+    among them a float64 column (missing values NaN), and booleans or
+    integers without gaps a bool or int64 column. Anything else, such as
+    integer ids missing on some segments, is kept in an object column with
+    None for the gaps.
+    """
+    kinds = {_value_kind(value) for value in values if value is not None}
+    has_gaps = any(value is None for value in values)
+    if "U" in kinds:
+        return np.array(["" if _is_missing(value) else str(value) for value in values])
+    if kinds in ({"f"}, {"f", "i"}):
+        return np.array(
+            [float("nan") if value is None else value for value in values],
+            dtype=np.float64,
+        )
+    if kinds == {"b"} and not has_gaps:
+        return np.array(values, dtype=bool)
+    if kinds == {"i"} and not has_gaps:
+        return np.array(values, dtype=np.int64)
+    return _object_column(values)
+
+
+def _is_missing(value: Any) -> bool:
+    """Check whether a field value is a missing-value placeholder."""
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _object_column(values: List[Any]) -> np.ndarray:
+    """Build a one-dimensional object column from a list of values."""
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
@@ -0,0 +1,32 @@
+"""Model stand-ins shared by the tests."""
+
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+
+class FakeModel:
+    """Stand-in for a Faster Whisper model that returns fixed segments."""
+
+    def __init__(self, texts: List[str]) -> None:
+        self.texts = texts
+        self.calls: List[dict] = []
+        self.hf_tokenizer = SimpleNamespace(
+            encode=lambda text, add_special_tokens: SimpleNamespace(ids=[0])
+        )
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        self.calls.append(kwargs)
+        segments = [
+            SimpleNamespace(
+                start=float(i),
+                end=float(i + 1),
+                text=f" {text} ",
+                words=None,
+                avg_logprob=-0.2,
+                no_speech_prob=0.01,
+                compression_ratio=1.2,
+            )
+            for i, text in enumerate(self.texts)
+        ]
+        info = SimpleNamespace(language="ja", duration=float(len(self.texts)))
+        return iter(segments), info
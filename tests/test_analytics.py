@@ -0,0 +1,84 @@
+"""Tests for the incremental meeting analytics."""
+
+import pytest
+
+from recordnote.analytics import MeetingAnalytics, count_characters
+from recordnote.formatter import MinutesFormatter
+from recordnote.transcript import TranscriptBuilder
+
+
+def test_count_characters_ignores_spaces_and_punctuation() -> None:
+    """Test Japanese-aware character counting."""
+    assert count_characters("これはテストです。") == 8
+    assert count_characters("よろしく お願いします！") == 10
+    assert count_characters("RecordNote 2.0、") == 12
+
+
+def test_speech_ratio_and_overlaps() -> None:
+    """Test that overlapping speech is counted once."""
+    analytics = MeetingAnalytics(duration=20.0)
+    analytics.add(0.0, 4.0, "こんにちは。", "チャンネル1")
+    analytics.add(2.0, 6.0, "はい、どうも。", "チャンネル2")
+    analytics.add(10.0, 12.0, "では始めます。", "チャンネル1")
+
+    stats = analytics.snapshot()
+    assert stats["speech_seconds"] == pytest.approx(8.0)
+    assert stats["silence_seconds"] == pytest.approx(12.0)
+    assert stats["speech_ratio"] == pytest.approx(0.4)
+    assert stats["speakers"]["チャンネル1"]["seconds"] == pytest.approx(6.0)
+    assert stats["speakers"]["チャンネル2"]["share"] == pytest.approx(0.4)
+
+
+def test_sentences_span_segments() -> None:
+    """Test that a sentence split over segments is counted once."""
+    analytics = MeetingAnalytics()
+    analytics.add(0.0, 2.0, "本日の議題は", "")
+    analytics.add(2.0, 4.0, "予算です。次に", "")
+    assert analytics.snapshot()["sentence_count"] == 2
+
+    analytics.add(4.0, 6.0, "日程です！", "")
+    stats = analytics.snapshot()
+    assert stats["sentence_count"] == 2
+    assert stats["scripts"]["kanji"] == 9
+    assert stats["speakers"] == {}
+
+
+def test_speaking_rate_over_time() -> None:
+    """Test the per-minute timeline and the recent speaking rate."""
+    analytics = MeetingAnalytics(rate_window=60.0)
+    analytics.add(0.0, 30.0, "あ" * 100, "")
+    analytics.add(130.0, 160.0, "い" * 50, "")
+
+    stats = analytics.snapshot()
+    assert stats["rate_timeline"] == [100, 0, 50]
+    assert stats["chars_per_minute"] == pytest.approx(150.0)
+    assert stats["recent_chars_per_minute"] == pytest.approx(50.0)
+
+
+def test_minutes_include_statistics() -> None:
+    """Test that the minutes end with the statistics section."""
+    builder = TranscriptBuilder(language="ja", duration=10.0)
+    builder.append(0.0, 3.0, "よろしくお願いします。", speaker="話者1")
+    builder.append(3.0, 5.0, "はい。", speaker="話者2")
+    transcript = builder.build()
+
+    analytics = MeetingAnalytics(10.0)
+    minutes = MinutesFormatter().format_minutes(transcript, "定例会", analytics)
+
+    assert analytics.segment_count == 2
+    assert "## 会議の統計" in minutes
+    assert "（発話率 50%）" in minutes
+    assert "| 話者1 | 00:03 | 60% | 10 |" in minutes
+    assert minutes.index("## 会議の統計") < minutes.index("**言語**")
+
+
+def test_segments_added_as_they_are_decoded() -> None:
+    """Test that decoded segment dicts update the summary line."""
+    analytics = MeetingAnalytics(duration=60.0)
+    analytics.add_segment({"start": 0.0, "end": 6.0, "text": "本日はよろしく。"})
+    first = analytics.summary_line()
+    analytics.add_segment({"start": 6.0, "end": 12.0, "text": "議題は二つです。"})
+
+    assert first.startswith("文字数: 7（1文）")
+    assert analytics.summary_line().startswith("文字数: 14（2文）")
+    assert analytics.snapshot()["speech_seconds"] == pytest.approx(12.0)
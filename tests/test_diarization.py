@@ -0,0 +1,55 @@
+"""Tests for the speaker diarization module."""
+
+import numpy as np
+
+from recordnote.benchmark import synthetic_conversation
+from recordnote.diarization import IncrementalClusterer, SpeakerDiarizer
+from recordnote.formatter import MinutesFormatter
+
+
+def test_diarizer_separates_synthetic_speakers() -> None:
+    """Test that each synthetic voice maps to exactly one speaker label."""
+    audio, transcript, truth = synthetic_conversation(60.0, speakers=3)
+
+    SpeakerDiarizer().annotate(transcript, audio)
+
+    labels = transcript.fields["speaker"].tolist()
+    mapping = {}
+    for speaker, label in zip(truth, labels):
+        assert mapping.setdefault(speaker, label) == label
+    assert len(set(mapping.values())) == 3
+    assert transcript.metadata["diarization"] == {"speakers": 3}
+
+
+def test_short_segments_keep_previous_speaker() -> None:
+    """Test that segments too short to embed inherit the previous label."""
+    audio, transcript, _ = synthetic_conversation(10.0, speakers=1)
+    diarizer = SpeakerDiarizer()
+
+    first = diarizer.label_segment(audio, 0.0, 1.0)
+    assert diarizer.label_segment(audio, 1.0, 1.01) == first
+
+
+def test_clusterer_respects_max_speakers() -> None:
+    """Test that new speakers are merged once the limit is reached."""
+    clusterer = IncrementalClusterer(threshold=0.99, max_speakers=2)
+
+    indices = [clusterer.assign(vector) for vector in np.eye(3)]
+
+    assert indices[:2] == [0, 1]
+    assert indices[2] in (0, 1)
+    assert clusterer.speaker_count == 2
+
+
+def test_formatter_shows_speaker_labels() -> None:
+    """Test that diarized segments carry their label into the Markdown."""
+    result = {
+        "text": "こんにちは。",
+        "segments": [{"start": 1.0, "end": 3.0, "text": "こんにちは。", "speaker": "話者1"}],
+    }
+
+    formatted = MinutesFormatter().format_segments(
+        MinutesFormatter().iter_segment_rows(result)
+    )
+
+    assert formatted == "**00:01 - 00:03** [話者1]: こんにちは。\n\n"
@@ -0,0 +1,109 @@
+"""Tests for the exporters module."""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
+
+from recordnote.exporters import export_segments, export_transcript, format_for_path
+from recordnote.formatter import MinutesFormatter
+from recordnote.transcript import TranscriptBuilder
+
+
+def _build_transcript() -> TranscriptBuilder:
+    builder = TranscriptBuilder(language="ja", duration=70.0)
+    builder.append(0.0, 2.5, "本日の会議を始めます。", speaker="話者1")
+    builder.append(2.5, 5.0, "よろしく お願いします。", speaker="話者2")
+    builder.append(5.0, 5.5, "", speaker="話者2")
+    builder.append(61.2, 65.04, "それでは 議題に入ります。", speaker="話者1")
+    return builder
+
+
+def _without_dates(text: str) -> str:
+    return re.sub(r"\d{4}年\d{2}月\d{2}日 \d{2}:\d{2}:\d{2}", "DATE", text)
+
+
+def test_markdown_export_matches_formatter(tmp_path: Path) -> None:
+    """Test that the streamed Markdown equals MinutesFormatter output."""
+    transcript = _build_transcript().build()
+    path = tmp_path / "minutes.md"
+
+    export_transcript(transcript, {"md": path}, title="定例会")
+
+    expected = MinutesFormatter().format_minutes(transcript, "定例会")
+    assert _without_dates(path.read_text(encoding="utf-8")) == _without_dates(expected)
+
+
+def test_subtitle_and_json_exports(tmp_path: Path) -> None:
+    """Test SRT, WebVTT and JSON written in the same pass."""
+    transcript = _build_transcript().build()
+    transcript.metadata["model"] = "tiny"
+    outputs = {
+        "srt": tmp_path / "out.srt",
+        "vtt": tmp_path / "out.vtt",
+        "json": tmp_path / "out.json",
+    }
+
+    export_transcript(transcript, outputs)
+
+    srt = outputs["srt"].read_text(encoding="utf-8")
+    assert srt.startswith("1\n00:00:00,000 --> 00:00:02,500\n[話者1] 本日の会議を始めます。\n\n")
+    assert "3\n00:01:01,200 --> 00:01:05,040\n[話者1] それでは 議題に入ります。\n\n" in srt
+
+    vtt = outputs["vtt"].read_text(encoding="utf-8")
+    assert vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:02.500\n<v 話者1>本日")
+
+    document = json.loads(outputs["json"].read_text(encoding="utf-8"))
+    assert document["duration"] == 70.0
+    assert document["metadata"] == {"model": "tiny"}
+    assert [s["speaker"] for s in document["segments"]] == [
+        "話者1",
+        "話者2",
+        "話者2",
+        "話者1",
+    ]
+
+
+def test_json_export_writes_missing_values_as_null(tmp_path: Path) -> None:
+    """Test that missing confidences become null rather than invalid NaN."""
+    builder = TranscriptBuilder(language="ja", duration=4.0)
+    builder.append(0.0, 2.0, "はい。", avg_logprob=-0.3)
+    builder.append(2.0, 4.0, "いいえ。")
+    transcript = builder.build()
+    transcript.metadata["score"] = float("nan")
+    output = tmp_path / "out.json"
+
+    export_transcript(transcript, {"json": output})
+
+    def reject(constant: str) -> None:
+        raise ValueError(f"invalid JSON constant {constant}")
+
+    document = json.loads(output.read_text(encoding="utf-8"), parse_constant=reject)
+    assert [s["avg_logprob"] for s in document["segments"]] == [-0.3, None]
+    assert document["metadata"] == {"score": None}
+
+
+def test_export_segments_consumes_a_generator_once(tmp_path: Path) -> None:
+    """Test that decoder output can be streamed straight into the files."""
+    consumed = []
+
+    def segments() -> Iterator[Dict[str, Any]]:
+        for i in range(3):
+            consumed.append(i)
+            yield {"start": float(i), "end": float(i + 1), "text": f"第{i}文。"}
+
+    export_segments(
+        segments(), {"json": tmp_path / "a.json", "srt": tmp_path / "a.srt"}
+    )
+
+    assert consumed == [0, 1, 2]
+    assert len(json.loads((tmp_path / "a.json").read_text())["segments"]) == 3
+
+
+def test_format_for_path() -> None:
+    """Test that formats are chosen by extension."""
+    assert format_for_path(Path("minutes.VTT")) == "vtt"
+    with pytest.raises(ValueError):
+        format_for_path(Path("minutes.docx"))
@@ -0,0 +1,175 @@
+"""Tests for the memory-pressure governor and recorder spilling."""
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from recordnote import recorder as recorder_module
+from recordnote import transcriber as transcriber_module
+from recordnote.governor import ResourceGovernor, estimate_model_mb
+from recordnote.recorder import AudioRecorder
+from recordnote.sources import SyntheticSource
+from recordnote.transcriber import SpeechTranscriber
+
+
+def _memory(available_mb: float, rss_mb: float = 100.0) -> Callable[[], Dict]:
+    return lambda: {
+        "rss_mb": rss_mb,
+        "available_mb": available_mb,
+        "total_mb": 16384.0,
+    }
+
+
+def test_model_kept_when_memory_is_plentiful() -> None:
+    """Test that the requested model is loaded when it fits."""
+    governor = ResourceGovernor(memory_reader=_memory(16000))
+
+    assert governor.choose_model("medium", "float32") == ("medium", "float32")
+    assert governor.pop_events() == []
+
+
+def test_model_downgraded_compute_type_first() -> None:
+    """Test that int8 weights are tried before a smaller model."""
+    budget = estimate_model_mb("medium", "int8") + 100
+    governor = ResourceGovernor(reserve_mb=1000, memory_reader=_memory(budget + 1000))
+
+    assert governor.choose_model("medium", "float32") == ("medium", "int8")
+    events = governor.pop_events()
+    assert events[0]["type"] == "model_downgraded"
+    assert events[0]["chosen"] == "medium/int8"
+
+
+def test_model_downgraded_to_smaller_size() -> None:
+    """Test that smaller models are chosen down to the smallest one."""
+    governor = ResourceGovernor(reserve_mb=0, memory_reader=_memory(700))
+    assert governor.choose_model("large") == ("small", "int8")
+
+    governor = ResourceGovernor(reserve_mb=0, memory_reader=_memory(10))
+    assert governor.choose_model("large") == ("tiny", "int8")
+
+
+def test_transcriber_keeps_requested_model_size(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a downgrade is recorded apart from the requested size."""
+    loaded: List[str] = []
+    monkeypatch.setattr(
+        transcriber_module,
+        "WhisperModel",
+        lambda model_size, **kwargs: loaded.append(model_size),
+    )
+    governor = ResourceGovernor(reserve_mb=0, memory_reader=_memory(700))
+    transcriber = SpeechTranscriber("large", governor=governor)
+
+    transcriber.load_model()
+
+    assert loaded == ["small"]
+    assert transcriber.model_size == "large"
+    assert transcriber.loaded_model_size == "small"
+    info = transcriber.get_model_info()
+    assert info["model_size"] == "small"
+    assert info["requested_model_size"] == "large"
+
+
+def test_pressure_warning_raised_once() -> None:
+    """Test that a low-memory warning is raised when pressure begins."""
+    available = [4000.0]
+    governor = ResourceGovernor(
+        low_memory_mb=1000,
+        memory_reader=lambda: {
+            "rss_mb": 100.0,
+            "available_mb": available[0],
+            "total_mb": 16384.0,
+        },
+    )
+
+    assert not governor.check_pressure()
+    available[0] = 500.0
+    assert governor.check_pressure()
+    assert governor.check_pressure()
+    assert [event["type"] for event in governor.pop_events()] == ["low_memory"]
+
+
+def test_recorder_spills_audio_to_disk(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that spilled recordings keep every sample and still save."""
+    monkeypatch.setattr(recorder_module, "SPILL_CHECK_SECONDS", 0.01)
+    governor = ResourceGovernor(max_buffer_mb=0.1, memory_reader=_memory(16000))
+    recorder = AudioRecorder(
+        source=SyntheticSource(30.0, sample_rate=8000, channels=2, speed=100.0),
+        governor=governor,
+    )
+    recorder.start_recording()
+    assert recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    assert recorder._spilled_frames > 0
+    assert recorder.get_duration() == 30.0
+    audio = recorder.get_audio_array()
+    assert audio.shape == (240000, 2)
+    assert recorder.audio_data == []
+
+    output = tmp_path / "spilled.wav"
+    recorder.save_to_file(output)
+    sample_rate, saved = wavfile.read(str(output))
+    assert sample_rate == 8000
+    np.testing.assert_array_equal(saved, audio)
+    assert any(e["type"] == "audio_spilled" for e in governor.pop_events())
+
+
+def test_recorder_without_pressure_keeps_audio_in_memory() -> None:
+    """Test that nothing is spilled while memory is plentiful."""
+    governor = ResourceGovernor(memory_reader=_memory(16000))
+    recorder = AudioRecorder(
+        source=SyntheticSource(30.0, sample_rate=8000), governor=governor
+    )
+    recorder.start_recording()
+    assert recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    assert recorder._spilled_frames == 0
+    assert len(recorder.get_audio_array()) == 240000
+
+
+def test_audio_callback_never_checks_memory_or_writes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that memory checks and spill writes stay off the audio callback."""
+    monkeypatch.setattr(recorder_module, "SPILL_CHECK_SECONDS", 0.01)
+    callback_threads: List[int] = []
+    io_threads: List[int] = []
+
+    def read_memory() -> Dict:
+        io_threads.append(threading.get_ident())
+        return _memory(16000)()
+
+    governor = ResourceGovernor(max_buffer_mb=0.01, memory_reader=read_memory)
+    recorder = AudioRecorder(
+        source=SyntheticSource(5.0, sample_rate=8000, speed=20.0), governor=governor
+    )
+    on_block = recorder._on_block
+    spill = recorder._spill
+
+    def traced_on_block(block: np.ndarray, overflowed: bool) -> None:
+        callback_threads.append(threading.get_ident())
+        on_block(block, overflowed)
+
+    def traced_spill() -> None:
+        io_threads.append(threading.get_ident())
+        spill()
+
+    monkeypatch.setattr(recorder, "_on_block", traced_on_block)
+    monkeypatch.setattr(recorder, "_spill", traced_spill)
+    recorder.start_recording()
+    assert recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    assert callback_threads and io_threads
+    assert recorder._spilled_frames > 0
+    assert not set(callback_threads) & set(io_threads)
+    assert len(recorder.get_audio_array()) == 40000
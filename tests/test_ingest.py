@@ -0,0 +1,192 @@
+"""Tests for the watch-folder ingestion daemon."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from recordnote.ingest import FileStabilityTracker, IngestDaemon, InotifyWatcher
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that records the order files were handled in."""
+
+    model_size = "fake"
+
+    def __init__(self, order: List[str], release: threading.Event) -> None:
+        self.order = order
+        self.release = release
+
+    def load_model(self) -> None:
+        pass
+
+    def stream_file(
+        self, audio_file_path: Path
+    ) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        self.release.wait(timeout=5)
+        self.order.append(audio_file_path.name)
+        if audio_file_path.name.startswith("broken"):
+            raise ValueError("unreadable audio")
+        segments = iter([{"start": 0.0, "end": 1.0, "text": "本日の会議です。"}])
+        return {"language": "ja", "duration": 1.0}, segments
+
+
+def _run(daemon: IngestDaemon) -> threading.Thread:
+    daemon.start()
+    thread = threading.Thread(target=daemon.run, args=(0,), daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_idle(daemon: IngestDaemon, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not daemon.is_idle():
+        assert time.monotonic() < deadline, "daemon did not become idle"
+        time.sleep(0.02)
+
+
+def test_stability_tracker_waits_for_writes_to_stop(tmp_path: Path) -> None:
+    """Test that growing files are held back until they settle."""
+    audio = tmp_path / "room.wav"
+    audio.write_bytes(b"RIFF")
+    tracker = FileStabilityTracker(settle_seconds=1.0)
+
+    tracker.add(audio, now=0.0)
+    assert tracker.pop_stable(now=0.0) == []
+    with open(audio, "ab") as f:
+        f.write(b"data")
+    assert tracker.pop_stable(now=0.9) == []
+    assert tracker.pop_stable(now=1.5) == []
+    assert tracker.pop_stable(now=2.0) == [audio]
+    assert len(tracker) == 0
+
+
+def test_daemon_writes_minutes_by_priority_and_size(tmp_path: Path) -> None:
+    """Test scheduling order, outputs next to the audio and metrics."""
+    order: List[str] = []
+    release = threading.Event()
+    (tmp_path / "large.wav").write_bytes(b"x" * 300)
+    (tmp_path / "small.wav").write_bytes(b"x" * 100)
+    (tmp_path / "urgent-large.wav").write_bytes(b"x" * 500)
+    (tmp_path / "broken.wav").write_bytes(b"x" * 200)
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    daemon = IngestDaemon(
+        tmp_path,
+        lambda: FakeTranscriber(order, release),  # type: ignore[arg-type,return-value]
+        formats=["md", "srt"],
+        priority=lambda path: 0 if path.name.startswith("urgent") else 1,
+        settle_seconds=0.0,
+        poll_interval=0.05,
+        use_inotify=False,
+    )
+    thread = _run(daemon)
+    time.sleep(0.3)
+    release.set()
+    _wait_idle(daemon)
+    daemon.stop()
+    thread.join(timeout=5)
+
+    assert order == ["urgent-large.wav", "small.wav", "broken.wav", "large.wav"]
+    assert "本日の会議です。" in (tmp_path / "small.md").read_text(encoding="utf-8")
+    assert (tmp_path / "large.srt").exists()
+    assert not (tmp_path / "broken.md").exists()
+    assert not list(tmp_path.glob("*.part"))
+
+    stats = daemon.metrics.snapshot()
+    assert stats["processed"] == 3
+    assert stats["failed"] == 1
+    assert stats["max_queue_depth"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["throughput"] > 0
+
+
+def test_daemon_skips_finished_recordings_and_picks_up_new_ones(
+    tmp_path: Path,
+) -> None:
+    """Test restart idempotence and files arriving while running."""
+    order: List[str] = []
+    release = threading.Event()
+    release.set()
+    (tmp_path / "done.wav").write_bytes(b"x" * 100)
+    time.sleep(0.01)
+    (tmp_path / "done.md").write_text("minutes")
+
+    try:
+        InotifyWatcher(tmp_path, ["*.wav"]).close()
+        use_inotify = True
+    except OSError:
+        use_inotify = False
+
+    daemon = IngestDaemon(
+        tmp_path,
+        lambda: FakeTranscriber(order, release),  # type: ignore[arg-type,return-value]
+        settle_seconds=0.1,
+        poll_interval=0.05,
+        use_inotify=use_inotify,
+    )
+    thread = _run(daemon)
+    (tmp_path / "new.wav").write_bytes(b"x" * 100)
+    time.sleep(0.1)
+    _wait_idle(daemon)
+    daemon.stop()
+    thread.join(timeout=5)
+
+    assert order == ["new.wav"]
+    assert (tmp_path / "done.md").read_text() == "minutes"
+    assert (tmp_path / "new.md").exists()
+
+
+class SilentWatcher:
+    """Watcher that never reports events, like inotify on a network share."""
+
+    def wait(self, timeout: float) -> List[Path]:
+        time.sleep(timeout)
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+def test_rescan_finds_missed_files_and_forgets_removed_ones(
+    tmp_path: Path,
+) -> None:
+    """Test the periodic rescan that backs up the event watcher."""
+    order: List[str] = []
+    release = threading.Event()
+    release.set()
+    daemon = IngestDaemon(
+        tmp_path,
+        lambda: FakeTranscriber(order, release),  # type: ignore[arg-type,return-value]
+        settle_seconds=0.0,
+        poll_interval=0.02,
+        rescan_interval=0.1,
+    )
+    daemon._create_watcher = SilentWatcher  # type: ignore[method-assign]
+    thread = _run(daemon)
+    audio = tmp_path / "share.wav"
+    audio.write_bytes(b"x" * 100)
+    deadline = time.monotonic() + 5
+    while not (tmp_path / "share.md").exists():
+        assert time.monotonic() < deadline, "missed file was not picked up"
+        time.sleep(0.02)
+    _wait_idle(daemon)
+    assert audio in daemon._known
+
+    audio.unlink()
+    deadline = time.monotonic() + 5
+    while audio in daemon._known:
+        assert time.monotonic() < deadline, "removed file was not forgotten"
+        time.sleep(0.02)
+    daemon.stop()
+    thread.join(timeout=5)
+
+    assert order == ["share.wav"]
+
+
+def test_unknown_format_rejected(tmp_path: Path) -> None:
+    """Test that unsupported formats fail at construction."""
+    with pytest.raises(ValueError):
+        IngestDaemon(tmp_path, lambda: None, formats=["docx"])  # type: ignore
@@ -0,0 +1,104 @@
+"""Tests for multi-channel capture and transcription."""
+
+from types import SimpleNamespace
+from typing import Any, Tuple
+
+import numpy as np
+
+from recordnote.formatter import MinutesFormatter
+from recordnote.multichannel import MultiChannelTranscriber, MultiDeviceSource
+from recordnote.recorder import AudioRecorder
+from recordnote.sources import SyntheticSource
+from recordnote.transcriber import SpeechTranscriber
+
+
+class BurstFakeModel:
+    """Model stand-in emitting one segment per loud burst in the audio."""
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        loud = np.flatnonzero(np.abs(audio) > 0.5) / 16000
+        starts = sorted({round(t * 2) / 2 for t in loud})
+        segments = [
+            SimpleNamespace(
+                start=start,
+                end=start + 0.5,
+                text=f"{start:.1f}",
+                words=None,
+                avg_logprob=-0.2,
+                no_speech_prob=0.01,
+                compression_ratio=1.2,
+            )
+            for start in starts
+        ]
+        info = SimpleNamespace(language="ja", duration=len(audio) / 16000)
+        return iter(segments), info
+
+
+def _make_fake_transcriber() -> SpeechTranscriber:
+    transcriber = SpeechTranscriber("tiny")
+    transcriber._model = BurstFakeModel()  # type: ignore[assignment]
+    return transcriber
+
+
+def test_multi_device_source_aligns_and_pads() -> None:
+    """Test that sources are recorded side by side from a common start."""
+    long_source = SyntheticSource(2.0, block_size=1000, seed=1)
+    short_source = SyntheticSource(1.0, block_size=700, seed=2)
+    recorder = AudioRecorder(
+        source=MultiDeviceSource([long_source, short_source], block_size=512)
+    )
+
+    recorder.start_recording()
+    assert recorder.wait_until_finished(timeout=10)
+    recorder.stop_recording()
+
+    audio = np.concatenate(recorder.audio_data)
+    assert audio.shape == (32000, 2)
+    expected = []
+    SyntheticSource(2.0, block_size=1000, seed=1).stream(
+        lambda block, overflowed: expected.append(block), lambda: True
+    )
+    np.testing.assert_array_equal(audio[:, 0], np.concatenate(expected)[:, 0])
+    assert not audio[16000:, 1].any()
+
+
+def test_channels_are_transcribed_separately_and_merged() -> None:
+    """Test that segments of every channel are merged by start time."""
+    sample_rate = 32000
+    audio = np.zeros((sample_rate * 4, 2), dtype=np.float32)
+    for channel, starts in ((0, (0.5, 2.5)), (1, (1.5, 3.0))):
+        for start in starts:
+            index = int(start * sample_rate)
+            audio[index : index + 320, channel] = 0.9
+
+    transcriber = MultiChannelTranscriber(
+        channel_labels=["会議室", "リモート"],
+        workers=2,
+        transcriber_factory=_make_fake_transcriber,
+    )
+    transcript = transcriber.transcribe_channels(audio, sample_rate)
+
+    assert list(transcript.texts()) == ["0.5", "1.5", "2.5", "3.0"]
+    assert transcript.fields["channel"].tolist() == [
+        "会議室",
+        "リモート",
+        "会議室",
+        "リモート",
+    ]
+    assert transcript.duration == 4.0
+    assert [c["segments"] for c in transcript.metadata["channels"]] == [2, 2]
+
+
+def test_formatter_combines_channel_and_speaker_labels() -> None:
+    """Test that channel and speaker appear together in the minutes."""
+    result = {
+        "segments": [
+            {"start": 0, "end": 2, "text": "はい。", "channel": "会議室", "speaker": "話者2"},
+            {"start": 2, "end": 4, "text": "どうぞ。", "channel": "リモート"},
+        ]
+    }
+    formatter = MinutesFormatter()
+
+    assert formatter.format_segments(formatter.iter_segment_rows(result)) == (
+        "**00:00 - 00:02** [会議室 / 話者2]: はい。\n\n" "**00:02 - 00:04** [リモート]: どうぞ。\n\n"
+    )
@@ -0,0 +1,87 @@
+"""Tests for the audio preprocessing module."""
+
+import numpy as np
+
+from recordnote.preprocess import (
+    AudioPreprocessor,
+    AutomaticGainControl,
+    HighPassFilter,
+    SpectralNoiseGate,
+)
+
+
+def _process_in_blocks(stage: object, audio: np.ndarray, sizes: list) -> np.ndarray:
+    """Feed audio through a stage in blocks of varying size."""
+    output = []
+    offset = 0
+    i = 0
+    while offset < len(audio):
+        size = sizes[i % len(sizes)]
+        block = audio[offset : offset + size].copy()
+        output.append(stage.process(block))  # type: ignore[attr-defined]
+        offset += size
+        i += 1
+    return np.concatenate(output)
+
+
+def test_noise_gate_passes_audio_through_when_open() -> None:
+    """Test that an open gate reconstructs the input, tail included."""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.1, size=(8000, 2)).astype(np.float32)
+    gate = SpectralNoiseGate(channels=2, frame_size=512, threshold=0.0)
+
+    output = _process_in_blocks(gate, audio, [100, 333, 1024, 7])
+    assert len(output) < len(audio)
+    output = np.concatenate((output, gate.flush()))
+
+    assert output.shape == audio.shape
+    np.testing.assert_allclose(output, audio, atol=1e-5)
+
+
+def test_preprocessor_output_length_matches_input() -> None:
+    """Test that flushing returns every held-back sample of a recording."""
+    rng = np.random.default_rng(2)
+    preprocessor = AudioPreprocessor(16000, channels=1)
+    for length in (100, 1000, 16001):
+        audio = rng.normal(0, 0.1, size=(length, 1)).astype(np.float32)
+        output = _process_in_blocks(preprocessor, audio, [160, 77])
+        output = np.concatenate((output, preprocessor.flush()))
+        assert output.shape == audio.shape
+
+
+def test_noise_gate_attenuates_stationary_noise() -> None:
+    """Test that background noise is reduced while a tone survives."""
+    rng = np.random.default_rng(1)
+    t = np.arange(32000) / 16000
+    noise = rng.normal(0, 0.02, size=(32000, 1)).astype(np.float32)
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t) * (t > 1.0)).astype(np.float32)
+    audio = noise + tone[:, None]
+    gate = SpectralNoiseGate(channels=1)
+
+    output = _process_in_blocks(gate, audio, [1024])
+
+    noise_only = slice(4000, 15000)
+    assert np.std(output[noise_only]) < 0.5 * np.std(audio[noise_only])
+    assert np.std(output[20000:]) > 0.8 * np.std(audio[20000:])
+
+
+def test_highpass_removes_dc_and_agc_normalises() -> None:
+    """Test DC removal and loudness normalisation on a quiet signal."""
+    t = np.arange(16000 * 4) / 16000
+    audio = (0.5 + 0.01 * np.sin(2 * np.pi * 300 * t)).astype(np.float32)[:, None]
+
+    filtered = _process_in_blocks(HighPassFilter(16000), audio, [512])
+    assert abs(float(np.mean(filtered[16000:]))) < 1e-3
+
+    normalised = _process_in_blocks(AutomaticGainControl(), filtered, [512])
+    rms = float(np.sqrt(np.mean(np.square(normalised[-16000:]))))
+    assert 0.05 < rms < 0.15
+
+
+def test_preprocessor_stages_are_switchable() -> None:
+    """Test that disabled stages are skipped and shapes are preserved."""
+    preprocessor = AudioPreprocessor(16000, highpass=False, noise_gate=False)
+    assert [type(stage) for stage in preprocessor.stages] == [AutomaticGainControl]
+
+    block = np.zeros((256, 1), dtype=np.float32)
+    assert preprocessor.process(block).shape == (256, 1)
@@ -0,0 +1,154 @@
+"""Tests for the draft/refine transcription module."""
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+from scipy.io import wavfile
+
+from recordnote.benchmark import character_error_rate
+from recordnote.refine import DraftRefineTranscriber
+from recordnote.transcript import Transcript
+from tests.fakes import FakeModel
+
+
+def _segment(start: float, end: float, avg_logprob: float) -> Dict[str, Any]:
+    return {"start": start, "end": end, "text": "x", "avg_logprob": avg_logprob}
+
+
+def test_low_confidence_spans_are_merged_into_windows() -> None:
+    """Test that only unsure segments are refined, merged up to 30 seconds."""
+    segments = [
+        _segment(0.0, 5.0, -0.1),
+        _segment(5.0, 10.0, -1.2),
+        _segment(10.0, 20.0, -0.9),
+        _segment(20.0, 25.0, -0.2),
+        _segment(25.0, 40.0, -1.0),
+        _segment(40.0, 50.0, -1.0),
+        _segment(50.0, 60.0, -1.0),
+    ]
+    transcriber = DraftRefineTranscriber()
+
+    assert not transcriber.refine_all
+    assert list(transcriber.refine_windows(segments)) == [[1, 2], [4, 5], [6]]
+    transcriber.refine_all = True
+    assert list(transcriber.refine_windows(segments)) == [[0, 1, 2, 3], [4, 5], [6]]
+
+
+def test_refined_text_replaces_draft(tmp_path: Path) -> None:
+    """Test that the draft is shown first and then refined in place."""
+    audio_file = tmp_path / "audio.wav"
+    wavfile.write(str(audio_file), 16000, np.zeros(32000, dtype=np.float32))
+    transcriber = DraftRefineTranscriber("tiny", "medium", refine_all=True)
+    transcriber.draft._model = FakeModel(["した書き", "下書き"])  # type: ignore
+    refiner = FakeModel(["下書き"])
+    transcriber.refiner._model = refiner  # type: ignore
+    transcriber.refiner._context = [1, 2, 3]
+    updates: List[Tuple[str, bool]] = []
+
+    result = transcriber.transcribe_file(
+        audio_file,
+        on_update=lambda t: updates.append((t.text, t.metadata["refine"]["refined"])),
+    )
+
+    assert updates == [
+        ("した書き", False),
+        ("した書き 下書き", False),
+        ("下書き 下書き", True),
+    ]
+    assert result.text == "下書き 下書き"
+    assert result.metadata["refine"]["windows"] == 1
+    assert result.metadata["refine"]["changed_segments"] == 1
+    assert result.field("refined") is None
+    # The first window has no preceding text and no stale carried context
+    assert len(refiner.calls) == 1
+    assert refiner.calls[0]["initial_prompt"] is None
+
+
+class SlowDraftModel:
+    """Draft model stand-in whose later segments wait for the refine pass."""
+
+    def __init__(self, refined: threading.Event) -> None:
+        self.refined = refined
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        def segments() -> Iterator[Any]:
+            for i, (text, logprob) in enumerate(
+                [("えーと", -1.0), ("会議", -0.1), ("です", -0.1), ("以上", -0.1)]
+            ):
+                if i == 2:
+                    # Give the worker time to finish refining the first window
+                    self.refined.wait(timeout=5)
+                    time.sleep(0.2)
+                yield SimpleNamespace(
+                    start=float(i),
+                    end=float(i + 1),
+                    text=text,
+                    words=None,
+                    avg_logprob=logprob,
+                    no_speech_prob=0.01,
+                    compression_ratio=1.2,
+                )
+
+        return segments(), SimpleNamespace(language="ja", duration=4.0)
+
+
+class SignallingModel(FakeModel):
+    """Refine model stand-in that signals when it has been called."""
+
+    def __init__(self, texts: List[str], called: threading.Event) -> None:
+        super().__init__(texts)
+        self.called = called
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        self.called.set()
+        return super().transcribe(audio, **kwargs)
+
+
+def test_updates_arrive_while_the_draft_is_decoding(tmp_path: Path) -> None:
+    """Test that draft text and refined windows are shown before the end."""
+    audio_file = tmp_path / "audio.wav"
+    wavfile.write(str(audio_file), 16000, np.zeros(64000, dtype=np.float32))
+    refined = threading.Event()
+    transcriber = DraftRefineTranscriber("tiny", "medium")
+    transcriber.draft._model = SlowDraftModel(refined)  # type: ignore
+    transcriber.refiner._model = SignallingModel(["えっと"], refined)  # type: ignore
+    updates: List[Transcript] = []
+
+    result = transcriber.transcribe_file(audio_file, on_update=updates.append)
+
+    assert updates[0].text == "えーと"
+    assert updates[0].segment_count == 1
+    # The refined window replaces its draft text before the draft is done
+    assert any(t.segment_count < 4 and t.text.startswith("えっと") for t in updates)
+    assert result.text == "えっと 会議 です 以上"
+    assert (
+        result.metadata["refine"]["first_text_latency"]
+        < result.metadata["refine"]["total_seconds"]
+    )
+
+
+def test_confident_draft_is_not_refined(tmp_path: Path) -> None:
+    """Test that confident drafts never reach the refine model by default."""
+    audio_file = tmp_path / "audio.wav"
+    wavfile.write(str(audio_file), 16000, np.zeros(32000, dtype=np.float32))
+    transcriber = DraftRefineTranscriber("tiny", "medium")
+    transcriber.draft._model = FakeModel(["会議", "です"])  # type: ignore
+    refiner = FakeModel(["違う"])
+    transcriber.refiner._model = refiner  # type: ignore
+
+    result = transcriber.transcribe_file(audio_file)
+
+    assert result.text == "会議 です"
+    assert refiner.calls == []
+    assert result.metadata["refine"]["refined"] is True
+    assert result.metadata["refine"]["windows"] == 0
+
+
+def test_character_error_rate() -> None:
+    """Test character error rate ignoring whitespace and punctuation."""
+    assert character_error_rate("今日は晴れです。", "今日は 晴れです") == 0.0
+    assert character_error_rate("今日は晴れです", "今日は雨です") == 2 / 7
@@ -0,0 +1,44 @@
+"""Tests for the repetition loop detector."""
+
+from recordnote.repetition import RepetitionDetector, compression_ratio
+
+
+def test_ordinary_meeting_text_is_not_flagged() -> None:
+    """Test that normal speech, including repeated short replies, passes."""
+    segments = [
+        "本日の会議を始めます。",
+        "まず前回の議事録の確認からお願いします。",
+        "はい。",
+        "はい。",
+        "はい。",
+        "発売日は来月の十五日で決定しました。",
+        "追加の予算は約三百万円です。",
+        "では、本日の会議はこれで終わります。",
+    ]
+    detector = RepetitionDetector()
+
+    assert [detector.check(text) for text in segments] == [None] * len(segments)
+
+
+def test_repeated_segments_are_flagged() -> None:
+    """Test that the third identical segment in a row is a loop."""
+    detector = RepetitionDetector()
+
+    reasons = [detector.check("ご視聴ありがとうございました。") for _ in range(3)]
+
+    assert reasons == [None, None, "repeated_segment"]
+
+
+def test_repetition_within_a_segment_is_flagged() -> None:
+    """Test that a segment of one repeated phrase is a loop."""
+    assert RepetitionDetector().check("それでは" * 6) == "ngram_repetition"
+    assert compression_ratio("それでは" * 20) > 2.4
+
+
+def test_non_consecutive_repeats_are_not_flagged() -> None:
+    """Test that a phrase recurring between other segments passes."""
+    detector = RepetitionDetector()
+    segments = ["そうですね。", "よろしくお願いします。"] * 5 + ["そうですね。"]
+
+    assert [detector.check(text) for text in segments] == [None] * len(segments)
+    assert detector.pending_repeats == 1
@@ -0,0 +1,127 @@
+"""Tests for the transcription server and client."""
+
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+from recordnote.client import RemoteTranscriber, ServerBusyError
+from recordnote.server import TranscriptionServer
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that echoes the uploaded file size."""
+
+    model_size = "fake"
+
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def load_model(self) -> None:
+        pass
+
+    def stream_file(
+        self, audio_file_path: Path
+    ) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        size = audio_file_path.stat().st_size
+
+        def segments() -> Iterator[Dict[str, Any]]:
+            self.release.wait(timeout=5)
+            for i in range(3):
+                yield {"start": float(i), "end": float(i + 1), "text": f"{size}-{i}"}
+
+        return {"language": "ja", "duration": 3.0}, segments()
+
+
+@pytest.fixture
+def server() -> Iterator[Tuple[TranscriptionServer, threading.Event]]:
+    release = threading.Event()
+    server = TranscriptionServer(
+        ("127.0.0.1", 0), lambda: FakeTranscriber(release), workers=1, queue_size=0
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, release
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server: TranscriptionServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def test_remote_transcription_round_trip(
+    server: Tuple[TranscriptionServer, threading.Event], tmp_path: Path
+) -> None:
+    """Test that uploads are transcribed and segments streamed back."""
+    http_server, release = server
+    release.set()
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_bytes(b"x" * 100000)
+    client = RemoteTranscriber(_url(http_server))
+
+    transcript = client.transcribe_file(audio_file)
+
+    assert client.model_size == "fake"
+    assert transcript.text == "100000-0 100000-1 100000-2"
+    assert transcript.duration == 3.0
+
+
+def test_full_queue_is_rejected(
+    server: Tuple[TranscriptionServer, threading.Event], tmp_path: Path
+) -> None:
+    """Test that requests beyond the queue capacity get a busy error."""
+    http_server, release = server
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_bytes(b"x" * 10)
+    client = RemoteTranscriber(_url(http_server))
+
+    # The first request holds the only worker until release is set
+    _, segments = client.stream_file(audio_file)
+    with pytest.raises(ServerBusyError):
+        client.transcribe_file(audio_file)
+
+    release.set()
+    assert len(list(segments)) == 3
+
+    # The slot is released right after the final chunk has been sent
+    deadline = time.monotonic() + 5
+    while client.get_health()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get_health()["pending"] == 0
+
+
+def test_busy_server_rejects_before_reading_the_body(
+    server: Tuple[TranscriptionServer, threading.Event], tmp_path: Path
+) -> None:
+    """Test that a rejected request gets 503 without uploading its body."""
+    http_server, release = server
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_bytes(b"x" * 10)
+    client = RemoteTranscriber(_url(http_server))
+    _, segments = client.stream_file(audio_file)
+
+    for expect in ("", "Expect: 100-continue\r\n"):
+        with socket.create_connection(http_server.server_address[:2], 5) as sock:
+            # Announce a large upload but send none of it
+            sock.sendall(
+                (
+                    "POST /transcribe HTTP/1.1\r\nHost: test\r\n"
+                    f"Content-Length: 1000000000\r\n{expect}\r\n"
+                ).encode("ascii")
+            )
+            reply = b""
+            while chunk := sock.recv(4096):
+                reply += chunk
+
+        assert reply.startswith(b"HTTP/1.1 503")
+        assert b"Connection: close" in reply
+        assert b"Retry-After: 1" in reply
+        assert b"100 Continue" not in reply
+
+    release.set()
+    assert len(list(segments)) == 3
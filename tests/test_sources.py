@@ -0,0 +1,73 @@
+"""Tests for audio sources and source-driven recording."""
+
+from pathlib import Path
+
+import numpy as np
+from scipy.io import wavfile
+
+from recordnote.preprocess import AudioPreprocessor
+from recordnote.recorder import AudioRecorder
+from recordnote.sources import FileSource, SyntheticSource, integer_scale
+
+
+def test_file_replay_reproduces_file(tmp_path: Path) -> None:
+    """Test that unthrottled replay delivers every sample of the file."""
+    samples = (np.arange(5000) % 200 - 100).astype(np.int16).reshape(-1, 1) * 100
+    audio_file = tmp_path / "audio.wav"
+    wavfile.write(str(audio_file), 8000, samples)
+
+    recorder = AudioRecorder(source=FileSource(audio_file, speed=None, block_size=512))
+    recorder.start_recording()
+    assert recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    recorded = np.concatenate(recorder.audio_data)
+    assert recorder.sample_rate == 8000
+    assert recorded.dtype == np.float32
+    np.testing.assert_allclose(recorded * 32768, samples)
+    assert recorder.get_stats()["blocks"] == 10
+
+
+def test_synthetic_source_duration_and_channels() -> None:
+    """Test that synthetic audio has the requested length and channels."""
+    recorder = AudioRecorder(source=SyntheticSource(3.0, sample_rate=8000, channels=2))
+    recorder.start_recording()
+    recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    stats = recorder.get_stats()
+    assert recorder.get_duration() == 3.0
+    assert recorder.audio_data[0].shape[1] == 2
+    assert stats["dropped_frames"] == 0
+    assert stats["speed"] > 1.0
+
+
+def test_throttled_replay_runs_near_requested_speed() -> None:
+    """Test that throttled replay is paced relative to real time."""
+    recorder = AudioRecorder(source=SyntheticSource(2.0, sample_rate=8000, speed=20))
+    recorder.start_recording()
+    recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    assert 10 < recorder.get_stats()["speed"] <= 21
+
+
+def test_preprocessed_recording_keeps_its_tail() -> None:
+    """Test that the samples held back by the noise gate are recorded."""
+    recorder = AudioRecorder(
+        source=SyntheticSource(3.0, sample_rate=8000),
+        preprocessor=AudioPreprocessor(8000),
+    )
+    recorder.start_recording()
+    recorder.wait_until_finished(timeout=5)
+    recorder.stop_recording()
+
+    assert recorder.get_duration() == 3.0
+    assert len(recorder.get_audio_array()) == 24000
+
+
+def test_integer_scale_maps_pcm_to_unit_range() -> None:
+    """Test the offset/scale used to convert integer PCM samples."""
+    assert integer_scale(np.dtype(np.int16)) == (0.0, 32768.0)
+    assert integer_scale(np.dtype(np.uint8)) == (128.0, 128.0)
+    assert integer_scale(np.dtype(np.float32)) is None
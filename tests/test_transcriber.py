@@ -0,0 +1,278 @@
+"""Tests for the transcriber module."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from recordnote.transcriber import SpeechTranscriber
+from tests.fakes import FakeModel
+
+
+def _make_transcriber(texts: List[str], batch_size: int = 1) -> SpeechTranscriber:
+    transcriber = SpeechTranscriber("tiny", batch_size=batch_size)
+    transcriber._model = FakeModel(texts)  # type: ignore[assignment]
+    return transcriber
+
+
+def test_transcribe_file_collects_segments(tmp_path: Path) -> None:
+    """Test that segments are stripped and joined into the full text."""
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_bytes(b"")
+    transcriber = _make_transcriber(["こんにちは", "世界"])
+
+    result = transcriber.transcribe_file(audio_file)
+
+    assert result["text"] == "こんにちは 世界"
+    assert result["duration"] == 2.0
+    assert [segment["text"] for segment in result["segments"]] == ["こんにちは", "世界"]
+
+
+def test_batched_pipeline_receives_batch_size(tmp_path: Path) -> None:
+    """Test that batch sizes above 1 route through the batched pipeline."""
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_bytes(b"")
+    transcriber = _make_transcriber(["テスト"], batch_size=4)
+    pipeline = FakeModel(["テスト"])
+    transcriber._batched_pipeline = pipeline  # type: ignore[assignment]
+
+    results = transcriber.transcribe_files([audio_file, audio_file])
+
+    assert len(results) == 2
+    assert [call["batch_size"] for call in pipeline.calls] == [4, 4]
+    assert transcriber._model.calls == []  # type: ignore[union-attr]
+
+
+class AdaptiveFakeModel:
+    """Model stand-in whose greedy pass is unsure about the middle segments."""
+
+    def __init__(self) -> None:
+        self.beam_calls: List[dict] = []
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        info = SimpleNamespace(language="ja", duration=len(audio) / 16000)
+        if kwargs["beam_size"] == 1:
+            logprobs = [-0.2, -1.5, -1.8, -0.3]
+            segments = [
+                SimpleNamespace(
+                    start=float(i),
+                    end=float(i + 1),
+                    text=f"greedy{i}",
+                    words=None,
+                    avg_logprob=logprob,
+                    no_speech_prob=0.0,
+                    compression_ratio=1.0,
+                )
+                for i, logprob in enumerate(logprobs)
+            ]
+            return iter(segments), info
+
+        self.beam_calls.append(kwargs)
+        segment = SimpleNamespace(
+            start=0.0,
+            end=len(audio) / 16000,
+            text="beam",
+            words=None,
+            avg_logprob=-0.4,
+            no_speech_prob=0.0,
+            compression_ratio=1.0,
+        )
+        return iter([segment]), info
+
+
+def test_adaptive_decoding_redecodes_low_confidence_windows() -> None:
+    """Test that only low-confidence windows are re-decoded with beam search."""
+    transcriber = SpeechTranscriber("tiny", decoding="adaptive")
+    model = AdaptiveFakeModel()
+    transcriber._model = model  # type: ignore[assignment]
+
+    result = transcriber.transcribe_audio(np.zeros(4 * 16000, dtype=np.float32))
+
+    assert [s["text"] for s in result["segments"]] == ["greedy0", "beam", "greedy3"]
+    assert result["segments"][1]["start"] == 1.0
+    assert result["segments"][1]["end"] == 3.0
+    assert len(model.beam_calls) == 1
+    assert model.beam_calls[0]["beam_size"] == 5
+    assert result.metadata["decoding"]["redecoded_segments"] == 2
+
+
+class PromptFakeModel:
+    """Model stand-in with a character tokenizer that records its prompts."""
+
+    def __init__(self) -> None:
+        self.prompts: List[Any] = []
+        self.encoded: List[str] = []
+        self.hf_tokenizer = SimpleNamespace(encode=self._encode, decode=self._decode)
+
+    def _encode(self, text: str, add_special_tokens: bool) -> Any:
+        self.encoded.append(text)
+        return SimpleNamespace(ids=[ord(c) for c in text])
+
+    def _decode(self, ids: List[int]) -> str:
+        return "".join(chr(i) for i in ids)
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        self.prompts.append(kwargs["initial_prompt"])
+        text = f"chunk{len(self.prompts)}"
+        segment = SimpleNamespace(
+            start=0.0,
+            end=1.0,
+            text=text,
+            tokens=[ord(c) for c in text],
+            temperature=0.0,
+            words=None,
+            avg_logprob=-0.2,
+            no_speech_prob=0.01,
+            compression_ratio=1.2,
+        )
+        return iter([segment]), SimpleNamespace(language="ja", duration=1.0)
+
+
+def _tokens(text: str) -> List[int]:
+    return [ord(c) for c in text]
+
+
+def test_glossary_prompt_is_tokenized_once() -> None:
+    """Test that the glossary is prompted on every call but encoded once."""
+    transcriber = SpeechTranscriber("tiny", glossary=["RecordNote", "議事録"])
+    model = PromptFakeModel()
+    transcriber._model = model  # type: ignore[assignment]
+    audio = np.zeros(16000, dtype=np.float32)
+
+    transcriber.transcribe_audio(audio)
+    transcriber.transcribe_audio(audio)
+
+    assert model.prompts == [_tokens(" RecordNote、議事録")] * 2
+    assert model.encoded == [" RecordNote、議事録"]
+
+
+def test_context_is_carried_between_chunks() -> None:
+    """Test that chunks of one recording see the previous chunk's tokens."""
+    transcriber = SpeechTranscriber("tiny", glossary=["RN"], context_tokens=4)
+    model = PromptFakeModel()
+    transcriber._model = model  # type: ignore[assignment]
+    audio = np.zeros(16000, dtype=np.float32)
+
+    transcriber.transcribe_audio(audio, offset=0.0)
+    transcriber.transcribe_audio(audio, offset=1.0)
+    transcriber.transcribe_audio(audio, offset=0.0)
+    transcriber.transcribe_audio(audio, offset=1.0, previous_text="前")
+
+    glossary = _tokens(" RN")
+    assert model.prompts == [
+        glossary,
+        _tokens("unk1") + glossary,
+        glossary,
+        _tokens(" 前") + glossary,
+    ]
+
+
+def test_batched_pipeline_receives_prompt_text() -> None:
+    """Test that the batched pipeline gets the prompt as text, not tokens."""
+    transcriber = SpeechTranscriber(
+        "tiny", glossary=["RecordNote", "議事録"], batch_size=4
+    )
+    model = PromptFakeModel()
+    pipeline = PromptFakeModel()
+    transcriber._model = model  # type: ignore[assignment]
+    transcriber._batched_pipeline = pipeline  # type: ignore[assignment]
+    audio = np.zeros(16000, dtype=np.float32)
+
+    transcriber.transcribe_audio(audio, offset=0.0)
+    transcriber.transcribe_audio(audio, offset=1.0)
+
+    assert model.prompts == []
+    assert pipeline.prompts == [" RecordNote、議事録", "chunk1 RecordNote、議事録"]
+
+
+class LoopFakeModel:
+    """Model stand-in that falls into a repetition loop on its first pass."""
+
+    def __init__(self, redecoded_text: str = "") -> None:
+        self.redecoded_text = redecoded_text
+        self.calls: List[dict] = []
+        self.loop_segments_decoded = 0
+
+    def _segment(self, start: float, text: str) -> Any:
+        return SimpleNamespace(
+            start=start,
+            end=start + 1.0,
+            text=text,
+            words=None,
+            avg_logprob=-0.2,
+            no_speech_prob=0.01,
+            compression_ratio=1.2,
+        )
+
+    def _looping(self) -> Any:
+        yield self._segment(0.0, "こんにちは")
+        for i in range(1, 20):
+            self.loop_segments_decoded += 1
+            yield self._segment(float(i), "ご視聴ありがとうございました")
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        self.calls.append(kwargs)
+        info = SimpleNamespace(language="ja", duration=len(audio) / 16000)
+        if kwargs.get("vad_filter"):
+            texts = [self.redecoded_text] if self.redecoded_text else []
+            return iter([self._segment(0.0, text) for text in texts]), info
+        if kwargs.get("condition_on_previous_text") is False:
+            return iter([self._segment(0.5, "続きです")]), info
+        return self._looping(), info
+
+
+def test_repetition_loop_is_skipped_and_decoding_resumes() -> None:
+    """Test that a loop stops the decode early and resumes after it."""
+    transcriber = SpeechTranscriber("tiny", repetition="skip")
+    model = LoopFakeModel()
+    transcriber._model = model  # type: ignore[assignment]
+
+    result = transcriber.transcribe_audio(np.zeros(20 * 16000, dtype=np.float32))
+
+    assert list(result.texts()) == ["こんにちは", "続きです"]
+    assert result.starts[-1] == 4.5
+    assert model.loop_segments_decoded == 3
+    events = result.metadata["decoding"]["repetition_events"]
+    assert [
+        (e["start"], e["end"], e["reason"], e["dropped_segments"], e["action"])
+        for e in events
+    ] == [(1.0, 4.0, "repeated_segment", 3, "skipped")]
+
+
+def test_repetition_loop_window_is_redecoded() -> None:
+    """Test that the looping window is replaced by its re-decode."""
+    transcriber = SpeechTranscriber("tiny")
+    model = LoopFakeModel(redecoded_text="本題に入ります")
+    transcriber._model = model  # type: ignore[assignment]
+
+    result = transcriber.transcribe_audio(np.zeros(20 * 16000, dtype=np.float32))
+
+    assert list(result.texts()) == ["こんにちは", "本題に入ります", "続きです"]
+    assert result.starts[1] == 1.0
+    assert result.metadata["decoding"]["repetition_events"][0]["action"] == (
+        "redecoded"
+    )
+    redecode_call = next(call for call in model.calls if call.get("vad_filter"))
+    assert redecode_call["condition_on_previous_text"] is False
+
+
+def test_recurring_phrases_are_kept() -> None:
+    """Test that phrases repeated between other segments are not loops."""
+    texts = [
+        "そうですね。",
+        "よろしくお願いします。",
+        "そうですね。",
+        "議題に入ります。",
+        "そうですね。",
+        "よろしくお願いします。",
+        "そうですね。",
+        "よろしくお願いします。",
+        "そうですね。",
+    ]
+    transcriber = _make_transcriber(texts)
+
+    result = transcriber.transcribe_audio(np.zeros(16000, dtype=np.float32))
+
+    assert list(result.texts()) == texts
+    assert result.metadata["decoding"]["repetition_events"] == []
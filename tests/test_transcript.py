@@ -0,0 +1,118 @@
+"""Tests for the transcript module."""
+
+from pathlib import Path
+
+import numpy as np
+
+from recordnote.formatter import MinutesFormatter
+from recordnote.transcript import Transcript, TranscriptBuilder
+
+
+def _build_sample() -> Transcript:
+    builder = TranscriptBuilder(language="ja", duration=4.0)
+    builder.append(0.0, 1.5, "おはようございます。", avg_logprob=-0.1)
+    builder.append(
+        1.5,
+        4.0,
+        "会議を始めます。",
+        words=[(1.5, 2.5, "会議を", 0.9), (2.5, 4.0, "始めます。", 0.8)],
+        avg_logprob=-0.4,
+    )
+    return builder.build()
+
+
+def test_dict_compatible_view() -> None:
+    """Test that a transcript can be read like the old result dictionary."""
+    transcript = _build_sample()
+
+    assert transcript["text"] == "おはようございます。 会議を始めます。"
+    assert transcript.get("language") == "ja"
+    assert len(transcript["segments"]) == 2
+    assert transcript["segments"][-1]["end"] == 4.0
+    assert transcript["segments"][0]["avg_logprob"] == -0.1
+    assert transcript["segments"][0]["words"] == []
+    assert transcript["segments"][1]["words"][1]["word"] == "始めます。"
+
+
+def test_save_and_load_round_trip(tmp_path: Path) -> None:
+    """Test that transcripts survive serialisation unchanged."""
+    transcript = _build_sample()
+    transcript.metadata["model"] = "tiny"
+    path = tmp_path / "transcript.npz"
+
+    transcript.save(path)
+    loaded = Transcript.load(path)
+
+    assert list(loaded["segments"]) == list(transcript["segments"])
+    assert loaded.text == transcript.text
+    assert loaded.metadata == {"model": "tiny"}
+
+
+def test_formatter_output_matches_dict_input() -> None:
+    """Test that transcripts and dictionaries format identically."""
+    transcript = _build_sample()
+    as_dict = {
+        "text": transcript.text,
+        "language": "ja",
+        "segments": [dict(segment) for segment in transcript["segments"]],
+    }
+    formatter = MinutesFormatter()
+
+    assert formatter.format_segments(
+        formatter.iter_segment_rows(transcript)
+    ) == formatter.format_segments(formatter.iter_segment_rows(as_dict))
+    assert Transcript.from_dict(as_dict).text == transcript.text
+
+
+def test_update_segments_replaces_text_in_place() -> None:
+    """Test that refined text replaces a segment without touching the others."""
+    transcript = _build_sample()
+
+    transcript.update_segments({0: {"text": "おはようございます皆さん。", "speaker": "話者1"}})
+
+    assert transcript.text == "おはようございます皆さん。 会議を始めます。"
+    assert transcript["segments"][0]["speaker"] == "話者1"
+    assert transcript["segments"][1]["speaker"] == ""
+    assert transcript["segments"][1]["text"] == "会議を始めます。"
+
+
+def test_integer_and_gapped_fields_keep_their_type(tmp_path: Path) -> None:
+    """Test that integer ids stay integers and gaps stay missing."""
+    builder = TranscriptBuilder(language="ja", duration=3.0)
+    builder.append(0.0, 1.0, "はい。", channel=1)
+    builder.append(1.0, 2.0, "いいえ。", channel=2, speaker=3)
+    builder.append(2.0, 3.0, "どうぞ。", channel=1)
+    transcript = builder.build()
+
+    assert transcript.field("channel").dtype == np.int64  # type: ignore[union-attr]
+    assert [s["channel"] for s in transcript["segments"]] == [1, 2, 1]
+    assert [s["speaker"] for s in transcript["segments"]] == [None, 3, None]
+
+    path = tmp_path / "transcript.npz"
+    transcript.save(path)
+    loaded = Transcript.load(path)
+    assert list(loaded["segments"]) == list(transcript["segments"])
+
+    rows = list(MinutesFormatter().iter_segment_rows(loaded))
+    assert [label for *_, label in rows] == ["1", "2 / 3", "1"]
+
+
+def test_segment_label_skips_missing_values() -> None:
+    """Test labels of segments whose channel or speaker is missing."""
+    formatter = MinutesFormatter()
+
+    assert formatter.segment_label(float("nan"), "話者1") == "話者1"
+    assert formatter.segment_label(2.0, None) == "2"
+    assert formatter.segment_label("", "") == ""
+
+
+def test_update_segments_retypes_columns() -> None:
+    """Test that updates of another type convert the column, keeping gaps."""
+    transcript = _build_sample()
+
+    transcript.update_segments({1: {"channel": 2}})
+    assert [s["channel"] for s in transcript["segments"]] == [None, 2]
+    transcript.update_segments({0: {"channel": "マイク1"}})
+    assert [s["channel"] for s in transcript["segments"]] == ["マイク1", 2]
+    transcript.update_segments({1: {"avg_logprob": "n/a"}})
+    assert [s["avg_logprob"] for s in transcript["segments"]] == ["-0.1", "n/a"]